@@ -1,38 +1,55 @@
 import pandas as pd
 import streamlit as st
-from src.data_access.app_cache_all_tables import get_tables
+from src.data_access.search_index import (
+    get_search_index,
+    product_card,
+    search_products,
+)
+from src.data_access.text_search import search_descriptions
 
 st.set_page_config(page_title="Choice of Data", layout="wide")
 
 with open("styles.css") as f:
     st.markdown(f"<style>{f.read()}</style>", unsafe_allow_html=True)
 
-tables = get_tables()
-
-products_df = tables["products"]
-descriptions_df = tables["product_descriptions"]
-themes_df = tables["themes"]
-countries_df = tables["countries"]
-reviews_df = tables["reviews"]
-listings_df = tables["product_listings"]
+# built once per data version - lookups below are by position, no scans
+index = get_search_index()
+products_df = index["tables"]["products.csv"]
 
 st.markdown("## Product Viewer")
 
-selected_product = st.selectbox(
-    "Select a LEGO product", products_df["set_name"].sort_values(ascending=True)
-)
+query = st.text_input("Search by set name or description")
+search_in = st.radio("Search in", ["Set names", "Full descriptions"], horizontal=True)
 
-product_id = products_df.loc[
-    products_df["set_name"] == selected_product, "prod_id"
-].iloc[0]
+if not query:
+    options = index["options"]
+elif search_in == "Set names":
+    options = search_products(index, query, limit=50)
+else:
+    # keyword search over the full-text index, best match first
+    try:
+        matches = search_descriptions(query, limit=50)["prod_id"].tolist()
+    except FileNotFoundError:
+        st.info("No description index yet - rerun the ETL to build it.")
+        st.stop()
+    options = [prod_id for prod_id in matches if prod_id in index["product_rows"]]
+
+if not options:
+    st.info("No products match your search.")
+    st.stop()
+
+product_id = st.selectbox(
+    "Select a LEGO product",
+    options,
+    format_func=lambda prod_id: products_df["set_name"].iloc[
+        index["product_rows"][prod_id]
+    ],
+)
 
-product_data = (
-    products_df[products_df["prod_id"] == product_id]
-    .merge(themes_df, on="theme_id")
-    .merge(descriptions_df, on="prod_id")
-)[["prod_id", "set_name", "theme_name", "prod_long_desc", "age_min", "age_max"]]
+product_data = product_card(index, product_id)
+selected_product = product_data["set_name"]
 
-product_reviews = listings_df[listings_df["prod_id"] == product_id]
+product_reviews = product_data["listings"]
 
 # Averages
 avg_star = product_reviews["star_rating"].mean()
@@ -50,18 +67,18 @@ col_left, col_right = st.columns([2, 1], vertical_alignment="top")
 
 with col_left:
     st.markdown(f"### {selected_product}")
-    st.markdown(f"**Product ID:** {product_data['prod_id'].iloc[0]}")
-    st.markdown(f"**Theme:** {product_data['theme_name'].iloc[0]}")
+    st.markdown(f"**Product ID:** {product_data['prod_id']}")
+    st.markdown(f"**Theme:** {product_data['theme_name']}")
 
     st.markdown("#### Description")
-    st.write(product_data["prod_long_desc"].iloc[0])
+    st.write(product_data["prod_long_desc"])
 
 with col_right:
     st.markdown(
         f"""
         <div class="card">
             <h3> Product Details </h3>
-            <p><b>Age Range:</b> {product_data['age_min'].iloc[0]} - {product_data['age_max'].iloc[0]}</p>
+            <p><b>Age Range:</b> {product_data['age_min']} - {product_data['age_max']}</p>
             <p><b>Avg Star Rating:</b> {avg_star}</p>
             <p><b>Avg Value Rating:</b> {avg_value}</p>
             <p><b>Avg Play Rating:</b> {avg_play}</p>
@@ -3,6 +3,7 @@ import pandas as pd
 import altair as alt
 import numpy as np
 from src.data_access.app_cache_all_tables import get_tables
+from src.data_access.query_engine import RATING_COLUMNS, run_query
 
 st.set_page_config(page_title="Choice of Data", layout="wide")
 
@@ -15,12 +16,12 @@ st.subheader("Epic 5 — Data Exploration & Visualisation")
 
 tables = get_tables()
 
-products_df = tables["products"]
-descriptions_df = tables["product_descriptions"]
-themes_df = tables["themes"]
-countries_df = tables["countries"]
-reviews_df = tables["reviews"]
-listings_df = tables["product_listings"]
+# aggregates precomputed by the ETL - no groupby over listings per rerun
+overview = tables["overview_stats"].iloc[0]
+product_stats = tables["product_stats"]
+country_stats = tables["country_stats"]
+theme_reviews = tables["theme_stats"]
+theme_country = tables["theme_country_stats"]
 
 col1, col2 = st.columns([1, 1])
 
@@ -67,21 +68,17 @@ with col2:
     )
 
 # General KPIs - col1
-total_products = products_df["prod_id"].nunique()
-total_countries = countries_df["country_id"].nunique()
-total_reviews = listings_df["num_reviews"].sum()
+total_products = overview["total_products"]
+total_countries = overview["total_countries"]
+total_reviews = overview["total_reviews"]
 
 # Global Averge ratings - col2
-avg_star = listings_df["star_rating"].mean()
-avg_value = listings_df["val_star_rating"].mean()
-avg_play = listings_df["play_star_rating"].mean()
+avg_star = overview["avg_star"]
+avg_value = overview["avg_value"]
+avg_play = overview["avg_play"]
 
 # Country KPIs - col3
-country_interaction_stats = (
-    listings_df.groupby("country_id", as_index=False)
-    .agg(total_reviews=("num_reviews", "sum"), avg_star=("star_rating", "mean"))
-    .merge(countries_df, on="country_id")
-)
+country_interaction_stats = country_stats
 
 highest_rated_country = country_interaction_stats.sort_values(
     "avg_star", ascending=False
@@ -149,17 +146,6 @@ with kpi_col3:
         unsafe_allow_html=True,
     )
 
-product_stats = (
-    listings_df.groupby("prod_id", as_index=False)
-    .agg(
-        average_stars=("star_rating", "mean"),
-        average_play=("play_star_rating", "mean"),
-        average_value=("val_star_rating", "mean"),
-        total_reviews=("num_reviews", "sum"),
-    )
-    .merge(products_df[["prod_id", "set_name"]], on="prod_id")
-)
-
 top_5_products_rating = product_stats.sort_values(
     ["average_stars", "total_reviews"], ascending=[False, False]
 ).head(5)
@@ -271,17 +257,9 @@ with prod_col3:
 
     st.altair_chart(bars_play + text_play)
 
-country_activity = (
-    listings_df.groupby("country_id", as_index=False)
-    .agg(
-        total_reviews=("num_reviews", "sum"),
-        products_reviewed=("prod_id", "nunique"),
-        avg_reviews_per_product=("num_reviews", "mean"),
-    )
-    .merge(countries_df, on="country_id", how="left")[
-        ["country", "total_reviews", "products_reviewed", "avg_reviews_per_product"]
-    ]
-)
+country_activity = country_stats[
+    ["country", "total_reviews", "products_reviewed", "avg_reviews_per_product"]
+]
 
 top_5_active = country_activity.sort_values("total_reviews", ascending=False).head(5)
 
@@ -330,19 +308,6 @@ with section_col2:
         unsafe_allow_html=True,
     )
 
-theme_reviews = (
-    listings_df.merge(products_df[["prod_id", "theme_id"]], on="prod_id", how="left")
-    .merge(themes_df, on="theme_id", how="left")
-    .groupby("theme_name", as_index=False)
-    .agg(
-        avg_star_rating=("star_rating", "mean"),
-        avg_value_rating=("val_star_rating", "mean"),
-        avg_play_rating=("play_star_rating", "mean"),
-        total_reviews=("num_reviews", "sum"),
-        products_in_theme=("prod_id", "nunique"),
-    )
-)
-
 top_5_themes = theme_reviews.sort_values("avg_star_rating", ascending=False).head(5)
 
 bottom_5_themes = theme_reviews.sort_values("avg_star_rating", ascending=True).head(5)
@@ -392,19 +357,6 @@ with section_col2:
         unsafe_allow_html=True,
     )
 
-theme_country = (
-    listings_df.merge(products_df[["prod_id", "theme_id"]], on="prod_id", how="left")
-    .merge(themes_df, on="theme_id", how="left")
-    .merge(countries_df, on="country_id", how="left")
-    .groupby(["theme_name", "country"], as_index=False)
-    .agg(
-        avg_star_rating=("star_rating", "mean"),
-        avg_value_rating=("val_star_rating", "mean"),
-        avg_play_rating=("play_star_rating", "mean"),
-        total_reviews=("num_reviews", "sum"),
-    )
-)
-
 excluded_themes = [
     "Blue's Helicopter Pursuit",
     "T. rex Transport",
@@ -463,24 +415,14 @@ with section_col2:
         unsafe_allow_html=True,
     )
 
-product_country = (
-    listings_df.merge(products_df[["prod_id", "set_name"]], on="prod_id", how="left")
-    .groupby(["prod_id", "set_name"], as_index=False)
-    .agg(
-        avg_star_rating=("star_rating", "mean"),
-        avg_value_rating=("val_star_rating", "mean"),
-        avg_play_rating=("play_star_rating", "mean"),
-        std_star=("star_rating", "std"),
-        std_value=("val_star_rating", "std"),
-        std_play=("play_star_rating", "std"),
-        total_reviews=("num_reviews", "sum"),
-    )
+product_country = product_stats.rename(
+    columns={
+        "average_stars": "avg_star_rating",
+        "average_value": "avg_value_rating",
+        "average_play": "avg_play_rating",
+    }
 )
 
-product_country["consistency_score"] = product_country[
-    ["std_star", "std_value", "std_play"]
-].mean(axis=1)
-
 consistent_products = product_country[product_country["consistency_score"] == 0]
 varying_products = product_country[product_country["consistency_score"] > 0]
 
@@ -543,3 +485,33 @@ with section_col2:
         """,
         unsafe_allow_html=True,
     )
+
+st.markdown("---")
+st.markdown("### Top Products by Theme")
+
+theme_col, rating_col = st.columns(2)
+with theme_col:
+    selected_theme = st.selectbox(
+        "Theme", ["All themes", *theme_reviews["theme_name"].sort_values()]
+    )
+with rating_col:
+    selected_rating = st.selectbox(
+        "Rank by",
+        RATING_COLUMNS,
+        format_func=lambda column: column.removeprefix("avg_")
+        .replace("_", " ")
+        .title(),
+    )
+
+# parameterized SQL over the output files, cached per theme / rating
+top_products = run_query(
+    "top_products",
+    theme_name=None if selected_theme == "All themes" else selected_theme,
+    order_by=selected_rating,
+    limit=10,
+)
+
+if top_products.empty:
+    st.info("No rated products in this theme.")
+else:
+    st.dataframe(top_products, hide_index=True)
@@ -0,0 +1,54 @@
+"""
+Benchmark clean_ages against the previous multi-pass implementation.
+
+The old version scanned the full string column five times (replace, two
+str.extract, str.contains, to_numeric); the current one parses each
+distinct ages value once and broadcasts the result by factorize code.
+
+Usage: python -m scripts.benchmark_clean_ages [rows]
+"""
+
+import sys
+import pandas as pd
+from scripts.benchmark_utils import make_raw_lego_frame, best_of
+from src.transform.transform_numeric import clean_ages
+
+
+def clean_ages_multi_pass(df: pd.DataFrame) -> pd.DataFrame:
+    """The pre-factorize implementation, kept here for comparison."""
+    ages_clean = df["ages"].astype(str)
+    ages_clean = ages_clean.str.replace("½", ".5", regex=False)
+    range_extract = ages_clean.str.extract(
+        r"(?P<age_min>\d+\.?\d*)-(?P<age_max>\d+\.?\d*)"
+    )
+    single_extract = ages_clean.str.extract(r"(?P<age_min>\d+\.?\d*)\+?")
+    df["age_min"] = pd.to_numeric(
+        range_extract["age_min"].fillna(single_extract["age_min"]),
+        errors="coerce",
+    )
+    df["age_max"] = pd.to_numeric(range_extract["age_max"], errors="coerce")
+    plus_mask = ages_clean.str.contains(r"\+$", regex=True)
+    df.loc[plus_mask, "age_max"] = 99
+    return df
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000_000
+
+    ages = make_raw_lego_frame(rows)[["ages"]]
+    ages.loc[ages.sample(frac=0.01, random_state=0).index, "ages"] = None
+
+    multi_pass = clean_ages_multi_pass(ages.copy())
+    factorized = clean_ages(ages.copy())
+    pd.testing.assert_frame_equal(multi_pass, factorized)
+
+    old = best_of(lambda: clean_ages_multi_pass(ages.copy()))
+    new = best_of(lambda: clean_ages(ages.copy()))
+
+    print(f"{rows} rows, {ages['ages'].nunique()} distinct ages values")
+    print(f"multi-pass str.extract  {old:8.3f}s")
+    print(f"factorize + parse once  {new:8.3f}s  x{old / new:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+Benchmark loading the star schema into SQLite:
+    - to_sql: pandas DataFrame.to_sql per table on a default connection
+      (no keys, no pragmas)
+    - per-row: one INSERT per row in output order, committed per table,
+      into the keyed schema with default pragmas
+    - load_database: keyed schema, tuned pragmas, rows in key order,
+      batched executemany in one transaction, foreign keys checked and
+      indexes built after the data
+Then refreshing a loaded database with 1% of listing prices changed:
+drop-and-reload (load_database) vs upsert of every row (merge_database)
+vs upsert of just the changed listing keys (scoped merge_database, as
+incremental runs do).
+
+Usage: python -m scripts.benchmark_database [rows]
+"""
+
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+from scripts.benchmark_utils import make_raw_lego_frame, best_of
+from src.load.load_database import (
+    TABLE_SCHEMAS,
+    load_database,
+    merge_database,
+    schema_sql,
+)
+from src.load.star_schema import build_star_schema
+from src.transform.transform import transform_data
+from src.utils import key_registry
+
+
+def to_sql(tables: dict, database: Path):
+    database.unlink(missing_ok=True)
+    with sqlite3.connect(database) as connection:
+        for name, df in tables.items():
+            df.to_sql(Path(name).stem, connection, index=False)
+
+
+def per_row(tables: dict, database: Path):
+    database.unlink(missing_ok=True)
+    connection = sqlite3.connect(database)
+    connection.execute("PRAGMA foreign_keys = ON")
+    for sql in schema_sql("sqlite"):
+        connection.execute(sql)
+    connection.commit()
+
+    for table in TABLE_SCHEMAS:
+        columns = list(TABLE_SCHEMAS[table]["columns"])
+        df = tables[f"{table}.csv"][columns].astype(object)
+        df = df.where(df.notna(), None)
+        placeholders = ", ".join("?" * len(df.columns))
+        for row in df.itertuples(index=False, name=None):
+            connection.execute(
+                f"INSERT INTO {table} VALUES ({placeholders})", row
+            )
+        connection.commit()
+    connection.close()
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 300_000
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # keep the synthetic ids out of the real key registry
+        key_registry.REGISTRY_DIR = Path(tmp) / "keys"
+        tables = build_star_schema(transform_data(make_raw_lego_frame(rows)))
+    print(
+        ", ".join(
+            f"{Path(name).stem} {len(df)}" for name, df in tables.items()
+        )
+    )
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database = Path(tmp) / "lego.db"
+        for label, load in [
+            ("to_sql", to_sql),
+            ("per-row", per_row),
+            ("load_database", load_database),
+        ]:
+            seconds = best_of(lambda: load(tables, database), repeat=3)
+            print(f"{label:<14} {seconds:7.3f}s")
+
+        # refresh with a few changed prices
+        changed = dict(tables)
+        listings = tables["product_listings.csv"].copy()
+        listings.loc[listings.index[::100], "list_price"] += 1
+        changed["product_listings.csv"] = listings
+
+        # as database_scope builds it for an incremental diff
+        changed_keys = listings.loc[listings.index[::100]]
+        scope = {
+            "products": changed_keys,
+            "product_descriptions": changed_keys,
+            "product_listings": changed_keys,
+        }
+
+        for label, load in [
+            ("reload", load_database),
+            ("merge", merge_database),
+            (
+                "merge scoped",
+                lambda tables, db: merge_database(tables, db, scope),
+            ),
+        ]:
+
+            def refresh():
+                load_database(tables, database)
+                start = time.perf_counter()
+                load(changed, database)
+                return time.perf_counter() - start
+
+            seconds = min(refresh() for _ in range(3))
+            print(f"refresh {label:<13} {seconds:7.3f}s")
+
+
+if __name__ == "__main__":
+    main()
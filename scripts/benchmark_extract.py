@@ -0,0 +1,48 @@
+"""
+Benchmark the raw LEGO CSV readers.
+
+Compares the old dtype-inference read against the pinned-dtype reader
+(C engine and pyarrow, the default) on a synthetic raw export.
+
+Usage: python -m scripts.benchmark_extract [rows]
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+import pandas as pd
+from scripts.benchmark_utils import make_raw_lego_frame, best_of
+from src.extract.extract_lego import extract_lego_data
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        csv_path = Path(temp_dir) / "lego_sets_raw.csv"
+        make_raw_lego_frame(rows).to_csv(csv_path, index=False)
+
+        readers = {
+            "inferred (pd.read_csv)": lambda: pd.read_csv(csv_path),
+            "pinned dtypes (c)": lambda: extract_lego_data(
+                csv_path, engine="c"
+            ),
+            "pinned dtypes (pyarrow)": lambda: extract_lego_data(
+                csv_path, engine="pyarrow"
+            ),
+        }
+
+        baseline = None
+        print(f"{rows} rows, {csv_path.stat().st_size / 1e6:.1f} MB on disk")
+        for name, reader in readers.items():
+            seconds = best_of(reader)
+            memory = reader().memory_usage(deep=True).sum() / 1e6
+            baseline = baseline or seconds
+            print(
+                f"{name:<26} {seconds:8.3f}s  x{baseline / seconds:5.2f}  "
+                f"{memory:8.1f} MB in memory"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""
+Benchmark a full transform against an incremental refresh of a small delta.
+
+Usage: python -m scripts.benchmark_incremental [rows] [changed_rows]
+"""
+
+import sys
+import numpy as np
+import pandas as pd
+from scripts.benchmark_utils import make_raw_lego_frame, best_of
+from src.transform.transform import transform_data
+from src.utils.raw_validation import RAW_DTYPES
+from src.transform.incremental import (
+    row_state,
+    changed_keys,
+    key_mask,
+    merge_clean,
+)
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    changed = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+
+    # dtypes as extract_data reads them
+    previous_raw = make_raw_lego_frame(rows).astype(RAW_DTYPES)
+    previous_state = row_state(previous_raw)
+    previous_clean = transform_data(previous_raw.copy())
+
+    # a new drop: some prices change, some listings are new
+    raw = previous_raw.copy()
+    rng = np.random.default_rng(1)
+    raw.loc[rng.choice(rows, changed // 2, replace=False), "list_price"] += 1
+    new_rows = make_raw_lego_frame(changed - changed // 2, seed=1).astype(
+        RAW_DTYPES
+    )
+    new_rows["prod_id"] = np.arange(len(new_rows)) + 1_000_000
+    raw = pd.concat([raw, new_rows], ignore_index=True)
+
+    def incremental():
+        state = row_state(raw)
+        keys = changed_keys(state, previous_state)
+        delta_clean = transform_data(raw[key_mask(state, keys)].copy())
+        return merge_clean(previous_clean, delta_clean, keys, state)
+
+    full = best_of(lambda: transform_data(raw.copy()))
+    delta = best_of(incremental)
+
+    print(f"{rows} rows, {changed} changed")
+    print(f"{'full':<12} {full:8.3f}s")
+    print(f"{'incremental':<12} {delta:8.3f}s  x{full / delta:.2f}")
+
+
+if __name__ == "__main__":
+    main()
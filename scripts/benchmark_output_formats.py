@@ -0,0 +1,84 @@
+"""
+Benchmark output formats for the six star-schema tables:
+write time, size on disk and cold-load time of all tables as the app
+loads them (a fresh process per load, so nothing is cached).
+
+Usage: python -m scripts.benchmark_output_formats [rows]
+"""
+
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from scripts.benchmark_utils import make_raw_lego_frame, best_of
+from src.load import write_tables
+from src.load.load import create_tables
+from src.transform.transform import transform_data
+from src.utils import key_registry
+from src.utils.table_io import set_output_format
+
+FORMATS = [
+    ("csv", None),
+    ("parquet", "snappy"),
+    ("parquet", "zstd"),
+    ("feather", None),
+    ("feather", "lz4"),
+]
+
+TABLES = [
+    "products.csv",
+    "themes.csv",
+    "reviews.csv",
+    "countries.csv",
+    "product_descriptions.csv",
+    "product_listings.csv",
+]
+
+COLD_LOAD = """
+import sys, time
+from pathlib import Path
+from src.data_access import app_data_loader
+app_data_loader.OUTPUT_DIR = Path(sys.argv[1])
+start = time.perf_counter()
+for name in sys.argv[2:]:
+    app_data_loader.load_table(name)
+print(time.perf_counter() - start)
+"""
+
+
+def cold_load(output_dir: Path) -> float:
+    result = subprocess.run(
+        [sys.executable, "-c", COLD_LOAD, str(output_dir), *TABLES],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 500_000
+
+    df_clean = transform_data(make_raw_lego_frame(rows))
+    print(f"{len(df_clean)} clean rows")
+    print(f"{'format':<18} {'write':>8} {'size MB':>9} {'cold load':>10}")
+
+    for output_format, compression in FORMATS:
+        with tempfile.TemporaryDirectory() as tmp:
+            output_dir = Path(tmp) / "output"
+            output_dir.mkdir()
+            write_tables.OUTPUT_DIR = output_dir
+            # keep the synthetic ids out of the real key registry
+            key_registry.REGISTRY_DIR = Path(tmp) / "keys"
+            set_output_format(output_format, compression)
+
+            write = best_of(lambda: create_tables(df_clean))
+            size = sum(path.stat().st_size for path in output_dir.iterdir())
+            load = min(cold_load(output_dir) for _ in range(3))
+
+        label = f"{output_format}/{compression or '-'}"
+        print(f"{label:<18} {write:7.2f}s {size / 1e6:9.1f} {load:9.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+"""
+Benchmark transform_data serially and over process pools.
+
+Usage: python -m scripts.benchmark_parallel_transform [rows] [max_workers]
+"""
+
+import os
+import sys
+import pandas as pd
+from scripts.benchmark_utils import make_raw_lego_frame, best_of
+from src.transform.transform import transform_data
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000_000
+    max_workers = int(sys.argv[2]) if len(sys.argv) > 2 else os.cpu_count()
+
+    raw = make_raw_lego_frame(rows)
+    serial = transform_data(raw.copy())
+
+    print(f"{rows} rows, {os.cpu_count()} cores available")
+    baseline = best_of(lambda: transform_data(raw.copy()))
+    print(f"{'serial':<12} {baseline:8.3f}s")
+
+    workers = 2
+    while workers <= max_workers:
+        pd.testing.assert_frame_equal(
+            serial, transform_data(raw.copy(), workers)
+        )
+        seconds = best_of(lambda: transform_data(raw.copy(), workers))
+        print(
+            f"{workers:>2} workers   {seconds:8.3f}s  "
+            f"x{baseline / seconds:.2f}"
+        )
+        workers *= 2
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Benchmark product_listings partitioned by country_id against single
+files:
+    - load: the whole table vs one country (filters - a partitioned
+      table only reads that country's partition)
+    - refresh: rewriting the table after one country's prices changed
+      (a partitioned table only rewrites that partition)
+
+Usage: python -m scripts.benchmark_partitions [rows]
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+from scripts.benchmark_utils import make_raw_lego_frame, best_of
+from src.data_access import app_data_loader
+from src.load import write_tables
+from src.load.star_schema import build_star_schema
+from src.load.write_tables import save_table
+from src.transform.transform import transform_data
+from src.utils import key_registry
+from src.utils.table_io import set_output_format
+
+LAYOUTS = [
+    ("csv", {}),
+    ("parquet", {}),
+    ("parquet", {"product_listings": "country_id"}),
+]
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+
+    with tempfile.TemporaryDirectory() as tmp:
+        key_registry.REGISTRY_DIR = Path(tmp) / "keys"
+        listings = build_star_schema(
+            transform_data(make_raw_lego_frame(rows))
+        )["product_listings.csv"]
+    country = listings["country_id"].iloc[0]
+    filters = [("country_id", "=", country)]
+
+    print(
+        f"{len(listings)} listings, "
+        f"{listings['country_id'].nunique()} countries"
+    )
+    print(
+        f"{'layout':<22} {'load all':>9} {'load one':>9} {'refresh one':>12}"
+    )
+
+    for output_format, partition_by in LAYOUTS:
+        with tempfile.TemporaryDirectory() as tmp:
+            write_tables.OUTPUT_DIR = app_data_loader.OUTPUT_DIR = Path(tmp)
+            set_output_format(output_format, partition_by=partition_by)
+            save_table(listings, "product_listings.csv")
+
+            load_all = best_of(
+                lambda: app_data_loader.load_table("product_listings.csv")
+            )
+            load_one = best_of(
+                lambda: app_data_loader.load_table(
+                    "product_listings.csv", filters
+                )
+            )
+
+            def refresh():
+                # one market's prices move - rewrite as merge_tables would
+                changed = listings.copy()
+                in_country = changed["country_id"] == country
+                changed.loc[in_country, "list_price"] += 1
+                if partition_by:
+                    save_table(
+                        changed[in_country], "product_listings.csv", [country]
+                    )
+                else:
+                    save_table(changed, "product_listings.csv")
+
+            refresh_one = best_of(refresh)
+
+        label = f"{output_format}{' by country' if partition_by else ''}"
+        print(
+            f"{label:<22} {load_all:8.3f}s {load_one:8.3f}s "
+            f"{refresh_one:11.3f}s"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Benchmark the Data Insights top_products query over Parquet output tables:
+    - pandas: load_table the tables a query needs, then merge + groupby
+      (what the pages did with get_tables)
+    - duckdb: run_query over the files (cold: fresh engine, nothing
+      cached; warm: result cache hit)
+Also reports the pandas frames' memory, which the engine never
+materializes.
+
+Usage: python -m scripts.benchmark_query_engine [rows]
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+from scripts.benchmark_utils import make_raw_lego_frame, best_of
+from src.data_access import app_data_loader
+from src.data_access.query_engine import clear_query_cache, run_query
+from src.load.star_schema import build_star_schema
+from src.transform.transform import transform_data
+from src.utils import key_registry
+from src.utils.table_io import set_output_format, write_frame
+
+
+def pandas_top_products():
+    listings = app_data_loader.load_table("product_listings.csv")
+    products = app_data_loader.load_table("products.csv")
+    themes = app_data_loader.load_table("themes.csv")
+    return (
+        listings.merge(
+            products[["prod_id", "set_name", "theme_id"]], on="prod_id"
+        )
+        .merge(themes, on="theme_id")
+        .groupby(
+            ["prod_id", "set_name", "theme_name"],
+            as_index=False,
+            observed=True,
+        )
+        .agg(
+            avg_star_rating=("star_rating", "mean"),
+            avg_value_rating=("val_star_rating", "mean"),
+            avg_play_rating=("play_star_rating", "mean"),
+            total_reviews=("num_reviews", "sum"),
+        )
+        .dropna(subset=["avg_star_rating"])
+        .sort_values(
+            ["avg_star_rating", "total_reviews", "prod_id"],
+            ascending=[False, False, True],
+        )
+        .head(10)
+    ), [listings, products, themes]
+
+
+def cold(name):
+    clear_query_cache()
+    return run_query(name)
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+
+    with tempfile.TemporaryDirectory() as tmp:
+        key_registry.REGISTRY_DIR = Path(tmp) / "keys"
+        tables = build_star_schema(transform_data(make_raw_lego_frame(rows)))
+
+        app_data_loader.OUTPUT_DIR = Path(tmp)
+        set_output_format("parquet")
+        for name, table in tables.items():
+            write_frame(table, Path(tmp), name)
+        print(f"{len(tables['product_listings.csv'])} listings")
+
+        print(
+            f"{'query':<18} {'pandas':>9} {'cold':>9} {'warm':>9} "
+            f"{'frames':>8}"
+        )
+        for name, pandas_query in [("top_products", pandas_top_products)]:
+            _, frames = pandas_query()
+            megabytes = (
+                sum(df.memory_usage(deep=True).sum() for df in frames) / 1e6
+            )
+            pandas_seconds = best_of(pandas_query)
+            cold_seconds = best_of(lambda: cold(name))
+            warm_seconds = best_of(lambda: run_query(name))
+            print(
+                f"{name:<18} {pandas_seconds * 1000:7.1f}ms"
+                f" {cold_seconds * 1000:7.1f}ms {warm_seconds * 1000:7.2f}ms"
+                f" {megabytes:6.0f}MB"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+Benchmark the Product Searcher lookups at scale:
+    - build: search_index.build_search_index, once per data version
+    - search: type-ahead queries via pandas substring scans of set_name /
+      prod_desc vs search_products (prefix + trigram index)
+    - card: one product card via boolean masks and merges (as the page
+      did) vs product_card (position lookups)
+
+Usage: python -m scripts.benchmark_search [sets]
+"""
+
+import sys
+import numpy as np
+import pandas as pd
+from scripts.benchmark_utils import make_raw_lego_frame, best_of
+from src.data_access.search_index import (
+    build_search_index,
+    product_card,
+    search_products,
+)
+
+# prefixes of set names, then mid-text matches only the trigram index finds
+QUERIES = [
+    "d",
+    "dragon",
+    "police station fire",
+    "agon sp",
+    "train kids",
+    "zebra",
+]
+
+
+def make_tables(sets: int) -> dict:
+    raw = make_raw_lego_frame(sets)
+    prod_ids = np.arange(1, sets + 1)
+    products = pd.DataFrame(
+        {
+            "prod_id": prod_ids,
+            "set_name": raw["set_name"],
+            "theme_id": np.arange(sets) % 12 + 1,
+            "age_min": 6.0,
+            "age_max": 12.0,
+        }
+    )
+    descriptions = pd.DataFrame(
+        {
+            "prod_id": prod_ids,
+            "prod_desc": raw["prod_desc"],
+            "prod_long_desc": raw["prod_long_desc"],
+        }
+    )
+    # three markets per set
+    listings = pd.DataFrame(
+        {
+            "prod_id": np.repeat(prod_ids, 3),
+            "country_id": np.tile([1, 2, 3], sets),
+            "star_rating": np.tile(raw["star_rating"].to_numpy(), 3),
+        }
+    )
+    themes = pd.DataFrame(
+        {
+            "theme_id": np.arange(1, 13),
+            "theme_name": [f"theme{i}" for i in range(12)],
+        }
+    )
+    return {
+        "products.csv": products,
+        "product_descriptions.csv": descriptions,
+        "product_listings.csv": listings,
+        "themes.csv": themes,
+    }
+
+
+def scan_search(tables: dict, query: str, limit: int = 20) -> list:
+    products = tables["products.csv"]
+    descriptions = tables["product_descriptions.csv"]
+    query = query.lower()
+    names = products["set_name"].str.lower()
+    in_description = (
+        descriptions["prod_desc"]
+        .str.lower()
+        .str.contains(query, regex=False, na=False)
+    )
+    matches = products[
+        names.str.contains(query, regex=False) | in_description.to_numpy()
+    ]
+    return matches.sort_values("set_name")["prod_id"].head(limit).tolist()
+
+
+def scan_card(tables: dict, prod_id: int) -> dict:
+    products = tables["products.csv"]
+    product = (
+        products[products["prod_id"] == prod_id]
+        .merge(tables["themes.csv"], on="theme_id")
+        .merge(tables["product_descriptions.csv"], on="prod_id")
+    )
+    listings = tables["product_listings.csv"]
+    return {
+        **product.iloc[0].to_dict(),
+        "listings": listings[listings["prod_id"] == prod_id],
+    }
+
+
+def main():
+    sets = int(sys.argv[1]) if len(sys.argv) > 1 else 300_000
+    tables = make_tables(sets)
+
+    build = best_of(lambda: build_search_index(tables), repeat=1)
+    index = build_search_index(tables)
+    print(f"{sets} sets - index built in {build:.3f}s")
+
+    print(f"{'query':<22} {'scan':>9} {'index':>9}")
+    for query in QUERIES:
+        scan = best_of(lambda: scan_search(tables, query))
+        indexed = best_of(lambda: search_products(index, query), repeat=20)
+        print(f"{query!r:<22} {scan * 1000:7.1f}ms {indexed * 1000:7.3f}ms")
+
+    prod_id = sets // 2
+    scan = best_of(lambda: scan_card(tables, prod_id))
+    indexed = best_of(lambda: product_card(index, prod_id), repeat=20)
+    print(f"{'product card':<22} {scan * 1000:7.1f}ms {indexed * 1000:7.3f}ms")
+
+
+if __name__ == "__main__":
+    main()
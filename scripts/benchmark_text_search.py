@@ -0,0 +1,84 @@
+"""
+Benchmark keyword search over product descriptions:
+    - scan: load product_descriptions and substring-match prod_desc /
+      prod_long_desc with pandas (every keyword must appear, unranked)
+    - index: build_text_index once (ETL side), then load the index
+      tables and run BM25-ranked search_descriptions queries
+
+Usage: python -m scripts.benchmark_text_search [products]
+"""
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+import numpy as np
+import pandas as pd
+from scripts.benchmark_utils import make_raw_lego_frame, best_of
+from src.data_access import app_data_loader
+from src.data_access.text_search import load_text_index, search_descriptions
+from src.load.text_index import build_text_index
+from src.utils.table_io import set_output_format, write_frame
+
+QUERIES = ["dragon", "castle train", "police station fire adventure"]
+
+
+def scan(descriptions: pd.DataFrame, query: str) -> list:
+    text = (
+        descriptions["prod_desc"].fillna("")
+        + " "
+        + descriptions["prod_long_desc"]
+    )
+    text = text.str.lower()
+    matches = np.ones(len(text), dtype=bool)
+    for keyword in query.split():
+        matches &= text.str.contains(keyword, regex=False).to_numpy()
+    return descriptions.loc[matches, "prod_id"].tolist()
+
+
+def main():
+    products = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    raw = make_raw_lego_frame(products)
+    descriptions = pd.DataFrame(
+        {
+            "prod_id": np.arange(1, products + 1),
+            "prod_desc": raw["prod_desc"],
+            "prod_long_desc": raw["prod_long_desc"],
+        }
+    )
+
+    start = time.perf_counter()
+    tables = build_text_index(descriptions)
+    print(
+        f"{products} products - index built in "
+        f"{time.perf_counter() - start:.2f}s"
+    )
+
+    with tempfile.TemporaryDirectory() as tmp:
+        app_data_loader.OUTPUT_DIR = Path(tmp)
+        set_output_format("parquet")
+        write_frame(descriptions, Path(tmp), "product_descriptions.csv")
+        for name, table in tables.items():
+            write_frame(table, Path(tmp), name)
+
+        def load_descriptions():
+            return app_data_loader.load_table("product_descriptions.csv")
+
+        print(f"load descriptions {best_of(load_descriptions):.3f}s")
+        print(f"load text index   {best_of(load_text_index):.3f}s")
+
+        index = load_text_index()
+        print(f"{'query':<32} {'scan':>9} {'index':>9}")
+        for query in QUERIES:
+            scanned = best_of(lambda: scan(descriptions, query))
+            indexed = best_of(
+                lambda: search_descriptions(query, index=index), 10
+            )
+            print(
+                f"{query!r:<32} {scanned * 1000:7.1f}ms "
+                f"{indexed * 1000:7.2f}ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+import timeit
+import numpy as np
+import pandas as pd
+
+AGES = [
+    "6-12",
+    "12+",
+    "7-12",
+    "10+",
+    "5-12",
+    "8-12",
+    "4-7",
+    "4+",
+    "9-12",
+    "16+",
+    "14+",
+    "9-14",
+    "7-14",
+    "8-14",
+    "6+",
+    "2-5",
+    "1½-3",
+    "1½-5",
+    "9+",
+    "5-8",
+]
+COUNTRIES = [
+    "US",
+    "AU",
+    "AT",
+    "BE",
+    "CA",
+    "CH",
+    "CZ",
+    "DE",
+    "DN",
+    "ES",
+    "FI",
+    "FR",
+    "GB",
+    "IE",
+    "IT",
+    "LU",
+    "NO",
+    "NL",
+    "NZ",
+    "PL",
+    "PT",
+]
+THEMES = [
+    "City",
+    "Technic",
+    "Star Wars™",
+    "Friends",
+    "NINJAGO®",
+    "Creator Expert",
+    "DUPLO®",
+    "Ideas",
+    "Architecture",
+    "Minecraft™",
+    "Elves",
+    "Classic",
+]
+DIFFICULTIES = [
+    "Very Easy",
+    "Easy",
+    "Average",
+    "Challenging",
+    "Very Challenging",
+]
+WORDS = [
+    "build",
+    "brick",
+    "minifigure",
+    "vehicle",
+    "castle",
+    "train",
+    "ship",
+    "dragon",
+    "space",
+    "police",
+    "fire",
+    "station",
+    "adventure",
+    "kids",
+]
+
+
+def make_raw_lego_frame(rows: int, seed: int = 0) -> pd.DataFrame:
+    """
+    Synthetic frame shaped like the raw Kaggle LEGO export, with nulls
+    in the same columns the real data has them
+    """
+    rng = np.random.default_rng(seed)
+    words = np.array(WORDS)
+
+    def text(n_words):
+        return [" ".join(rng.choice(words, n_words)) for _ in range(rows)]
+
+    def with_nulls(values, rate=0.05):
+        values = pd.Series(values, dtype=object)
+        values[rng.random(rows) < rate] = None
+        return values
+
+    return pd.DataFrame(
+        {
+            "ages": rng.choice(AGES, rows),
+            "list_price": rng.uniform(5, 400, rows).round(4),
+            "num_reviews": with_nulls(rng.integers(0, 300, rows)),
+            "piece_count": rng.integers(10, 4000, rows),
+            "play_star_rating": rng.uniform(1, 5, rows).round(1),
+            "prod_desc": with_nulls(text(8)),
+            "prod_id": rng.integers(10_000, 80_000, rows),
+            "prod_long_desc": text(30),
+            "review_difficulty": with_nulls(
+                rng.choice(DIFFICULTIES, rows), 0.15
+            ),
+            "set_name": text(3),
+            "star_rating": rng.uniform(1, 5, rows).round(1),
+            "theme_name": with_nulls(rng.choice(THEMES, rows), 0.01),
+            "val_star_rating": rng.uniform(1, 5, rows).round(1),
+            "country": rng.choice(COUNTRIES, rows),
+        }
+    )
+
+
+def best_of(func, repeat: int = 3) -> float:
+    """
+    Best wall-clock time of repeat calls, in seconds
+    """
+    return min(timeit.repeat(func, number=1, repeat=repeat))
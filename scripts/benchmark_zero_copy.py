@@ -0,0 +1,123 @@
+"""
+Benchmark app table loading - cold start and private memory, each
+mode in a fresh process:
+    - csv + cache_data: read_csv, then a pickled copy per session access
+      (what @st.cache_data in get_tables did)
+    - arrow copy: memory-mapped Arrow IPC copied into numpy columns,
+      one frame shared by every session (table cache)
+    - arrow zero-copy: load_table's default - pd.ArrowDtype columns over
+      the memory map, shared by every session
+Private memory is RSS minus file-backed shared pages, so mapped table
+files the OS can share / drop are not counted.
+
+Usage: python -m scripts.benchmark_zero_copy [rows] [sessions]
+"""
+
+import pickle
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+import pandas as pd
+import psutil
+from scripts.benchmark_utils import make_raw_lego_frame
+from src.data_access.app_cache_all_tables import TABLES
+from src.load.star_schema import build_star_schema
+from src.transform.transform import transform_data
+from src.utils import key_registry
+from src.utils.table_io import read_arrow, set_output_format, write_frame
+
+MODES = ["csv + cache_data", "arrow copy", "arrow zero-copy"]
+STAR_TABLES = TABLES[:6]
+
+
+def private_mb() -> float:
+    memory = psutil.Process().memory_info()
+    return (memory.rss - memory.shared) / 1e6
+
+
+def measure(mode: str, directory: Path, sessions: int) -> None:
+    """
+    Runs in the child process - prints cold start, memory after 1 / n
+    sessions
+    """
+    baseline = private_mb()
+
+    start = time.perf_counter()
+    if mode == "csv + cache_data":
+        tables = {
+            name: pd.read_csv(directory / "csv" / f"{name}.csv")
+            for name in STAR_TABLES
+        }
+    else:
+        tables = {
+            name: read_arrow(
+                directory / "feather" / f"{name}.arrow",
+                zero_copy=mode == "arrow zero-copy",
+            )
+            for name in STAR_TABLES
+        }
+    cold = time.perf_counter() - start
+
+    views = []
+    for _ in range(sessions):
+        if mode == "csv + cache_data":
+            views.append(pickle.loads(pickle.dumps(tables)))
+        else:
+            views.append(tables)
+        # each session touches every column, as the pages do
+        for df in views[-1].values():
+            for col in df.select_dtypes("number"):
+                df[col].sum()
+        if len(views) == 1:
+            one = private_mb() - baseline
+
+    print(f"{cold:.3f} {one:.0f} {private_mb() - baseline:.0f}")
+
+
+def main():
+    if sys.argv[1:2] == ["--child"]:
+        measure(sys.argv[2], Path(sys.argv[3]), int(sys.argv[4]))
+        return
+
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    sessions = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+
+    with tempfile.TemporaryDirectory() as tmp:
+        key_registry.REGISTRY_DIR = Path(tmp) / "keys"
+        tables = build_star_schema(transform_data(make_raw_lego_frame(rows)))
+        # one directory per format - a write removes the table's other formats
+        for output_format in ["csv", "feather"]:
+            set_output_format(output_format)
+            (Path(tmp) / output_format).mkdir()
+            for name, table in tables.items():
+                write_frame(table, Path(tmp) / output_format, name)
+        print(
+            f"{len(tables['product_listings.csv'])} listings, "
+            f"{sessions} sessions"
+        )
+
+        print(
+            f"{'mode':<18} {'cold start':>10} {'1 session':>10} "
+            f"{'sessions':>9}"
+        )
+        for mode in MODES:
+            child = [
+                sys.executable,
+                "-m",
+                "scripts.benchmark_zero_copy",
+                "--child",
+            ]
+            output = subprocess.run(
+                [*child, mode, tmp, str(sessions)],
+                capture_output=True,
+                text=True,
+                check=True,
+            ).stdout.split()
+            cold, one, total = output[-3:]
+            print(f"{mode:<18} {float(cold):9.3f}s {one:>8}MB {total:>7}MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,43 @@
-import streamlit as st
-from src.data_access.app_data_loader import load_table
-
-
-@st.cache_data
-def get_tables():
-    return {
-        "products": load_table("products.csv"),
-        "themes": load_table("themes.csv"),
-        "reviews": load_table("reviews.csv"),
-        "countries": load_table("countries.csv"),
-        "product_descriptions": load_table("product_descriptions.csv"),
-        "product_listings": load_table("product_listings.csv"),
-    }
+from collections.abc import Mapping
+from src.data_access.table_cache import get_table
+
+TABLES = [
+    "products",
+    "themes",
+    "reviews",
+    "countries",
+    "product_descriptions",
+    "product_listings",
+    # aggregates materialized by the ETL (see load.aggregates)
+    "overview_stats",
+    "product_stats",
+    "country_stats",
+    "theme_stats",
+    "theme_country_stats",
+]
+
+
+class _LazyTables(Mapping):
+    """
+    tables["products"] loads through the table cache on access, so a
+    page only loads the tables it uses and picks up a new ETL run
+    """
+
+    def __getitem__(self, name: str):
+        if name not in TABLES:
+            raise KeyError(name)
+        return get_table(f"{name}.csv")
+
+    def __contains__(self, name) -> bool:
+        # without loading the table
+        return name in TABLES
+
+    def __iter__(self):
+        return iter(TABLES)
+
+    def __len__(self):
+        return len(TABLES)
+
+
+def get_tables() -> Mapping:
+    return _LazyTables()
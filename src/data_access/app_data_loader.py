@@ -1,17 +1,63 @@
 from pathlib import Path
 import pandas as pd
+from src.load.aggregates import AGGREGATE_TABLES, SOURCE_TABLES
+from src.utils.table_io import (
+    filter_frame,
+    find_table,
+    read_frame,
+    table_version,
+)
 
 OUTPUT_DIR = Path("data/output")
 
 
-def load_table(table_name: str) -> pd.DataFrame:
+def load_table(table_name: str, filters: list | None = None) -> pd.DataFrame:
     """
-    Load a table from local output folder
+    Load a table from local output folder.
+    The format (CSV, Parquet, Arrow IPC or a partitioned Parquet
+    directory) is detected from the files present - the most recently
+    written one wins.
+    filters, e.g. [("country_id", "in", [1, 4])], only load matching
+    rows - a partitioned table only reads the matching partitions.
+    Arrow IPC tables are memory-mapped and returned zero-copy, with
+    pd.ArrowDtype columns (see read_arrow).
+    Aggregate tables missing from the output (written before the ETL
+    materialized them) are computed from the star-schema tables.
     """
 
-    path = OUTPUT_DIR / table_name
+    path = find_table(OUTPUT_DIR, table_name)
 
-    if not path.exists():
-        raise FileNotFoundError(f"Table not found: {path}")
+    if path is None and table_name in AGGREGATE_TABLES:
+        return filter_frame(
+            AGGREGATE_TABLES[table_name](_source_tables()), filters
+        )
 
-    return pd.read_csv(path)
+    if path is None:
+        raise FileNotFoundError(f"Table not found: {OUTPUT_DIR / table_name}")
+
+    return read_frame(path, filters=filters, arrow_backed=True)
+
+
+def current_version(table_name: str) -> tuple | None:
+    """
+    Version of a table as load_table would serve it (see table_version):
+    a computed aggregate's is that of its source tables, None if the
+    table doesn't exist
+    """
+    path = find_table(OUTPUT_DIR, table_name)
+
+    if path is None and table_name in AGGREGATE_TABLES:
+        return tuple(current_version(name) for name in SOURCE_TABLES)
+
+    return None if path is None else table_version(path)
+
+
+def _source_tables() -> dict:
+    # numpy-backed, as the ETL reads them for create_aggregate_tables
+    tables = {}
+    for name in SOURCE_TABLES:
+        path = find_table(OUTPUT_DIR, name)
+        if path is None:
+            raise FileNotFoundError(f"Table not found: {OUTPUT_DIR / name}")
+        tables[name] = read_frame(path)
+    return tables
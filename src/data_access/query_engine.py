@@ -0,0 +1,176 @@
+import threading
+from collections import OrderedDict
+from pathlib import Path
+import duckdb
+import pandas as pd
+import pyarrow.feather as feather
+from src.data_access import app_data_loader
+from src.utils.table_io import PARTITION_FILE, find_table, table_version
+
+# output tables the engine exposes, by SQL name
+QUERY_TABLES = [
+    "products",
+    "themes",
+    "reviews",
+    "countries",
+    "product_descriptions",
+    "product_listings",
+    "overview_stats",
+    "product_stats",
+    "country_stats",
+    "theme_stats",
+    "theme_country_stats",
+]
+
+# ORDER BY columns top_products accepts - columns can't be bound
+RATING_COLUMNS = ["avg_star_rating", "avg_value_rating", "avg_play_rating"]
+
+# dashboard queries, parameters bound by name ($name)
+QUERIES = {
+    "top_products": """
+        SELECT p.prod_id, p.set_name, t.theme_name,
+               AVG(l.star_rating) AS avg_star_rating,
+               AVG(l.val_star_rating) AS avg_value_rating,
+               AVG(l.play_star_rating) AS avg_play_rating,
+               SUM(l.num_reviews) AS total_reviews
+        FROM product_listings l
+        JOIN products p USING (prod_id)
+        JOIN themes t USING (theme_id)
+        WHERE $theme_name IS NULL OR t.theme_name = $theme_name
+        GROUP BY ALL
+        HAVING {order_by} IS NOT NULL
+        ORDER BY {order_by} DESC, total_reviews DESC, p.prod_id
+        LIMIT $limit
+    """,
+}
+
+# results kept per (query, parameters, table versions)
+MAX_CACHED_RESULTS = 256
+
+# versions: table -> version registered; kinds: table -> VIEW / TABLE
+_state = {"connection": None, "versions": {}, "kinds": {}}
+_results = OrderedDict()
+_lock = threading.Lock()
+
+
+def _connection() -> duckdb.DuckDBPyConnection:
+    if _state["connection"] is None:
+        _state["connection"] = duckdb.connect(":memory:")
+    return _state["connection"]
+
+
+def _register(connection, name: str, path: Path) -> None:
+    """
+    Expose one output table to SQL:
+        - parquet (file or partitioned dataset): a view over the files,
+          scanned in place with filter / column pushdown
+        - Arrow IPC: memory-mapped and registered zero-copy
+        - CSV: parsed once per version into a DuckDB table (re-parsing
+          the text on every query would dominate)
+    """
+    _drop(connection, name)
+    _state["kinds"][name] = "TABLE" if path.suffix == ".csv" else "VIEW"
+
+    if path.is_dir():
+        files = (path / "*" / PARTITION_FILE).as_posix()
+        connection.execute(
+            f"CREATE VIEW {name} AS SELECT * FROM "
+            f"read_parquet('{files}', hive_partitioning = true)"
+        )
+    elif path.suffix == ".parquet":
+        connection.execute(
+            f"CREATE VIEW {name} AS SELECT * FROM "
+            f"read_parquet('{path.as_posix()}')"
+        )
+    elif path.suffix == ".arrow":
+        connection.register(
+            f"{name}_arrow", feather.read_table(path, memory_map=True)
+        )
+        connection.execute(f"CREATE VIEW {name} AS SELECT * FROM {name}_arrow")
+    else:
+        connection.execute(
+            f"CREATE TABLE {name} AS SELECT * FROM "
+            f"read_csv('{path.as_posix()}', header = true)"
+        )
+
+
+def _drop(connection, name: str) -> None:
+    # DROP VIEW fails on a table and vice versa - a run can switch formats
+    kind = _state["kinds"].pop(name, None)
+    if kind is not None:
+        connection.execute(f"DROP {kind} {name}")
+        connection.unregister(f"{name}_arrow")
+
+
+def _refresh_tables() -> tuple:
+    """
+    (Re)register every output table whose file changed since it was
+    registered; returns the current versions
+    """
+    connection = _connection()
+    versions = {}
+    for name in QUERY_TABLES:
+        path = find_table(app_data_loader.OUTPUT_DIR, f"{name}.csv")
+        if path is None:
+            continue
+        versions[name] = table_version(path)
+        if _state["versions"].get(name) != versions[name]:
+            _register(connection, name, path)
+
+    for name in set(_state["versions"]) - set(versions):
+        _drop(connection, name)
+
+    _state["versions"] = versions
+    return tuple(sorted(versions.items()))
+
+
+def query(sql: str, params: dict | None = None) -> pd.DataFrame:
+    """
+    Run SQL over the output tables (referenced by table name, e.g.
+    product_listings) with $name parameters bound from params:
+        - tables are picked up in whatever format the ETL wrote and
+          re-registered when a new run rewrites them
+        - results are cached per (sql, params, table versions) - treat
+          the returned frame as read-only
+    """
+    params = params or {}
+    with _lock:
+        key = (sql, tuple(sorted(params.items())), _refresh_tables())
+        if key in _results:
+            _results.move_to_end(key)
+            return _results[key]
+
+        result = _connection().execute(sql, params).df()
+
+        _results[key] = result
+        if len(_results) > MAX_CACHED_RESULTS:
+            _results.popitem(last=False)
+        return result
+
+
+def run_query(name: str, **params) -> pd.DataFrame:
+    """
+    One of the dashboard QUERIES, e.g.
+    run_query("top_products", theme_name="City", limit=5,
+              order_by="avg_value_rating")
+    (theme_name None = all themes, order_by one of RATING_COLUMNS)
+    """
+    if name == "top_products":
+        order_by = params.pop("order_by", "avg_star_rating")
+        if order_by not in RATING_COLUMNS:
+            raise ValueError(f"Unknown rating column: {order_by}")
+        params = {"theme_name": None, "limit": 10, **params}
+        return query(QUERIES[name].format(order_by=order_by), params)
+
+    return query(QUERIES[name], params)
+
+
+def clear_query_cache() -> None:
+    """Forget cached results and registered tables."""
+    with _lock:
+        _results.clear()
+        if _state["connection"] is not None:
+            _state["connection"].close()
+        _state["connection"] = None
+        _state["versions"] = {}
+        _state["kinds"] = {}
@@ -0,0 +1,270 @@
+import threading
+from bisect import bisect_left
+import numpy as np
+import pandas as pd
+from src.data_access import app_data_loader
+from src.data_access.table_cache import get_table
+from src.utils.table_io import find_table, table_version
+
+# tables the index is built from - a new version of any rebuilds it
+INDEX_TABLES = [
+    "products.csv",
+    "themes.csv",
+    "product_descriptions.csv",
+    "product_listings.csv",
+]
+
+# separates texts in the n-gram build - grams spanning it are dropped
+_SEPARATOR = "\0"
+
+_index = {"version": None, "index": None}
+_lock = threading.Lock()
+
+
+def _positions(prod_ids: pd.Series) -> dict:
+    # prod_id -> row position (first row, like the old .iloc[0] lookups)
+    first = ~prod_ids.duplicated().to_numpy()
+    return dict(
+        zip(prod_ids.to_numpy()[first].tolist(), np.flatnonzero(first))
+    )
+
+
+def _group_positions(prod_ids: pd.Series) -> tuple:
+    # prod_id -> (start, end) into order, the row positions sorted by prod_id
+    order = np.argsort(prod_ids.to_numpy(), kind="stable")
+    distinct, starts = np.unique(prod_ids.to_numpy()[order], return_index=True)
+    ends = np.append(starts[1:], len(order))
+    return order, dict(
+        zip(distinct.tolist(), zip(starts.tolist(), ends.tolist()))
+    )
+
+
+def trigram_postings(texts: list) -> dict:
+    """
+    Trigram index over texts, built with numpy over one concatenated
+    string instead of per-text Python loops:
+        - chars: char -> code
+        - gram_ids: sorted distinct trigram ids
+        - offsets: gram_ids[i]'s text numbers are
+          text_ids[offsets[i]:offsets[i + 1]] (ascending)
+    """
+    joined = _SEPARATOR.join(texts) + _SEPARATOR
+    code_points = np.frombuffer(joined.encode("utf-32-le"), dtype=np.uint32)
+    # dense char codes via a lookup table - linear, unlike np.unique
+    present = np.zeros(int(code_points.max()) + 1, dtype=bool)
+    present[code_points] = True
+    chars = np.flatnonzero(present)
+    codes = (np.cumsum(present) - 1)[code_points]
+    lengths = np.fromiter(
+        (len(text) + 1 for text in texts), np.int64, len(texts)
+    )
+    text_of_char = np.repeat(np.arange(len(texts)), lengths)
+
+    base = len(chars)
+    gram_ids = (codes[:-2] * base + codes[1:-1]) * base + codes[2:]
+    # drop grams that span a separator
+    separator = np.searchsorted(chars, ord(_SEPARATOR))
+    inside = (codes[:-2] != separator) & (codes[1:-1] != separator)
+    inside &= codes[2:] != separator
+    gram_ids, text_ids = gram_ids[inside], text_of_char[:-2][inside]
+
+    # one sort of (gram, text) pairs: each gram's texts ascending, repeats
+    # of a gram within a text dropped
+    if base**3 * len(texts) < 2**63:
+        # np.sort + diff - np.unique is many times slower here
+        pairs = np.sort(gram_ids * len(texts) + text_ids)
+        pairs = pairs[np.diff(pairs, prepend=-1) != 0]
+        gram_ids, text_ids = pairs // len(texts), pairs % len(texts)
+    else:
+        order = np.lexsort((text_ids, gram_ids))
+        gram_ids, text_ids = gram_ids[order], text_ids[order]
+        first = np.ones(len(gram_ids), dtype=bool)
+        first[1:] = (gram_ids[1:] != gram_ids[:-1]) | (
+            text_ids[1:] != text_ids[:-1]
+        )
+        gram_ids, text_ids = gram_ids[first], text_ids[first]
+
+    starts = np.flatnonzero(np.diff(gram_ids, prepend=-1))
+    return {
+        "chars": {chr(char): code for code, char in enumerate(chars.tolist())},
+        "base": base,
+        "gram_ids": gram_ids[starts],
+        "offsets": np.append(starts, len(gram_ids)),
+        "text_ids": text_ids,
+    }
+
+
+def _gram_texts(postings: dict, gram: str) -> np.ndarray:
+    chars = postings["chars"]
+    if any(char not in chars for char in gram):
+        return np.empty(0, dtype=np.int64)
+    base = postings["base"]
+    gram_id = (chars[gram[0]] * base + chars[gram[1]]) * base + chars[gram[2]]
+    i = np.searchsorted(postings["gram_ids"], gram_id)
+    if i == len(postings["gram_ids"]) or postings["gram_ids"][i] != gram_id:
+        return np.empty(0, dtype=np.int64)
+    start, end = postings["offsets"][i], postings["offsets"][i + 1]
+    return postings["text_ids"][start:end]
+
+
+def build_search_index(tables: dict) -> dict:
+    """
+    Lookup structures for the Product Searcher, built once per data
+    version (tables keyed by output name):
+        - prod_id -> row position maps for products and descriptions,
+          prod_id -> slice of listing_order (its listing rows)
+        - options: prod_ids in set_name order, for the selectbox
+        - names: lowercase set_names sorted, for prefix search
+        - a trigram index over set_name + prod_desc for substring search
+    """
+    products_df = tables["products.csv"]
+    descriptions_df = tables["product_descriptions.csv"]
+
+    names = products_df["set_name"].fillna("").astype(str)
+    descriptions = (
+        products_df[["prod_id"]]
+        .merge(
+            descriptions_df[["prod_id", "prod_desc"]], on="prod_id", how="left"
+        )
+        .drop_duplicates(subset="prod_id")
+        .set_index("prod_id")["prod_desc"]
+    )
+
+    # products ranked by lowercase set_name - every search returns ranks
+    lower = names.str.lower()
+    by_name = np.argsort(lower.to_numpy(), kind="stable")
+    ranked_names = lower.to_numpy()[by_name].tolist()
+    ranked_descriptions = (
+        descriptions.reindex(products_df["prod_id"].to_numpy()[by_name])
+        .fillna("")
+        .astype(str)
+        .str.lower()
+        .tolist()
+    )
+    texts = [
+        f"{name}{_SEPARATOR}{description}"
+        for name, description in zip(ranked_names, ranked_descriptions)
+    ]
+
+    listing_order, listing_rows = _group_positions(
+        tables["product_listings.csv"]["prod_id"]
+    )
+
+    return {
+        "tables": tables,
+        "product_rows": _positions(products_df["prod_id"]),
+        "description_rows": _positions(descriptions_df["prod_id"]),
+        "listing_order": listing_order,
+        "listing_rows": listing_rows,
+        "theme_names": dict(
+            zip(
+                tables["themes.csv"]["theme_id"],
+                tables["themes.csv"]["theme_name"],
+            )
+        ),
+        "options": products_df["prod_id"]
+        .to_numpy()[np.argsort(names.to_numpy(), kind="stable")]
+        .tolist(),
+        "by_name": by_name,
+        "names": ranked_names,
+        "texts": texts,
+        "postings": trigram_postings(texts),
+    }
+
+
+def search_products(index: dict, query: str, limit: int = 20) -> list:
+    """
+    prod_ids matching a type-ahead query, case-insensitive:
+        - set_names starting with the query first (binary search)
+        - then set_names / prod_descs containing it (trigram index,
+          candidates checked in set_name order until limit is reached)
+    """
+    query = query.strip().lower()
+    if not query:
+        return []
+
+    names = index["names"]
+    ranks = []
+    start = bisect_left(names, query)
+    for rank in range(start, len(names)):
+        if len(ranks) == limit or not names[rank].startswith(query):
+            break
+        ranks.append(rank)
+
+    if len(ranks) < limit and len(query) >= 3:
+        # texts holding every trigram of the query, rarest gram first
+        postings = sorted(
+            (
+                _gram_texts(index["postings"], query[i:][:3])
+                for i in range(len(query) - 2)
+            ),
+            key=len,
+        )
+        if len(postings) == 1:
+            candidates = postings[0]
+        else:
+            # texts in every posting list - one linear count, no sorting
+            counts = np.bincount(
+                np.concatenate(postings), minlength=len(names)
+            )
+            candidates = np.flatnonzero(counts == len(postings))
+
+        prefixed = set(ranks)
+        for rank in candidates:
+            if len(ranks) == limit:
+                break
+            if rank not in prefixed and query in index["texts"][rank]:
+                ranks.append(rank)
+
+    products_df = index["tables"]["products.csv"]
+    return products_df["prod_id"].to_numpy()[index["by_name"][ranks]].tolist()
+
+
+def product_card(index: dict, prod_id) -> dict:
+    """
+    Everything the product card shows for one prod_id, by position -
+    no scans or merges: its products / descriptions rows, theme name and
+    listings (one row per country)
+    """
+    tables = index["tables"]
+    product = tables["products.csv"].iloc[index["product_rows"][prod_id]]
+    description_row = index["description_rows"].get(prod_id)
+    start, end = index["listing_rows"].get(prod_id, (0, 0))
+
+    return {
+        **product.to_dict(),
+        "theme_name": index["theme_names"].get(product["theme_id"]),
+        "prod_long_desc": (
+            None
+            if description_row is None
+            else tables["product_descriptions.csv"]["prod_long_desc"].iloc[
+                description_row
+            ]
+        ),
+        "listings": tables["product_listings.csv"].iloc[
+            index["listing_order"][start:end]
+        ],
+    }
+
+
+def get_search_index() -> dict:
+    """
+    The search index for the current output tables - rebuilt only when
+    one of them changed (same path / size / mtime versions as the table
+    cache)
+    """
+    version = tuple(
+        table_version(path) if path is not None else None
+        for path in (
+            find_table(app_data_loader.OUTPUT_DIR, name)
+            for name in INDEX_TABLES
+        )
+    )
+
+    with _lock:
+        if _index["version"] != version:
+            _index["index"] = build_search_index(
+                {name: get_table(name) for name in INDEX_TABLES}
+            )
+            _index["version"] = version
+        return _index["index"]
@@ -0,0 +1,116 @@
+import threading
+import time
+from collections import OrderedDict
+from src.data_access import app_data_loader
+
+# cached frames, least recently used first - filtered loads add one
+# entry per distinct filter, so the count is capped
+MAX_CACHED_TABLES = 64
+
+# table key -> (version when loaded, frame)
+_entries = OrderedDict()
+# table name -> hits / misses / evictions / load_seconds
+_stats = {}
+# table key -> lock held while that key loads, so concurrent misses
+# load it once without blocking other tables
+_load_locks = {}
+# guards the dicts above - never held while a table loads
+_lock = threading.Lock()
+
+
+def _key(table_name: str, filters: list | None) -> tuple:
+    # filters are lists of (column, op, value) - make them hashable
+    return (
+        table_name,
+        tuple(
+            (column, op, tuple(value) if isinstance(value, list) else value)
+            for column, op, value in filters or []
+        ),
+    )
+
+
+def _cached(key: tuple, version, stats: dict):
+    # caller holds _lock - the current frame, or None after evicting a
+    # stale one
+    entry = _entries.get(key)
+    if entry is not None and entry[0] == version:
+        stats["hits"] += 1
+        _entries.move_to_end(key)
+        return entry[1]
+    if entry is not None:
+        stats["evictions"] += 1
+        del _entries[key]
+    return None
+
+
+def get_table(table_name: str, filters: list | None = None):
+    """
+    Load a table through the cache:
+        - loaded on first access only (load_table), not up front
+        - entries are keyed by the table's file path + size + mtime, so
+          a new ETL run that changed a table is picked up on the next
+          access and the stale entry evicted; unchanged tables (not
+          rewritten, see write_frame) stay cached; an aggregate computed
+          on load is keyed by its source tables' versions
+        - a slow load only blocks callers of the same table + filters;
+          at most MAX_CACHED_TABLES frames are kept, least recently
+          used evicted first
+    The frame is shared between callers - don't modify it in place.
+    """
+    key = _key(table_name, filters)
+    version = app_data_loader.current_version(table_name)
+
+    with _lock:
+        stats = _stats.setdefault(
+            table_name,
+            {"hits": 0, "misses": 0, "evictions": 0, "load_seconds": 0.0},
+        )
+        df = _cached(key, version, stats)
+        if df is not None:
+            return df
+        load_lock = _load_locks.setdefault(key, threading.Lock())
+
+    with load_lock:
+        # another caller may have loaded it while this one waited
+        with _lock:
+            df = _cached(key, version, stats)
+            if df is not None:
+                return df
+
+        start = time.perf_counter()
+        df = app_data_loader.load_table(table_name, filters)
+        seconds = time.perf_counter() - start
+
+        with _lock:
+            stats["load_seconds"] += seconds
+            stats["misses"] += 1
+            _entries[key] = (version, df)
+            while len(_entries) > MAX_CACHED_TABLES:
+                evicted_key, _ = _entries.popitem(last=False)
+                _load_locks.pop(evicted_key, None)
+                _stats[evicted_key[0]]["evictions"] += 1
+
+        return df
+
+
+def cache_stats() -> dict:
+    """
+    Hit / miss / eviction counts and total load time, overall and per
+    table (filtered loads of a table count towards the table)
+    """
+    with _lock:
+        tables = {name: dict(stats) for name, stats in _stats.items()}
+        cached = len(_entries)
+
+    totals = {
+        field: sum(stats[field] for stats in tables.values())
+        for field in ["hits", "misses", "evictions", "load_seconds"]
+    }
+    return {**totals, "cached": cached, "tables": tables}
+
+
+def clear_cache() -> None:
+    with _lock:
+        _entries.clear()
+        _stats.clear()
+        _load_locks.clear()
@@ -0,0 +1,114 @@
+import threading
+import numpy as np
+import pandas as pd
+from src.data_access import app_data_loader
+from src.load.text_index import tokenize
+from src.utils.table_io import find_table, read_frame, table_version
+
+# BM25 parameters - the usual defaults
+K1 = 1.2
+B = 0.75
+
+_index = {"version": None, "index": None}
+_lock = threading.Lock()
+
+
+def _read(name: str) -> pd.DataFrame:
+    path = find_table(app_data_loader.OUTPUT_DIR, name)
+    if path is None:
+        raise FileNotFoundError(
+            f"Table not found: {app_data_loader.OUTPUT_DIR / name}"
+        )
+    # terms like "000" or "nan" must stay strings
+    return read_frame(path, dtype={"term": str}, keep_default_na=False)
+
+
+def load_text_index() -> dict:
+    """
+    The text index tables written by the ETL (load.text_index) as
+    arrays: term -> (start, end) into the postings, postings doc ids /
+    term frequencies, and each document's prod_id and BM25 length norm
+    """
+    documents = _read("text_documents.csv")
+    terms = _read("text_terms.csv")
+    postings = _read("text_postings.csv")
+
+    ends = np.cumsum(terms["doc_freq"].to_numpy())
+    lengths = documents["length"].to_numpy().astype(float)
+    average = lengths.mean() if len(lengths) else 0.0
+
+    return {
+        "terms": dict(
+            zip(
+                terms["term"].tolist(),
+                zip((ends - terms["doc_freq"]).tolist(), ends),
+            )
+        ),
+        "doc_ids": postings["doc_id"].to_numpy(),
+        "tf": postings["tf"].to_numpy().astype(float),
+        "prod_ids": documents["prod_id"].to_numpy(),
+        "length_norm": K1 * (1 - B + B * lengths / (average or 1.0)),
+    }
+
+
+def get_text_index() -> dict:
+    """
+    The loaded text index, reloaded only when the ETL rewrote it
+    """
+    version = tuple(
+        table_version(path) if path is not None else None
+        for path in (
+            find_table(app_data_loader.OUTPUT_DIR, name)
+            for name in [
+                "text_documents.csv",
+                "text_terms.csv",
+                "text_postings.csv",
+            ]
+        )
+    )
+
+    with _lock:
+        if _index["version"] != version:
+            _index["index"] = load_text_index()
+            _index["version"] = version
+        return _index["index"]
+
+
+def search_descriptions(
+    query: str, limit: int = 20, index: dict | None = None
+) -> pd.DataFrame:
+    """
+    Products whose prod_desc / prod_long_desc match the query's keywords,
+    ranked by BM25 score (any keyword matches; more matching, rarer
+    keywords rank higher). Returns prod_id and score, best first.
+    """
+    index = index if index is not None else get_text_index()
+    scores = np.zeros(len(index["prod_ids"]))
+    documents = len(index["prod_ids"])
+
+    for term in set(tokenize(pd.Series([query]))):
+        if term not in index["terms"]:
+            continue
+        start, end = index["terms"][term]
+        doc_ids = index["doc_ids"][start:end]
+        tf = index["tf"][start:end]
+
+        idf = np.log(
+            1 + (documents - len(doc_ids) + 0.5) / (len(doc_ids) + 0.5)
+        )
+        # doc ids are distinct within a term, so plain += is safe
+        scores[doc_ids] += (
+            idf * tf * (K1 + 1) / (tf + index["length_norm"][doc_ids])
+        )
+
+    matched = np.flatnonzero(scores)
+    if len(matched) > limit:
+        matched = matched[np.argpartition(-scores[matched], limit - 1)[:limit]]
+    # best first, ties by prod_id
+    order = np.lexsort((index["prod_ids"][matched], -scores[matched]))
+    return pd.DataFrame(
+        {
+            "prod_id": index["prod_ids"][matched][order],
+            "score": scores[matched][order],
+        }
+    )
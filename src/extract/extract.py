@@ -1,7 +1,13 @@
 from pathlib import Path
 from src.extract.kaggle_downloader import download_kaggle_csv
-from src.extract.extract_lego import extract_lego_data
+from src.extract.extract_lego import (
+    default_engine,
+    extract_lego_data,
+    extract_lego_data_chunks,
+)
+from src.extract.raw_cache import load_raw_cache, save_raw_cache
 from src.utils.logging_utils import setup_logger
+from src.utils.metrics import timed
 
 logger = setup_logger("extract", "extract.log")
 
@@ -9,26 +15,56 @@ logger = setup_logger("extract", "extract.log")
 RAW_FILE = Path("data/raw/lego_sets_raw.csv")
 
 
-def extract_data():
+def locate_raw_file() -> Path:
     """
-    Orchestrates extraction:
+    Returns the local raw CSV path:
     - Checks if raw CSV exists.
     - Downloads from Kaggle if missing
-    - Loads dataframe from CSV
     """
 
-    logger.info("Starting Extraction Pipeline...")
-
     if RAW_FILE.exists():
         logger.info("Raw Lego CSV found Locally - skipping download.")
-        csv_path = RAW_FILE
     else:
         logger.info("Raw LEGO CSV Not Found - Downloading from Kaggle.")
         download_path = download_kaggle_csv()
         download_path.rename(RAW_FILE)
-        csv_path = RAW_FILE
 
-    df = extract_lego_data(csv_path)
+    return RAW_FILE
+
+
+@timed()
+def extract_data(
+    chunksize: int | None = None,
+    max_bytes: int | None = None,
+    engine: str | None = None,
+    use_cache: bool = True,
+):
+    """
+    Orchestrates extraction:
+    - Checks if raw CSV exists.
+    - Downloads from Kaggle if missing
+    - Loads dataframe from the columnar raw cache if the CSV is unchanged and
+      was parsed by the same reader code, raw schema and engine
+    - Otherwise loads dataframe from CSV and refreshes the cache - with
+      pyarrow's parser by default, engine="c" for pandas' C engine
+    - Streams DataFrame chunks instead when chunksize or max_bytes is given
+    """
+
+    logger.info("Starting Extraction Pipeline...")
+
+    csv_path = locate_raw_file()
+
+    if chunksize or max_bytes:
+        logger.info("Streaming extraction enabled - yielding chunks.")
+        return extract_lego_data_chunks(csv_path, chunksize, max_bytes)
+
+    engine = engine or default_engine()
+    df = load_raw_cache(csv_path, engine=engine) if use_cache else None
+
+    if df is None:
+        df = extract_lego_data(csv_path, engine)
+        if use_cache:
+            save_raw_cache(df, csv_path, engine=engine)
 
     logger.info("Extraction Pipeline Completed Successfully.")
     return df
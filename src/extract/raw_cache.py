@@ -0,0 +1,145 @@
+import json
+from pathlib import Path
+import pandas as pd
+from src.extract import extract_lego
+from src.utils.hashing import file_sha256
+from src.utils.logging_utils import setup_logger
+from src.utils.raw_validation import RAW_DTYPES
+from src.utils.stage_cache import code_version
+
+logger = setup_logger("raw_cache", "extract.log")
+
+# Arrow IPC is memory-mapped on read; Parquet is smaller on disk
+CACHE_SUFFIXES = {"feather": ".arrow", "parquet": ".parquet"}
+DEFAULT_CACHE_FORMAT = "feather"
+
+
+def cache_paths(csv_path: Path, cache_format: str) -> tuple[Path, Path]:
+    """Data and metadata paths for the cache next to csv_path."""
+    if cache_format not in CACHE_SUFFIXES:
+        raise ValueError(f"Unknown raw cache format: {cache_format}")
+
+    data_path = csv_path.with_suffix(CACHE_SUFFIXES[cache_format])
+    meta_path = csv_path.with_suffix(".cache.json")
+    return data_path, meta_path
+
+
+def reader_version(engine: str | None = None) -> str:
+    """
+    Identity of how the cached frame was parsed: the reader code, the
+    pinned raw schema (dtypes / usecols) and the parser engine - the
+    engines order categories differently
+    """
+    return code_version(extract_lego, RAW_DTYPES, engine)
+
+
+def _source_matches(csv_path: Path, meta: dict, meta_path: Path) -> bool:
+    """
+    Check the cached fingerprint against the CSV:
+        - size differs -> stale
+        - same size and mtime -> fresh
+        - same size, new mtime -> compare content hash
+    """
+    stat = csv_path.stat()
+
+    if meta["size"] != stat.st_size:
+        return False
+
+    if meta["mtime_ns"] == stat.st_mtime_ns:
+        return True
+
+    if file_sha256(csv_path) != meta["sha256"]:
+        return False
+
+    # touched but unchanged - refresh mtime so the next check is cheap
+    meta["mtime_ns"] = stat.st_mtime_ns
+    meta_path.write_text(json.dumps(meta))
+    return True
+
+
+def load_raw_cache(
+    csv_path: Path,
+    cache_format: str = DEFAULT_CACHE_FORMAT,
+    engine: str | None = None,
+) -> pd.DataFrame | None:
+    """
+    Load the typed raw frame from the columnar cache.
+    Returns None when the cache is missing, stale or unreadable, or was
+    parsed by other reader code / schema / engine (see reader_version).
+    """
+    try:
+        data_path, meta_path = cache_paths(csv_path, cache_format)
+
+        if not (data_path.exists() and meta_path.exists()):
+            logger.info("No raw cache found.")
+            return None
+
+        meta = json.loads(meta_path.read_text())
+        if meta.get("format") != cache_format:
+            logger.info("Raw cache format changed - ignoring cache.")
+            return None
+
+        if meta.get("reader") != reader_version(engine):
+            logger.info(
+                "Raw reader, schema or engine changed - ignoring cache."
+            )
+            return None
+
+        if not _source_matches(csv_path, meta, meta_path):
+            logger.info(
+                "Raw CSV changed since cache was written - ignoring cache."
+            )
+            return None
+
+        if cache_format == "feather":
+            from pyarrow import feather
+
+            df = feather.read_table(data_path, memory_map=True).to_pandas()
+        else:
+            df = pd.read_parquet(data_path)
+
+    except Exception as e:
+        logger.warning(f"Raw cache unreadable - falling back to CSV: {e}")
+        return None
+
+    logger.info(f"Loaded raw data from cache: {data_path}")
+    return df
+
+
+def save_raw_cache(
+    df: pd.DataFrame,
+    csv_path: Path,
+    cache_format: str = DEFAULT_CACHE_FORMAT,
+    engine: str | None = None,
+) -> Path | None:
+    """
+    Write the typed raw frame and the CSV fingerprint it was parsed from.
+    Cache failures are logged, never raised.
+    """
+    try:
+        data_path, meta_path = cache_paths(csv_path, cache_format)
+        stat = csv_path.stat()
+
+        if cache_format == "feather":
+            # uncompressed so reads can be memory-mapped
+            df.reset_index(drop=True).to_feather(
+                data_path, compression="uncompressed"
+            )
+        else:
+            df.to_parquet(data_path, index=False)
+
+        meta = {
+            "format": cache_format,
+            "reader": reader_version(engine),
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "sha256": file_sha256(csv_path),
+        }
+        meta_path.write_text(json.dumps(meta))
+
+    except Exception as e:
+        logger.warning(f"Failed to write raw cache: {e}")
+        return None
+
+    logger.info(f"Saved raw cache: {data_path}")
+    return data_path
@@ -0,0 +1,129 @@
+import pandas as pd
+
+# star-schema tables the aggregates are computed from
+SOURCE_TABLES = [
+    "products.csv",
+    "themes.csv",
+    "countries.csv",
+    "product_listings.csv",
+]
+
+RATING_AGGREGATES = {
+    "avg_star_rating": ("star_rating", "mean"),
+    "avg_value_rating": ("val_star_rating", "mean"),
+    "avg_play_rating": ("play_star_rating", "mean"),
+    "total_reviews": ("num_reviews", "sum"),
+}
+
+
+def overview_stats(tables: dict) -> pd.DataFrame:
+    """
+    One row of dashboard KPIs: product / country counts, total reviews
+    and the global average ratings
+    """
+    listings_df = tables["product_listings.csv"]
+    return pd.DataFrame(
+        {
+            "total_products": [tables["products.csv"]["prod_id"].nunique()],
+            "total_countries": [
+                tables["countries.csv"]["country_id"].nunique()
+            ],
+            "total_reviews": [listings_df["num_reviews"].sum()],
+            "avg_star": [listings_df["star_rating"].mean()],
+            "avg_value": [listings_df["val_star_rating"].mean()],
+            "avg_play": [listings_df["play_star_rating"].mean()],
+        }
+    )
+
+
+def product_stats(tables: dict) -> pd.DataFrame:
+    """
+    Per-product ratings across countries: averages, total reviews and
+    the std dev of each rating - consistency_score is their mean
+    (0 = rated the same everywhere)
+    """
+    stats = (
+        tables["product_listings.csv"]
+        .groupby("prod_id", as_index=False)
+        .agg(
+            average_stars=("star_rating", "mean"),
+            average_play=("play_star_rating", "mean"),
+            average_value=("val_star_rating", "mean"),
+            total_reviews=("num_reviews", "sum"),
+            std_star=("star_rating", "std"),
+            std_value=("val_star_rating", "std"),
+            std_play=("play_star_rating", "std"),
+        )
+    )
+    stats["consistency_score"] = stats[
+        ["std_star", "std_value", "std_play"]
+    ].mean(axis=1)
+    return stats.merge(
+        tables["products.csv"][["prod_id", "set_name"]], on="prod_id"
+    )
+
+
+def country_stats(tables: dict) -> pd.DataFrame:
+    """Per-country review activity and average star rating"""
+    stats = (
+        tables["product_listings.csv"]
+        .groupby("country_id", as_index=False)
+        .agg(
+            total_reviews=("num_reviews", "sum"),
+            avg_star=("star_rating", "mean"),
+            products_reviewed=("prod_id", "nunique"),
+            avg_reviews_per_product=("num_reviews", "mean"),
+        )
+    )
+    return stats.merge(tables["countries.csv"], on="country_id", how="left")
+
+
+def _listings_with_theme(tables: dict) -> pd.DataFrame:
+    return (
+        tables["product_listings.csv"]
+        .merge(
+            tables["products.csv"][["prod_id", "theme_id"]],
+            on="prod_id",
+            how="left",
+        )
+        .merge(tables["themes.csv"], on="theme_id", how="left")
+    )
+
+
+def theme_stats(tables: dict) -> pd.DataFrame:
+    """Per-theme average ratings, total reviews and product count"""
+    return (
+        _listings_with_theme(tables)
+        .groupby("theme_name", as_index=False, observed=True)
+        .agg(**RATING_AGGREGATES, products_in_theme=("prod_id", "nunique"))
+    )
+
+
+def theme_country_stats(tables: dict) -> pd.DataFrame:
+    """Theme x country matrix of average ratings and total reviews"""
+    return (
+        _listings_with_theme(tables)
+        .merge(tables["countries.csv"], on="country_id", how="left")
+        # dimensions read back from parquet / feather are categorical
+        .groupby(["theme_name", "country"], as_index=False, observed=True)
+        .agg(**RATING_AGGREGATES)
+    )
+
+
+AGGREGATE_TABLES = {
+    "overview_stats.csv": overview_stats,
+    "product_stats.csv": product_stats,
+    "country_stats.csv": country_stats,
+    "theme_stats.csv": theme_stats,
+    "theme_country_stats.csv": theme_country_stats,
+}
+
+
+def build_aggregates(tables: dict) -> dict:
+    """
+    All aggregate tables from the star-schema tables (keyed by output
+    name, as build_star_schema returns them)
+    """
+    return {
+        name: builder(tables) for name, builder in AGGREGATE_TABLES.items()
+    }
@@ -1,24 +1,450 @@
+from functools import partial
+import numpy as np
+from pathlib import Path
 import pandas as pd
 from src.utils.logging_utils import setup_logger
-from src.load.load_tables import (
-    create_products_table,
-    create_product_descriptions_table,
-    create_themes_table,
-    create_product_listings_table,
-    create_country_table,
-    create_reviews_table,
+from src.utils.metrics import count, timed
+from src.utils.clean_validation import TEXT_COLS
+from src.extract.extract_lego import resolve_chunk_rows
+from src.utils.stage_cache import (
+    code_version,
+    fingerprint,
+    forget_stage,
+    record_stage,
+    stage_is_current,
+)
+from src.load import aggregates, text_index, write_tables
+from src.load.aggregates import AGGREGATE_TABLES, SOURCE_TABLES
+from src.load.text_index import build_text_index
+from src.load.load_database import write_database
+from src.load.star_schema import (
+    build_star_schema,
+    country_table,
+    dimension_labels,
+    factorize_dimensions,
+    product_descriptions_table,
+    product_listings_table,
+    products_table,
+    reviews_table,
+    themes_table,
+    BUILDER_CODE,
+    DIMENSION_TABLES,
+    FACT_KEYS,
+    FACT_TABLES,
+    PRODUCTS_COLUMNS,
+    PRODUCT_DESCRIPTIONS_COLUMNS,
+    PRODUCT_LISTINGS_COLUMNS,
+)
+from src.utils import reference_data
+from src.utils.key_registry import load_registry, registry_version
+from src.utils.table_io import (
+    output_format,
+    output_settings,
+    partition_column,
+    read_frame,
+    read_manifest,
+    remove_table,
+    table_path,
+    table_version,
+)
+from src.load.write_tables import (
+    append_table,
+    save_table,
+    save_tables,
+    start_table,
+    OUTPUT_DIR,
 )
 
 logger = setup_logger("create_tables", "load.log")
 
+DIMENSION_COLS = ["theme_name", "country", "review_difficulty"]
+
+
+@timed()
+def create_tables(
+    df: pd.DataFrame,
+    source_key: str | None = None,
+    workers: int | None = None,
+    database: str | None = None,
+    database_mode: str = "replace",
+) -> dict:
+    """
+    Creates tables to be stored in output.
+    Every dimension key is factorized once and all six tables are cut
+    from the clean frame (see star_schema).
+    With a source_key (fingerprint of df) each table is only rebuilt when
+    its inputs or its builder's code changed.
+    With workers > 1 tables are built and written concurrently.
+    With a database (SQLite path or postgresql:// URL) the star schema is
+    also loaded there, replaced or merged per database_mode
+    (see load_database).
+    Returns per-table build + write durations in seconds.
+    """
+    # the only dependency between tables - fact ids come from the
+    # dimension codes, so once this is done every table is independent
+    dims = factorize_dimensions(df)
+
+    # largest first, so the pool finishes close to the biggest table's time
+    tables = {
+        "product_listings.csv": (
+            product_listings_table,
+            [df, dims],
+            [PRODUCT_LISTINGS_COLUMNS],
+        ),
+        "product_descriptions.csv": (
+            product_descriptions_table,
+            [df, dims],
+            [PRODUCT_DESCRIPTIONS_COLUMNS],
+        ),
+        "products.csv": (products_table, [df, dims], [PRODUCTS_COLUMNS]),
+        "themes.csv": (themes_table, [dims], []),
+        "countries.csv": (country_table, [dims], []),
+        "reviews.csv": (reviews_table, [], []),
+    }
+
+    keys = {}
+    if source_key is not None:
+        for output_name, (builder, _, inputs) in tables.items():
+            key = _table_key(builder, [source_key, *inputs])
+            if stage_is_current(
+                output_name, key, [table_path(OUTPUT_DIR, output_name)]
+            ):
+                logger.info(
+                    f"Table {output_name} unchanged - skipping rebuild."
+                )
+                count("stages_skipped")
+            else:
+                keys[output_name] = key
+        tables = {name: tables[name] for name in keys}
+
+    durations = save_tables(
+        {
+            output_name: partial(builder, *args)
+            for output_name, (builder, args, _) in tables.items()
+        },
+        workers,
+    )
+
+    # recorded once all writes finished - the manifest isn't thread safe
+    for output_name, key in keys.items():
+        record_stage(output_name, key)
+
+    if database is not None:
+        write_database(build_star_schema(df, dims), database, database_mode)
+
+    return durations
+
+
+@timed()
+def create_aggregate_tables(workers: int | None = None) -> dict:
+    """
+    Materialize the dashboard aggregates (see aggregates) from the
+    star-schema tables already in output, so the insights page reads
+    small precomputed tables instead of grouping every listing.
+    Skipped while the source tables and the aggregate code are unchanged
+    (unchanged tables keep their size / mtime, see write_frame).
+    Returns per-table build + write durations in seconds.
+    """
+    output_dir = write_tables.OUTPUT_DIR
+    paths = {name: table_path(output_dir, name) for name in SOURCE_TABLES}
+
+    key = fingerprint(
+        *(str(table_version(path)) for path in paths.values()),
+        output_settings(),
+        code_version(aggregates),
+    )
+    outputs = [table_path(output_dir, name) for name in AGGREGATE_TABLES]
+    if stage_is_current("aggregates", key, outputs):
+        logger.info("Source tables unchanged - skipping aggregate tables.")
+        count("stages_skipped")
+        return {}
+
+    tables = {name: read_frame(path) for name, path in paths.items()}
+    durations = save_tables(
+        {
+            output_name: partial(builder, tables)
+            for output_name, builder in AGGREGATE_TABLES.items()
+        },
+        workers,
+    )
+
+    record_stage("aggregates", key)
+    return durations
+
+
+TEXT_INDEX_TABLES = [
+    "text_documents.csv",
+    "text_terms.csv",
+    "text_postings.csv",
+]
+
+
+@timed()
+def create_text_index_tables() -> None:
+    """
+    Write the full-text index over product descriptions (see text_index)
+    as output tables, for data_access.text_search to query without
+    loading the text. Skipped while product_descriptions and the index
+    code are unchanged.
+    """
+    output_dir = write_tables.OUTPUT_DIR
+    path = table_path(output_dir, "product_descriptions.csv")
+
+    key = fingerprint(
+        str(table_version(path)), output_settings(), code_version(text_index)
+    )
+    outputs = [table_path(output_dir, name) for name in TEXT_INDEX_TABLES]
+    if stage_is_current("text_index", key, outputs):
+        logger.info("Descriptions unchanged - skipping text index.")
+        count("stages_skipped")
+        return
+
+    # keep_default_na=False so text like "NA" is indexed as written
+    descriptions_df = read_frame(path, keep_default_na=False)
+    for output_name, df in build_text_index(descriptions_df).items():
+        save_table(df, output_name)
+
+    record_stage("text_index", key)
+
+
+def remove_derived_tables() -> None:
+    """
+    Remove the aggregate and text index tables, for runs that don't
+    build them (streaming) - outputs of an earlier run would go stale.
+    The app computes missing aggregates from the star-schema tables.
+    """
+    for output_name in [*AGGREGATE_TABLES, *TEXT_INDEX_TABLES]:
+        remove_table(write_tables.OUTPUT_DIR, output_name)
+
+
+@timed()
+def merge_tables(df: pd.DataFrame, keys: pd.DataFrame) -> None:
+    """
+    Bring the output tables up to date after an incremental diff:
+        - every table is built by build_star_schema from the merged clean
+          frame, as create_tables does, so the outputs match a full run;
+          ids come from the key registry, so new labels don't move
+          existing ids
+        - tables whose content didn't change aren't rewritten (see
+          write_frame); a partitioned product_listings only rewrites the
+          countries the keys touched
+        - when a CSV fact table only gains rows for keys it has never
+          seen, and they come last, they are appended instead
+    df is the full clean frame after merge_clean, keys from changed_keys.
+    """
+    before = {name: _read_existing(name) for name in DIMENSION_TABLES}
+
+    tables = build_star_schema(df, factorize_dimensions(df))
+
+    # outputs were changed outside the staged builders
+    forget_stage(*DIMENSION_TABLES, *FACT_TABLES)
+
+    for name in DIMENSION_TABLES:
+        save_table(tables[name], name)
+
+    dimensions_moved = (
+        _ids_moved(
+            before["themes.csv"],
+            tables["themes.csv"],
+            "theme_name",
+            "theme_id",
+        )
+        or _ids_moved(
+            before["countries.csv"],
+            tables["countries.csv"],
+            "country",
+            "country_id",
+        )
+        or _ids_moved(
+            before["reviews.csv"],
+            tables["reviews.csv"],
+            "review_difficulty",
+            "review_difficulty_id",
+        )
+    )
+    if dimensions_moved:
+        logger.info("Dimension ids changed - rewriting fact tables in full.")
+
+    # registry ids, so keys of a country that's gone entirely still match
+    listing_keys = (
+        database_scope(keys)["product_listings"].dropna().astype("int64")
+    )
+    prod_ids = keys["prod_id"].unique()
+
+    for name in FACT_TABLES:
+        table = tables[name]
+        if name == "product_listings.csv":
+            rebuilt = pd.MultiIndex.from_frame(table[FACT_KEYS[name]]).isin(
+                pd.MultiIndex.from_frame(listing_keys)
+            )
+            new_rows = keys["new_key"].all()
+        else:
+            rebuilt = table["prod_id"].isin(prod_ids).to_numpy()
+            new_rows = keys["new_product"].all()
+
+        if (
+            not dimensions_moved
+            and new_rows
+            and _appends_to(name, table, rebuilt)
+        ):
+            append_table(
+                table[rebuilt],
+                list(table.columns),
+                name,
+                FACT_KEYS[name],
+                set(),
+            )
+        elif not dimensions_moved and partition_column(name) == "country_id":
+            # only the countries the keys touched are rewritten
+            partitions = listing_keys["country_id"].unique().tolist()
+            save_table(
+                table[table["country_id"].isin(partitions)], name, partitions
+            )
+        else:
+            save_table(table, name)
+
+
+def _appends_to(name: str, table: pd.DataFrame, rebuilt: np.ndarray) -> bool:
+    """
+    True if table is the existing CSV table plus the rebuilt rows at the
+    end - appending them then writes what a full rewrite would
+    """
+    if output_format() != "csv" or not rebuilt.any():
+        return False
+
+    entry = read_manifest(OUTPUT_DIR).get(name)
+    existing_rows = len(table) - int(rebuilt.sum())
+    return (
+        entry is not None
+        and entry["rows"] == existing_rows
+        and rebuilt[existing_rows:].all()
+    )
+
+
+def database_scope(keys: pd.DataFrame) -> dict:
+    """
+    merge_database scope for an incremental diff: the product and
+    listing keys it touched. Country ids come from the key registry,
+    so keys of countries that are gone still resolve.
+    """
+    prod_ids = keys[["prod_id"]]
+    listing_keys = pd.DataFrame(
+        {
+            "prod_id": keys["prod_id"],
+            "country_id": keys["country"]
+            .astype(object)
+            .map(load_registry("countries")),
+        }
+    )
+    return {
+        "products": prod_ids,
+        "product_descriptions": prod_ids,
+        "product_listings": listing_keys,
+    }
+
 
-def create_tables(df: pd.DataFrame) -> pd.DataFrame:
+def _read_existing(output_name: str) -> pd.DataFrame | None:
+    path = table_path(OUTPUT_DIR, output_name)
+    return read_frame(path, keep_default_na=False) if path.exists() else None
+
+
+def _ids_moved(
+    before: pd.DataFrame | None, after: pd.DataFrame, key: str, id_col: str
+) -> bool:
+    """
+    True if any label present before and after has a different id now
+    """
+    if before is None:
+        return True
+
+    old_ids = pd.Series(
+        before[id_col].to_numpy(), index=before[key].astype(str)
+    )
+    new_ids = pd.Series(after[id_col].to_numpy(), index=after[key].astype(str))
+    common = old_ids.index.intersection(new_ids.index)
+
+    return not (old_ids[common].to_numpy() == new_ids[common].to_numpy()).all()
+
+
+def _table_key(builder, inputs: list) -> str:
+    """
+    Stage key for one output table: its inputs, the output format and
+    the code that builds it - the builder and the helpers it calls
+    (star_schema.BUILDER_CODE), not all of star_schema
     """
-    Creates tables to be stored in output
+    return fingerprint(
+        *(str(part) for part in inputs),
+        output_settings(),
+        registry_version("themes", "countries"),
+        code_version(
+            builder, *BUILDER_CODE[builder], write_tables, reference_data
+        ),
+    )
+
+
+@timed()
+def create_tables_from_file(
+    clean_path: Path,
+    chunksize: int | None = None,
+    max_bytes: int | None = None,
+) -> None:
+    """
+    Creates output tables from a clean csv without loading it whole,
+    with the same builders as create_tables (see star_schema):
+        - pass 1 reads only dimension columns to build dimension tables
+          (registering new labels in the same order a full run does)
+        - pass 2 streams chunks through the fact builders, appending
+          keys earlier chunks haven't written
     """
-    themes_df = create_themes_table(df)
-    products_df = create_products_table(df, themes_df)
-    countries_df = create_country_table(df)
-    reviews_df = create_reviews_table(df)
-    product_listings_df = create_product_listings_table(df, countries_df, reviews_df)
-    Product_descriptions_df = create_product_descriptions_table(df)
+    rows = resolve_chunk_rows(clean_path, chunksize, max_bytes)
+    text_dtypes = {col: str for col in TEXT_COLS}
+
+    logger.info(f"Creating tables from {clean_path} in chunks of {rows} rows")
+
+    # pass 1 - distinct dimension values only
+    dimension_chunks = pd.read_csv(
+        clean_path, usecols=DIMENSION_COLS, dtype=text_dtypes, chunksize=rows
+    )
+    with dimension_chunks:
+        dims_df = pd.concat(
+            chunk.drop_duplicates() for chunk in dimension_chunks
+        ).drop_duplicates()
+
+    dims = dimension_labels(dims_df)
+    save_table(themes_table(dims), "themes.csv")
+    save_table(country_table(dims), "countries.csv")
+    save_table(reviews_table(), "reviews.csv")
+
+    # pass 2 - facts
+    builders = {
+        "products.csv": (products_table, PRODUCTS_COLUMNS),
+        "product_listings.csv": (
+            product_listings_table,
+            PRODUCT_LISTINGS_COLUMNS,
+        ),
+        "product_descriptions.csv": (
+            product_descriptions_table,
+            PRODUCT_DESCRIPTIONS_COLUMNS,
+        ),
+    }
+    for name, (_, columns) in builders.items():
+        start_table(columns, name)
+    seen_keys = {name: set() for name in builders}
+
+    with pd.read_csv(clean_path, dtype=text_dtypes, chunksize=rows) as chunks:
+        for chunk in chunks:
+            # labels are all registered by pass 1 - these are lookups
+            dims = factorize_dimensions(chunk)
+            for name, (builder, columns) in builders.items():
+                append_table(
+                    builder(chunk, dims),
+                    columns,
+                    name,
+                    FACT_KEYS[name],
+                    seen_keys[name],
+                )
+
+    logger.info(
+        f"Streamed tables created: {len(seen_keys['products.csv'])} products, "
+        f"{len(seen_keys['product_listings.csv'])} listings"
+    )
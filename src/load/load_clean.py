@@ -1,6 +1,9 @@
 from pathlib import Path
 import pandas as pd
+from typing import Iterable
 from src.utils.logging_utils import setup_logger
+from src.utils.metrics import timed
+from src.utils.table_io import append_frame, output_format, write_frame
 
 logger = setup_logger("load_clean", "load.log")
 
@@ -8,11 +11,48 @@ PROCESSED_DIR = Path("data/processed")
 PROCESSED_DIR.mkdir(parents=True, exist_ok=True)
 
 
+@timed()
 def save_clean_data(df: pd.DataFrame, filename: str) -> Path:
     """
-    Saves clean csv to data/processed
+    Saves clean data to data/processed, in the run's output format
     """
-    file_path = PROCESSED_DIR / filename
-    df.to_csv(file_path, index=False)
+    file_path = write_frame(df, PROCESSED_DIR, filename)
     logger.info(f"Saved clean LEGO data: {file_path}")
     return file_path
+
+
+@timed()
+def append_clean_data(df: pd.DataFrame, filename: str) -> Path:
+    """
+    Appends clean rows to an existing csv in data/processed
+    """
+    if output_format() != "csv":
+        raise ValueError(f"Appending needs CSV output, not {output_format()}")
+    file_path = append_frame(df, PROCESSED_DIR, filename)
+    logger.info(f"Appended {len(df)} rows to clean LEGO data: {file_path}")
+    return file_path
+
+
+@timed()
+def save_clean_chunks(chunks: Iterable[pd.DataFrame], filename: str) -> Path:
+    """
+    Streams clean chunks into a single csv in data/processed:
+        - the first chunk replaces the file (header included), the rest
+          are appended, keeping the manifest entry current
+        - raises if there are no chunks - the clean columns come from them
+    """
+    file_path = None
+    rows = 0
+
+    for chunk in chunks:
+        if file_path is None:
+            file_path = write_frame(chunk, PROCESSED_DIR, filename)
+        else:
+            append_frame(chunk, PROCESSED_DIR, filename)
+        rows += len(chunk)
+
+    if file_path is None:
+        raise ValueError(f"No clean chunks to save to {filename}")
+
+    logger.info(f"Saved clean LEGO data ({rows} rows streamed): {file_path}")
+    return file_path
@@ -0,0 +1,502 @@
+import io
+import sqlite3
+import time
+from contextlib import contextmanager
+from pathlib import Path
+import pandas as pd
+from src.utils.logging_utils import setup_logger
+from src.utils.metrics import timed
+
+logger = setup_logger("load_database", "load.log")
+
+# Star schema DDL - parents before children so foreign keys resolve.
+# Columns are in output table order; types are mapped per engine by SQL_TYPES.
+TABLE_SCHEMAS = {
+    "themes": {
+        "columns": {"theme_name": "text", "theme_id": "int"},
+        "primary_key": ["theme_id"],
+        "unique": ["theme_name"],
+    },
+    "countries": {
+        "columns": {
+            "country": "text",
+            "country_name": "text",
+            "country_id": "int",
+        },
+        "primary_key": ["country_id"],
+        "unique": ["country"],
+    },
+    "reviews": {
+        "columns": {
+            "review_difficulty_id": "int",
+            "review_difficulty": "text",
+        },
+        "primary_key": ["review_difficulty_id"],
+        "unique": ["review_difficulty"],
+    },
+    "products": {
+        "columns": {
+            "prod_id": "int",
+            "set_name": "text",
+            "theme_id": "int",
+            "piece_count": "int",
+            "age_min": "float",
+            "age_max": "float",
+        },
+        "primary_key": ["prod_id"],
+        "foreign_keys": {"theme_id": ("themes", "theme_id")},
+        "indexes": [["theme_id"]],
+    },
+    "product_listings": {
+        "columns": {
+            "prod_id": "int",
+            "list_price": "float",
+            "num_reviews": "int",
+            "star_rating": "float",
+            "val_star_rating": "float",
+            "play_star_rating": "float",
+            "review_difficulty_id": "int",
+            "country_id": "int",
+        },
+        "primary_key": ["prod_id", "country_id"],
+        "foreign_keys": {
+            "prod_id": ("products", "prod_id"),
+            "country_id": ("countries", "country_id"),
+            "review_difficulty_id": ("reviews", "review_difficulty_id"),
+        },
+        # prod_id lookups are covered by the primary key
+        "indexes": [["country_id"], ["review_difficulty_id"]],
+    },
+    "product_descriptions": {
+        "columns": {
+            "prod_id": "int",
+            "prod_desc": "text",
+            "prod_long_desc": "text",
+        },
+        "primary_key": ["prod_id"],
+        "foreign_keys": {"prod_id": ("products", "prod_id")},
+    },
+}
+
+SQL_TYPES = {
+    "sqlite": {"int": "INTEGER", "float": "REAL", "text": "TEXT"},
+    "postgres": {"int": "BIGINT", "float": "DOUBLE PRECISION", "text": "TEXT"},
+}
+
+# null-safe "values differ" per engine
+DISTINCT_OPERATORS = {"sqlite": "IS NOT", "postgres": "IS DISTINCT FROM"}
+
+# bulk load tuning for load_database only - the database is rebuilt
+# from the outputs, so durability is traded for speed while loading.
+# merge_database updates in place and keeps SQLite's durable defaults.
+SQLITE_BULK_PRAGMAS = [
+    "PRAGMA journal_mode = MEMORY",
+    "PRAGMA synchronous = OFF",
+]
+
+SQLITE_PRAGMAS = [
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA cache_size = -64000",
+    # checked once after the load (foreign_key_check) instead of per row
+    "PRAGMA foreign_keys = OFF",
+]
+
+# rows per executemany / COPY batch
+BATCH_ROWS = 50_000
+
+
+def database_dialect(database: str) -> str:
+    """postgres for postgresql:// URLs, otherwise a SQLite file path"""
+    if str(database).startswith(("postgresql://", "postgres://")):
+        return "postgres"
+    return "sqlite"
+
+
+def connect(database: str, bulk_load: bool = False):
+    """
+    Open a DB-API connection:
+        - postgres: psycopg2 (only imported when used)
+        - sqlite: the file is created if missing; bulk_load adds
+          SQLITE_BULK_PRAGMAS (no durability - only for full reloads)
+    """
+    if database_dialect(database) == "postgres":
+        import psycopg2
+
+        return psycopg2.connect(database)
+
+    Path(database).parent.mkdir(parents=True, exist_ok=True)
+    # transactions are begun explicitly
+    connection = sqlite3.connect(database, isolation_level=None)
+    pragmas = SQLITE_PRAGMAS + (SQLITE_BULK_PRAGMAS if bulk_load else [])
+    for pragma in pragmas:
+        connection.execute(pragma)
+    return connection
+
+
+def create_table_sql(table: str, dialect: str) -> str:
+    schema = TABLE_SCHEMAS[table]
+    types = SQL_TYPES[dialect]
+
+    lines = [f"{col} {types[kind]}" for col, kind in schema["columns"].items()]
+    lines.append(f"PRIMARY KEY ({', '.join(schema['primary_key'])})")
+    for col in schema.get("unique", []):
+        lines.append(f"UNIQUE ({col})")
+    for col, (ref_table, ref_col) in schema.get("foreign_keys", {}).items():
+        lines.append(f"FOREIGN KEY ({col}) REFERENCES {ref_table} ({ref_col})")
+
+    body = ",\n    ".join(lines)
+    return f"CREATE TABLE {table} (\n    {body}\n)"
+
+
+def create_index_sql(table: str) -> list:
+    return [
+        f"CREATE INDEX idx_{table}_{'_'.join(cols)} "
+        f"ON {table} ({', '.join(cols)})"
+        for cols in TABLE_SCHEMAS[table].get("indexes", [])
+    ]
+
+
+def schema_sql(dialect: str) -> list:
+    """
+    Full DDL for the star schema: drops (children first), creates,
+    then indexes
+    """
+    tables = list(TABLE_SCHEMAS)
+    drops = [f"DROP TABLE IF EXISTS {table}" for table in reversed(tables)]
+    creates = [create_table_sql(table, dialect) for table in tables]
+    indexes = [sql for table in tables for sql in create_index_sql(table)]
+    return drops + creates + indexes
+
+
+def _table_frame(df: pd.DataFrame, table: str, key_only=False) -> pd.DataFrame:
+    # schema column order; id columns that picked up NaN go back to ints
+    schema = TABLE_SCHEMAS[table]
+    if key_only:
+        # merge scope keys - null keys can't match a row
+        df = df[schema["primary_key"]].dropna().drop_duplicates()
+    else:
+        df = df[list(schema["columns"])]
+    for col in df.columns:
+        if schema["columns"][col] == "int" and df[col].dtype.kind == "f":
+            df = df.astype({col: "Int64"})
+    # rows in key order append to the primary key b-tree instead of
+    # inserting at random pages
+    return df.sort_values(schema["primary_key"], ignore_index=True)
+
+
+def _insert_sqlite(cursor, table: str, df: pd.DataFrame) -> None:
+    placeholders = ", ".join("?" * len(df.columns))
+    sql = (
+        f"INSERT INTO {table} ({', '.join(df.columns)}) "
+        f"VALUES ({placeholders})"
+    )
+
+    for start in range(0, len(df), BATCH_ROWS):
+        batch = df.iloc[start:][:BATCH_ROWS].astype(object)
+        # python scalars with None for nulls - sqlite3 can't bind numpy types
+        batch = batch.where(batch.notna(), None)
+        cursor.executemany(sql, batch.itertuples(index=False, name=None))
+
+
+def _copy_postgres(cursor, table: str, df: pd.DataFrame) -> None:
+    sql = (
+        f"COPY {table} ({', '.join(df.columns)}) "
+        "FROM STDIN WITH (FORMAT csv, NULL '\\N')"
+    )
+
+    for start in range(0, len(df), BATCH_ROWS):
+        buffer = io.StringIO()
+        df.iloc[start:][:BATCH_ROWS].to_csv(
+            buffer, index=False, header=False, na_rep="\\N"
+        )
+        buffer.seek(0)
+        cursor.copy_expert(sql, buffer)
+
+
+def _check_foreign_keys(cursor) -> None:
+    violations = cursor.execute("PRAGMA foreign_key_check").fetchall()
+    if violations:
+        table, _, parent, _ = violations[0]
+        raise sqlite3.IntegrityError(
+            f"{len(violations)} rows break foreign keys, "
+            f"e.g. {table} -> {parent}"
+        )
+
+
+@contextmanager
+def _transaction(database: str, bulk_load: bool = False):
+    """
+    Cursor inside one transaction: committed if the block finishes
+    (after the SQLite foreign key check), rolled back otherwise
+    """
+    dialect = database_dialect(database)
+    connection = connect(database, bulk_load)
+    try:
+        cursor = connection.cursor()
+        if dialect == "sqlite":
+            cursor.execute("BEGIN")
+
+        yield cursor
+
+        if dialect == "sqlite":
+            _check_foreign_keys(cursor)
+        connection.commit()
+    except Exception:
+        connection.rollback()
+        logger.error(f"Database load into {dialect} failed - rolled back")
+        raise
+    finally:
+        connection.close()
+
+
+@timed()
+def load_database(tables: dict, database: str) -> dict:
+    """
+    Load the star schema into a SQLite file or Postgres database:
+        - tables maps output name ("products.csv", ...) -> frame, as
+          build_star_schema returns
+        - all tables are dropped and recreated with primary / foreign
+          keys, then bulk loaded (COPY on Postgres, batched executemany
+          on SQLite), then indexed
+        - SQLite checks foreign keys once after the load, not per row
+        - everything runs in one transaction, so a failed load leaves
+          the previous contents in place
+    Returns row counts per table.
+    """
+    dialect = database_dialect(database)
+    frames = {Path(name).stem: df for name, df in tables.items()}
+    insert = _copy_postgres if dialect == "postgres" else _insert_sqlite
+
+    start = time.perf_counter()
+    with _transaction(database, bulk_load=True) as cursor:
+        statements = schema_sql(dialect)
+        indexes = [sql for sql in statements if sql.startswith("CREATE INDEX")]
+        for sql in statements:
+            if sql not in indexes:
+                cursor.execute(sql)
+
+        counts = {}
+        for table in TABLE_SCHEMAS:
+            df = _table_frame(frames[table], table)
+            insert(cursor, table, df)
+            counts[table] = len(df)
+
+        # indexes after the data - one sort instead of per-row updates
+        for sql in indexes:
+            cursor.execute(sql)
+
+    logger.info(
+        f"Loaded {sum(counts.values())} rows into {len(counts)} {dialect} "
+        f"tables in {time.perf_counter() - start:.3f}s"
+    )
+
+    return counts
+
+
+def _has_schema(database: str) -> bool:
+    connection = connect(database)
+    try:
+        cursor = connection.cursor()
+        if database_dialect(database) == "postgres":
+            cursor.execute(
+                "SELECT table_name FROM information_schema.tables "
+                "WHERE table_schema = current_schema()"
+            )
+        else:
+            cursor.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'table'"
+            )
+        return set(TABLE_SCHEMAS) <= {row[0] for row in cursor.fetchall()}
+    finally:
+        connection.close()
+
+
+def _stage_table_sql(
+    name: str, table: str, dialect: str, key_only=False
+) -> str:
+    # the target's columns (or just its key) and primary key, nothing else
+    schema = TABLE_SCHEMAS[table]
+    types = SQL_TYPES[dialect]
+    key = schema["primary_key"]
+
+    columns = ", ".join(
+        f"{col} {types[kind]}"
+        for col, kind in schema["columns"].items()
+        if not key_only or col in key
+    )
+    return (
+        f"CREATE TEMPORARY TABLE {name} "
+        f"({columns}, PRIMARY KEY ({', '.join(key)}))"
+    )
+
+
+def _key_match(table: str, other: str) -> str:
+    return " AND ".join(
+        f"{table}.{col} = {other}.{col}"
+        for col in TABLE_SCHEMAS[table]["primary_key"]
+    )
+
+
+def _count(cursor, table: str) -> int:
+    cursor.execute(f"SELECT COUNT(*) FROM {table}")
+    return cursor.fetchone()[0]
+
+
+def _delete_missing(cursor, table: str, scoped: bool) -> int:
+    """
+    Delete target rows with no stage row - within the scope keys only
+    when the merge is scoped. Returns the rows deleted.
+    """
+    missing = (
+        f"NOT EXISTS (SELECT 1 FROM stage_{table} AS stage "
+        f"WHERE {_key_match(table, 'stage')})"
+    )
+    if scoped:
+        missing += (
+            f" AND EXISTS (SELECT 1 FROM scope_{table} AS scope "
+            f"WHERE {_key_match(table, 'scope')})"
+        )
+    cursor.execute(f"DELETE FROM {table} WHERE {missing}")
+    return cursor.rowcount
+
+
+def _upsert(cursor, table: str, dialect: str) -> dict:
+    """
+    Set-based upsert of stage_<table> into table on its primary key:
+    new keys are inserted, existing rows only updated when a value
+    differs. Returns inserted / updated / unchanged counts.
+    """
+    schema = TABLE_SCHEMAS[table]
+    key = schema["primary_key"]
+    values = [col for col in schema["columns"] if col not in key]
+    distinct = DISTINCT_OPERATORS[dialect]
+
+    columns = ", ".join(schema["columns"])
+    updates = ", ".join(f"{col} = excluded.{col}" for col in values)
+    changed = " OR ".join(
+        f"{table}.{col} {distinct} excluded.{col}" for col in values
+    )
+
+    before = _count(cursor, table)
+    # WHERE true keeps SQLite from reading ON CONFLICT as a join clause
+    cursor.execute(
+        f"INSERT INTO {table} ({columns}) SELECT {columns} FROM stage_{table} "
+        f"WHERE true ON CONFLICT ({', '.join(key)}) "
+        f"DO UPDATE SET {updates} WHERE {changed}"
+    )
+    # rowcount covers inserted and actually updated rows
+    written = cursor.rowcount
+    after = _count(cursor, table)
+
+    return {
+        "inserted": after - before,
+        "updated": written - (after - before),
+        "unchanged": after - written,
+    }
+
+
+def _scope_rows(
+    df: pd.DataFrame, table: str, keys: pd.DataFrame
+) -> pd.DataFrame:
+    key = TABLE_SCHEMAS[table]["primary_key"]
+    wanted = pd.MultiIndex.from_frame(keys[key].astype("int64"))
+    return df[pd.MultiIndex.from_frame(df[key].astype("int64")).isin(wanted)]
+
+
+@timed()
+def merge_database(
+    tables: dict, database: str, scope: dict | None = None
+) -> dict:
+    """
+    Merge the star schema into a database loaded by load_database,
+    instead of dropping and reloading it:
+        - rows are bulk loaded into temporary stage tables
+        - parents then children are upserted from their stage on the
+          primary key - prod_id for products / descriptions,
+          (prod_id, country_id) for listings - so unchanged rows are
+          never rewritten
+        - then target rows whose keys are gone from the stage are
+          deleted, children before parents, so foreign keys hold after
+          every statement (Postgres checks them immediately)
+        - one transaction, as load_database
+    scope optionally maps table name -> frame of primary keys that may
+    have changed (e.g. from an incremental diff): only those keys are
+    staged, compared and deleted, the rest of that table is left alone.
+    Falls back to load_database when the schema doesn't exist yet.
+    Returns inserted / updated / unchanged / deleted counts per table
+    (unchanged counts every row the merge didn't write).
+    """
+    dialect = database_dialect(database)
+    frames = {Path(name).stem: df for name, df in tables.items()}
+    scope = scope or {}
+    insert = _copy_postgres if dialect == "postgres" else _insert_sqlite
+
+    if not _has_schema(database):
+        logger.info("No star schema in the database yet - loading it in full.")
+        loaded = load_database(tables, database)
+        return {
+            table: {
+                "inserted": rows,
+                "updated": 0,
+                "unchanged": 0,
+                "deleted": 0,
+            }
+            for table, rows in loaded.items()
+        }
+
+    start = time.perf_counter()
+    with _transaction(database) as cursor:
+        for table in TABLE_SCHEMAS:
+            df = _table_frame(frames[table], table)
+            if table in scope:
+                keys = _table_frame(scope[table], table, key_only=True)
+                cursor.execute(f"DROP TABLE IF EXISTS scope_{table}")
+                cursor.execute(
+                    _stage_table_sql(
+                        f"scope_{table}", table, dialect, key_only=True
+                    )
+                )
+                insert(cursor, f"scope_{table}", keys)
+                df = _scope_rows(df, table, keys)
+
+            cursor.execute(f"DROP TABLE IF EXISTS stage_{table}")
+            cursor.execute(_stage_table_sql(f"stage_{table}", table, dialect))
+            insert(cursor, f"stage_{table}", df)
+
+        # parents first, so new fact rows find their dimension rows
+        counts = {
+            table: _upsert(cursor, table, dialect) for table in TABLE_SCHEMAS
+        }
+
+        # then deletes, children first: by now no fact row points at a
+        # dimension row that goes (Postgres checks each statement)
+        for table in reversed(TABLE_SCHEMAS):
+            deleted = _delete_missing(cursor, table, table in scope)
+            # the upsert counted the rows deleted here as unchanged
+            counts[table]["unchanged"] -= deleted
+            counts[table]["deleted"] = deleted
+            cursor.execute(f"DROP TABLE stage_{table}")
+            if table in scope:
+                cursor.execute(f"DROP TABLE scope_{table}")
+
+    for table, table_counts in counts.items():
+        logger.info(f"Merged {table}: {table_counts}")
+    logger.info(
+        f"Database merge finished in {time.perf_counter() - start:.3f}s"
+    )
+
+    return counts
+
+
+DATABASE_MODES = {"replace": load_database, "merge": merge_database}
+
+
+def write_database(tables: dict, database: str, mode: str = "replace") -> dict:
+    """
+    Write the star schema to a database:
+        - replace: drop and bulk reload every table (load_database)
+        - merge: upsert through stage tables (merge_database)
+    """
+    if mode not in DATABASE_MODES:
+        raise ValueError(f"Unknown database mode: {mode}")
+    return DATABASE_MODES[mode](tables, database)
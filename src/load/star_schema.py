@@ -0,0 +1,221 @@
+import numpy as np
+import pandas as pd
+from src.transform.transform_duplicates import composite_keys
+from src.utils.key_registry import assign_ids
+from src.utils.reference_data import COUNTRY_NAMES, DIFFICULTY_ORDER
+
+PRODUCTS_COLUMNS = [
+    "prod_id",
+    "set_name",
+    "theme_id",
+    "piece_count",
+    "age_min",
+    "age_max",
+]
+
+PRODUCT_DESCRIPTIONS_COLUMNS = ["prod_id", "prod_desc", "prod_long_desc"]
+
+PRODUCT_LISTINGS_COLUMNS = [
+    "prod_id",
+    "list_price",
+    "num_reviews",
+    "star_rating",
+    "val_star_rating",
+    "play_star_rating",
+    "review_difficulty_id",
+    "country_id",
+]
+
+DIMENSION_TABLES = ["themes.csv", "countries.csv", "reviews.csv"]
+FACT_TABLES = [
+    "products.csv",
+    "product_listings.csv",
+    "product_descriptions.csv",
+]
+
+# the columns each fact table dedups on
+FACT_KEYS = {
+    "products.csv": ["prod_id"],
+    "product_listings.csv": ["prod_id", "country_id"],
+    "product_descriptions.csv": ["prod_id"],
+}
+
+
+def dimension_ids(
+    df: pd.DataFrame, dim_df: pd.DataFrame, key: str, id_col: str
+) -> np.ndarray:
+    """
+    Look up surrogate ids for df[key] without a merge:
+        - factorize the key (free for categoricals - codes already exist)
+        - look up each distinct value's id once in dim_df
+        - broadcast ids back by code
+    Values missing from dim_df get NaN, as a left merge would.
+    """
+    if isinstance(df[key].dtype, pd.CategoricalDtype):
+        codes = df[key].cat.codes.to_numpy()
+        uniques = df[key].cat.categories
+    else:
+        codes, uniques = pd.factorize(df[key])
+
+    positions = pd.Index(dim_df[key]).get_indexer(uniques)
+    ids = dim_df[id_col].to_numpy()[positions]
+
+    # trailing slot catches missing lookups and null keys (code -1)
+    missing = np.append(positions == -1, True)
+    ids = np.append(ids, 0)[codes]
+
+    if missing[codes].any():
+        return np.where(missing[codes], np.nan, ids)
+    return ids
+
+
+def dimension_labels(df: pd.DataFrame) -> dict:
+    """
+    theme_name / country labels of df (sorted) and their ids from the
+    persistent key registry - new labels are registered in sorted order -
+    plus each row's ids, broadcast back by code
+    """
+    theme_codes, themes = pd.factorize(df["theme_name"], sort=True)
+    country_codes, countries = pd.factorize(df["country"], sort=True)
+
+    theme_label_ids = assign_ids("themes", themes)
+    country_label_ids = assign_ids("countries", countries)
+
+    return {
+        "themes": themes,
+        "theme_label_ids": theme_label_ids,
+        "theme_ids": _ids_from_codes(theme_codes, theme_label_ids),
+        "countries": countries,
+        "country_label_ids": country_label_ids,
+        "country_ids": _ids_from_codes(country_codes, country_label_ids),
+    }
+
+
+def factorize_dimensions(df: pd.DataFrame) -> dict:
+    """
+    Factorize every dimension key of the clean frame once:
+        - theme_name / country: see dimension_labels
+        - review_difficulty: fixed ids from DIFFICULTY_ORDER
+        - first-row masks for the prod_id and (prod_id, country) fact keys
+    Facts then take ids straight from the codes - no joins.
+    """
+    listing_keys, _ = composite_keys(df, {})
+
+    return {
+        **dimension_labels(df),
+        "review_difficulty_ids": dimension_ids(
+            df, reviews_table(), "review_difficulty", "review_difficulty_id"
+        ),
+        "first_product": ~df["prod_id"].duplicated().to_numpy(),
+        "first_listing": ~pd.Series(listing_keys).duplicated().to_numpy(),
+    }
+
+
+def _ids_from_codes(codes: np.ndarray, label_ids: np.ndarray) -> np.ndarray:
+    # null keys (code -1) get NaN, as dimension_ids does
+    if (codes == -1).any():
+        return np.where(codes == -1, np.nan, label_ids[codes])
+    return label_ids[codes]
+
+
+def themes_table(dims: dict) -> pd.DataFrame:
+    themes_df = pd.DataFrame(
+        {"theme_name": dims["themes"], "theme_id": dims["theme_label_ids"]}
+    )
+    return themes_df.sort_values("theme_id", ignore_index=True)
+
+
+def country_table(dims: dict) -> pd.DataFrame:
+    countries = pd.Series(dims["countries"])
+    countries_df = pd.DataFrame(
+        {
+            "country": countries,
+            "country_name": countries.map(COUNTRY_NAMES),
+            "country_id": dims["country_label_ids"],
+        }
+    )
+    return countries_df.sort_values("country_id", ignore_index=True)
+
+
+def reviews_table() -> pd.DataFrame:
+    reviews = pd.DataFrame(
+        DIFFICULTY_ORDER.items(),
+        columns=["review_difficulty", "review_difficulty_id"],
+    )
+    return reviews[["review_difficulty_id", "review_difficulty"]]
+
+
+def _fact_rows(
+    df: pd.DataFrame, columns: list, mask: np.ndarray, ids: dict
+) -> pd.DataFrame:
+    # one copy of the first rows, only the columns the table needs
+    rows = df.loc[mask, [col for col in columns if col not in ids]]
+    for id_col, values in ids.items():
+        rows[id_col] = values[mask]
+    return rows[columns]
+
+
+def products_table(df: pd.DataFrame, dims: dict) -> pd.DataFrame:
+    return _fact_rows(
+        df,
+        PRODUCTS_COLUMNS,
+        dims["first_product"],
+        {"theme_id": dims["theme_ids"]},
+    )
+
+
+def product_listings_table(df: pd.DataFrame, dims: dict) -> pd.DataFrame:
+    return _fact_rows(
+        df,
+        PRODUCT_LISTINGS_COLUMNS,
+        dims["first_listing"],
+        {
+            "review_difficulty_id": dims["review_difficulty_ids"],
+            "country_id": dims["country_ids"],
+        },
+    )
+
+
+def product_descriptions_table(df: pd.DataFrame, dims: dict) -> pd.DataFrame:
+    return _fact_rows(
+        df, PRODUCT_DESCRIPTIONS_COLUMNS, dims["first_product"], {}
+    )
+
+
+def build_star_schema(df: pd.DataFrame, dims: dict | None = None) -> dict:
+    """
+    All six star-schema tables from one pass over the clean frame,
+    keyed by output name
+    """
+    dims = dims if dims is not None else factorize_dimensions(df)
+
+    return {
+        "themes.csv": themes_table(dims),
+        "products.csv": products_table(df, dims),
+        "countries.csv": country_table(dims),
+        "reviews.csv": reviews_table(),
+        "product_listings.csv": product_listings_table(df, dims),
+        "product_descriptions.csv": product_descriptions_table(df, dims),
+    }
+
+
+# the code each builder runs besides its own body - a table's stage key
+# hashes exactly this, so editing one builder only rebuilds its table
+_FACTORIZE_CODE = (
+    factorize_dimensions,
+    dimension_labels,
+    dimension_ids,
+    _ids_from_codes,
+    reviews_table,
+    composite_keys,
+    assign_ids,
+)
+
+BUILDER_CODE = {
+    themes_table: _FACTORIZE_CODE,
+    country_table: _FACTORIZE_CODE,
+    reviews_table: (),
+    products_table: (_fact_rows, *_FACTORIZE_CODE),
+    product_listings_table: (_fact_rows, *_FACTORIZE_CODE),
+    product_descriptions_table: (_fact_rows, *_FACTORIZE_CODE),
+}
@@ -0,0 +1,68 @@
+import numpy as np
+import pandas as pd
+
+# description columns the index covers
+TEXT_COLUMNS = ["prod_desc", "prod_long_desc"]
+
+# runs of anything but letters / digits split tokens
+TOKEN_SEPARATOR = r"[\W_]+"
+
+
+def tokenize(text: pd.Series) -> pd.Series:
+    """
+    Lowercased tokens of each text, one row per token (index repeated),
+    nulls dropped
+    """
+    tokens = (
+        text.dropna()
+        .str.lower()
+        .str.replace(TOKEN_SEPARATOR, " ", regex=True)
+        .str.split()
+        .explode()
+    )
+    return tokens.dropna()
+
+
+def build_text_index(descriptions_df: pd.DataFrame) -> dict:
+    """
+    Inverted index over prod_desc + prod_long_desc, as three tables
+    (keyed by output name):
+        - text_documents: prod_id and token count of each document,
+          doc_id is its row position
+        - text_terms: each term and its document frequency, sorted by
+          term; a term's postings are the next doc_freq rows of
+          text_postings after the earlier terms'
+        - text_postings: (doc_id, tf) rows grouped by term, doc_id
+          ascending within a term
+    Queries (data_access.text_search) only need these - never the text.
+    """
+    documents = descriptions_df.drop_duplicates(subset="prod_id").reset_index(
+        drop=True
+    )
+
+    tokens = pd.concat([tokenize(documents[col]) for col in TEXT_COLUMNS])
+    term_codes, terms = pd.factorize(tokens, sort=True)
+    doc_ids = tokens.index.to_numpy()
+
+    # (term, doc) pairs -> term frequency, grouped by term then doc
+    pairs = np.sort(term_codes.astype(np.int64) * len(documents) + doc_ids)
+    starts = np.flatnonzero(np.diff(pairs, prepend=-1))
+    tf = np.diff(np.append(starts, len(pairs)))
+    pairs = pairs[starts]
+    pair_terms, pair_docs = pairs // len(documents), pairs % len(documents)
+
+    return {
+        "text_documents.csv": pd.DataFrame(
+            {
+                "prod_id": documents["prod_id"],
+                "length": np.bincount(doc_ids, minlength=len(documents)),
+            }
+        ),
+        "text_terms.csv": pd.DataFrame(
+            {
+                "term": terms,
+                "doc_freq": np.bincount(pair_terms, minlength=len(terms)),
+            }
+        ),
+        "text_postings.csv": pd.DataFrame({"doc_id": pair_docs, "tf": tf}),
+    }
@@ -1,21 +1,28 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import pandas as pd
 from src.utils.logging_utils import setup_logger
+from src.utils.metrics import path_bytes, timed, timer
+from src.utils.table_io import append_frame, output_format, write_frame
 
 logger = setup_logger("table_writer", "load.log")
 
 OUTPUT_DIR = Path("data/output")
 
 
+@timed()
 def write_table(
     df: pd.DataFrame,
     columns: list,
     output_name: str,
     deduplication_key,
     add_surrogate_id: str | None = None,
+    partitions: list | None = None,
 ) -> pd.DataFrame:
     """
     Reusable table creation for RDS
+    (partitions: see save_table)
     """
 
     logger.info(f"Creating table: {output_name}")
@@ -40,12 +47,129 @@ def write_table(
         df = df.sort_values(by=subset).reset_index(drop=True)
         df[add_surrogate_id] = df.index + 1
 
-    # save CSV
-    output_path = OUTPUT_DIR / output_name
-    df.to_csv(output_path, index=False)
+    return save_table(df, output_name, partitions)
 
+
+def save_table(
+    df: pd.DataFrame, output_name: str, partitions: list | None = None
+) -> pd.DataFrame:
+    """
+    Save an already built table in the run's output format (CSV by default).
+    For a partitioned table, partitions limits the write to those
+    partition values - df holds just their rows.
+    """
+
+    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+
+    with timer("save_table", rows_in=len(df), rows_out=len(df)) as totals:
+        output_path = write_frame(df, OUTPUT_DIR, output_name, partitions)
+        totals["bytes"] = path_bytes(output_path)
+
+    logger.info(
+        f"Table {output_name} created with {len(df)} rows "
+        f"Saved to {output_path}"
+    )
+
+    return df
+
+
+def save_tables(builders: dict, workers: int | None = None) -> dict:
+    """
+    Build and save several independent tables:
+        - builders maps output_name -> no-arg callable returning the table
+        - with workers > 1 they run concurrently on a thread pool
+          (numpy / pyarrow release the GIL for most of the work)
+        - logs and returns each table's build + write time in seconds
+    """
+
+    def build_and_save(output_name, builder):
+        start = time.perf_counter()
+        save_table(builder(), output_name)
+        return time.perf_counter() - start
+
+    start = time.perf_counter()
+
+    if workers and workers > 1:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = {
+                output_name: pool.submit(build_and_save, output_name, builder)
+                for output_name, builder in builders.items()
+            }
+            durations = {
+                name: future.result() for name, future in futures.items()
+            }
+    else:
+        durations = {
+            output_name: build_and_save(output_name, builder)
+            for output_name, builder in builders.items()
+        }
+
+    for output_name, seconds in durations.items():
+        logger.info(f"Table {output_name} built and written in {seconds:.3f}s")
     logger.info(
-        f"Table {output_name} created with {len(df)} rows " f"Saved to {output_path}"
+        f"{len(durations)} tables written in "
+        f"{time.perf_counter() - start:.3f}s "
+        f"(workers: {workers or 1})"
+    )
+
+    return durations
+
+
+def start_table(columns: list, output_name: str) -> Path:
+    """
+    Truncates an output table to just its header so chunks can be appended
+    """
+    _require_csv(output_name)
+
+    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+
+    output_path = write_frame(
+        pd.DataFrame(columns=columns), OUTPUT_DIR, output_name
+    )
+
+    logger.info(f"Started streamed table: {output_name}")
+
+    return output_path
+
+
+@timed()
+def append_table(
+    df: pd.DataFrame,
+    columns: list,
+    output_name: str,
+    deduplication_key,
+    seen_keys: set,
+) -> pd.DataFrame:
+    """
+    Appends a chunk to a table opened with start_table.
+    seen_keys carries the dedup keys already written by earlier chunks.
+    """
+    _require_csv(output_name)
+
+    subset = (
+        deduplication_key
+        if isinstance(deduplication_key, list)
+        else [deduplication_key]
     )
 
+    df = df[columns].drop_duplicates(subset=subset)
+
+    keys = list(df[subset].itertuples(index=False, name=None))
+    is_new = [key not in seen_keys for key in keys]
+    df = df[is_new]
+    seen_keys.update(key for key, new in zip(keys, is_new) if new)
+
+    append_frame(df, OUTPUT_DIR, output_name)
+
+    logger.info(f"Appended {len(df)} rows to {output_name}")
+
     return df
+
+
+def _require_csv(output_name: str) -> None:
+    # Parquet / Arrow files can't be appended to in place
+    if output_format() != "csv":
+        raise ValueError(
+            f"Appending to {output_name} needs CSV output, "
+            f"not {output_format()}"
+        )
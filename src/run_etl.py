@@ -1,23 +1,282 @@
-from src.extract.extract import extract_data
-from src.utils.raw_validation import validate_raw_lego_data
-from src.transform.transform import transform_data
-from src.utils.clean_validation import validate_clean_lego_data
-from src.load.load_clean import save_clean_data
-from src.load.load import create_tables
+from src.extract import extract, extract_lego
+from src.extract.extract import extract_data, locate_raw_file
+from src.utils import raw_validation, clean_validation
+from src.utils.raw_validation import (
+    validate_raw_lego_data,
+    validate_raw_lego_chunks,
+)
+from src.transform import (
+    cleaning_rules,
+    incremental,
+    parallel,
+    transform,
+    transform_duplicates,
+    transform_numeric,
+    transform_text,
+)
+from src.transform.transform import transform_data, transform_chunks
+from src.transform.incremental import (
+    row_state,
+    changed_keys,
+    key_mask,
+    merge_clean,
+)
+from src.utils.clean_validation import (
+    validate_clean_lego_data,
+    validate_clean_lego_chunks,
+)
+from src.utils import table_io
+from src.utils.hashing import file_sha256
+from src.utils.metrics import count, run_metrics
+from src.utils.table_io import output_settings, set_output_format, table_path
+from src.utils.stage_cache import (
+    code_version,
+    fingerprint,
+    load_stage_frame,
+    record_stage,
+    save_stage_frame,
+    stage_frame_path,
+    stage_is_current,
+    stage_key,
+)
+from src.load.load_clean import (
+    append_clean_data,
+    save_clean_data,
+    save_clean_chunks,
+    PROCESSED_DIR,
+)
+from src.load.load import (
+    create_aggregate_tables,
+    create_tables,
+    create_text_index_tables,
+    create_tables_from_file,
+    database_scope,
+    merge_tables,
+    remove_derived_tables,
+)
+from src.load.load_database import merge_database
+from src.load.star_schema import build_star_schema
 
 
-def run():
+def run(
+    chunksize: int | None = None,
+    max_bytes: int | None = None,
+    force: bool = False,
+    workers: int | None = None,
+    incremental_mode: bool = False,
+    output_format: str = "csv",
+    compression: str | None = None,
+    database: str | None = None,
+    database_mode: str = "replace",
+    partition_by: dict | None = None,
+):
+    # one JSON run report per run (see utils.metrics)
+    with run_metrics(
+        chunksize=chunksize,
+        max_bytes=max_bytes,
+        force=force,
+        workers=workers,
+        incremental_mode=incremental_mode,
+        output_format=output_format,
+        compression=compression,
+        # not the URL itself - it may hold credentials
+        database=database is not None,
+        database_mode=database_mode,
+        partition_by=partition_by,
+    ):
+        # csv, parquet or feather for output tables and clean data;
+        # partition_by e.g. {"product_listings": "country_id"} (parquet only)
+        set_output_format(output_format, compression, partition_by)
+
+        # Streaming mode keeps only one chunk in memory at a time - it
+        # skips the aggregate and text index tables (see run_streaming)
+        if chunksize or max_bytes:
+            if output_format != "csv":
+                raise ValueError("Streaming mode only writes CSV output")
+            if database is not None:
+                raise ValueError("Streaming mode does not load a database")
+            run_streaming(chunksize, max_bytes)
+            return
+
+        if incremental_mode and not force:
+            run_incremental(workers, database)
+            return
+
+        transform_key, _ = _transform_keys()
+
+        if not force and stage_is_current(
+            "transform", transform_key, [stage_frame_path("transform")]
+        ):
+            df_clean = load_stage_frame("transform")
+            count("stages_skipped")
+        else:
+            # Extract data
+            df_raw = extract_data()
+            validate_raw_lego_data(df_raw)
+            # clean data
+            df_clean = transform_data(df_raw, workers)
+            validate_clean_lego_data(df_clean)
+            save_stage_frame("transform", df_clean)
+            record_stage("transform", transform_key)
+
+        # save cleaned data
+        _save_clean(df_clean, transform_key, force)
+
+        # load RDS
+        create_tables(
+            df_clean,
+            source_key=None if force else transform_key,
+            workers=workers,
+            database=database,
+            database_mode=database_mode,
+        )
+        create_aggregate_tables(workers)
+        create_text_index_tables()
+
+
+def _transform_keys() -> tuple[str, str]:
+    """
+    Stage key for the transform output - hash of the raw file plus the
+    code that runs it - and the code half on its own.
+    """
+    extract_code = code_version(extract, extract_lego, raw_validation)
+    # the rules are hashed as data too, so a rule changed at runtime counts
+    transform_code = code_version(
+        transform,
+        transform_numeric,
+        transform_text,
+        transform_duplicates,
+        cleaning_rules,
+        cleaning_rules.CLEANING_RULES,
+        parallel,
+        clean_validation,
+    )
+
+    raw_key = file_sha256(locate_raw_file())
+    extract_key = fingerprint(raw_key, extract_code)
+    transform_key = fingerprint(extract_key, transform_code)
+
+    return transform_key, fingerprint(
+        extract_code, transform_code, code_version(incremental)
+    )
+
+
+def _clean_key(transform_key: str) -> str:
+    return fingerprint(
+        transform_key, code_version(save_clean_data), output_settings()
+    )
+
+
+def _save_clean(df_clean, transform_key: str, force: bool = False):
+    clean_key = _clean_key(transform_key)
+    if force or not stage_is_current(
+        "save_clean", clean_key, [table_path(PROCESSED_DIR, "lego_clean.csv")]
+    ):
+        save_clean_data(df_clean, "lego_clean.csv")
+        record_stage("save_clean", clean_key)
+
+
+def run_incremental(workers: int | None = None, database: str | None = None):
+    """
+    Only transform raw rows that are new or changed since the last run:
+        - fingerprint raw rows by (prod_id, country) + content hash
+        - diff against the row state saved by the previous run
+        - transform rows for changed keys only, merge into the previous
+          clean frame and the output tables
+        - the database, if given, gets only the changed keys upserted
+    Falls back to a full run when there is no usable previous state.
+    """
+    transform_key, code_key = _transform_keys()
+
     # Extract data
     df_raw = extract_data()
     validate_raw_lego_data(df_raw)
+    state = row_state(df_raw)
+
+    # the saved state must belong to the saved clean frame and this code
+    previous_key = stage_key("transform")
+    has_previous = previous_key is not None and stage_is_current(
+        "row_state",
+        fingerprint(previous_key, code_key, output_settings()),
+        [
+            stage_frame_path("row_state"),
+            stage_frame_path("transform"),
+            table_path(PROCESSED_DIR, "lego_clean.csv"),
+        ],
+    )
+
+    if not has_previous:
+        df_clean = transform_data(df_raw, workers)
+        validate_clean_lego_data(df_clean)
+        save_stage_frame("transform", df_clean)
+        save_clean_data(df_clean, "lego_clean.csv")
+        create_tables(
+            df_clean,
+            source_key=transform_key,
+            workers=workers,
+            database=database,
+            database_mode="merge",
+        )
+    else:
+        keys = changed_keys(state, load_stage_frame("row_state"))
+        if not keys.empty:
+            # clean only the rows for changed keys
+            delta_raw = df_raw[key_mask(state, keys)].copy()
+            delta_clean = transform_data(delta_raw, workers)
+            validate_clean_lego_data(delta_clean)
+
+            df_clean = merge_clean(
+                load_stage_frame("transform"), delta_clean, keys, state
+            )
+            save_stage_frame("transform", df_clean)
+            if (
+                keys["new_key"].all()
+                and table_io.output_format() == "csv"
+                and key_mask(df_clean.tail(len(delta_clean)), keys).all()
+            ):
+                # pure inserts at the end - no need to rewrite the clean csv
+                append_clean_data(delta_clean, "lego_clean.csv")
+            else:
+                save_clean_data(df_clean, "lego_clean.csv")
+            merge_tables(df_clean, keys)
+            if database is not None:
+                merge_database(
+                    build_star_schema(df_clean), database, database_scope(keys)
+                )
+
+    create_aggregate_tables(workers)
+    create_text_index_tables()
+
+    record_stage("transform", transform_key)
+    record_stage("save_clean", _clean_key(transform_key))
+    save_stage_frame("row_state", state)
+    record_stage(
+        "row_state", fingerprint(transform_key, code_key, output_settings())
+    )
+
+
+def run_streaming(chunksize: int | None = None, max_bytes: int | None = None):
+    """
+    Run the pipeline holding one chunk in memory at a time:
+        - raw chunks are cleaned and appended to the clean csv
+        - the star-schema tables are built from the clean csv in chunks
+        - the aggregate and text index tables are not built - both need
+          every listing / description in memory - and those from earlier
+          runs are removed so they can't go stale; run without chunksize
+          / max_bytes to build them
+    """
+    # Extract data
+    chunks = extract_data(chunksize=chunksize, max_bytes=max_bytes)
+    chunks = validate_raw_lego_chunks(chunks)
     # clean data
-    df_clean = transform_data(df_raw)
-    validate_clean_lego_data(df_clean)
+    chunks = transform_chunks(chunks)
+    chunks = validate_clean_lego_chunks(chunks)
     # save cleaned data
-    save_clean_data(df_clean, "lego_clean.csv")
+    clean_path = save_clean_chunks(chunks, "lego_clean.csv")
 
     # load RDS
-    create_tables(df_clean)
+    create_tables_from_file(clean_path, chunksize, max_bytes)
+    remove_derived_tables()
 
 
 if __name__ == "__main__":
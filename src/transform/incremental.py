@@ -0,0 +1,138 @@
+import numpy as np
+import pandas as pd
+from src.utils.logging_utils import setup_logger
+from src.transform.cleaning_rules import apply_cleaning_rules
+from src.transform.transform_duplicates import composite_keys
+
+logger = setup_logger("incremental", "transform.log")
+
+KEY_COLS = ["prod_id", "country"]
+
+
+def row_state(df_raw: pd.DataFrame) -> pd.DataFrame:
+    """
+    Fingerprint every raw row:
+        - prod_id, country: the row's key after cleaning, as dedup sees it
+        - row_hash: 64-bit hash of every raw column plus the row's rank
+          among its prod_id's rows - dedup and the product tables keep
+          the first row, so reordering a product's rows changes its keys
+    Row order matches df_raw.
+    """
+    keys = apply_cleaning_rules(df_raw[KEY_COLS].copy())
+
+    # categorize=False - raw text is mostly distinct, factorizing
+    # it first costs more than hashing every value
+    content = pd.util.hash_pandas_object(df_raw, index=False, categorize=False)
+    rank = keys.groupby("prod_id", dropna=False, sort=False).cumcount()
+
+    return pd.DataFrame(
+        {
+            "prod_id": keys["prod_id"].to_numpy(),
+            "country": keys["country"].to_numpy(),
+            "row_hash": pd.util.hash_pandas_object(
+                pd.DataFrame(
+                    {"content": content.to_numpy(), "rank": rank.to_numpy()}
+                ),
+                index=False,
+            ).to_numpy(),
+        }
+    )
+
+
+def changed_keys(
+    current: pd.DataFrame, previous: pd.DataFrame
+) -> pd.DataFrame:
+    """
+    (prod_id, country) keys that need rebuilding:
+        - keys of rows whose hash is new (inserted or changed rows)
+        - keys of previous rows whose hash is gone (changed or deleted rows)
+    new_key / new_product flag keys and prod_ids the previous run never saw,
+    so pure inserts can be appended instead of merged.
+    """
+    new_rows = ~current["row_hash"].isin(previous["row_hash"])
+    gone_rows = ~previous["row_hash"].isin(current["row_hash"])
+
+    keys = pd.concat(
+        [current.loc[new_rows, KEY_COLS], previous.loc[gone_rows, KEY_COLS]],
+        ignore_index=True,
+    ).drop_duplicates(ignore_index=True)
+
+    keys["new_key"] = ~key_mask(keys, previous)
+    keys["new_product"] = ~keys["prod_id"].isin(previous["prod_id"])
+
+    logger.info(
+        f"Incremental diff: {int(new_rows.sum())} new/changed rows, "
+        f"{int(gone_rows.sum())} changed/deleted rows, "
+        f"{len(keys)} keys to rebuild"
+    )
+
+    return keys
+
+
+def key_mask(df: pd.DataFrame, keys: pd.DataFrame) -> np.ndarray:
+    """
+    Boolean mask of df rows whose (prod_id, country) is in keys
+    """
+    countries = {}
+    df_keys, _ = composite_keys(df, countries)
+    wanted, _ = composite_keys(keys, countries)
+    return np.isin(df_keys, wanted)
+
+
+def _concat_clean(kept: pd.DataFrame, delta: pd.DataFrame) -> pd.DataFrame:
+    # concat falls back to object when category sets differ - rebuild them
+    merged = pd.concat([kept, delta], ignore_index=True)
+
+    for col in kept.columns:
+        dtype = kept[col].dtype
+        if not isinstance(dtype, pd.CategoricalDtype):
+            continue
+        if isinstance(merged[col].dtype, pd.CategoricalDtype):
+            continue
+
+        extra = [
+            value
+            for value in pd.unique(delta[col].dropna())
+            if value not in dtype.categories
+        ]
+        if dtype.ordered:
+            categories = list(dtype.categories) + extra
+        else:
+            categories = sorted(list(dtype.categories) + extra)
+        merged[col] = merged[col].astype(
+            pd.CategoricalDtype(categories, ordered=dtype.ordered)
+        )
+
+    return merged
+
+
+def merge_clean(
+    previous_clean: pd.DataFrame,
+    delta_clean: pd.DataFrame,
+    keys: pd.DataFrame,
+    state: pd.DataFrame,
+) -> pd.DataFrame:
+    """
+    Swap the rebuilt keys into the previous run's clean frame:
+        - drop every previous row for a rebuilt key
+        - add the freshly transformed rows for those keys
+        - order rows by where their key first appears in the current raw
+          state, as a full transform would (dedup keeps the first row)
+    """
+    kept = previous_clean[~key_mask(previous_clean, keys)]
+
+    logger.info(
+        f"Merging {len(delta_clean)} rebuilt rows into "
+        f"{len(kept)} unchanged rows "
+        f"({len(previous_clean) - len(kept)} previous rows replaced)"
+    )
+
+    merged = _concat_clean(kept, delta_clean)
+
+    countries = {}
+    state_keys, _ = composite_keys(state, countries)
+    merged_keys, _ = composite_keys(merged, countries)
+    position = pd.Index(pd.unique(state_keys)).get_indexer(merged_keys)
+
+    order = np.argsort(position, kind="stable")
+    return merged.take(order).reset_index(drop=True)
@@ -0,0 +1,117 @@
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing.shared_memory import SharedMemory
+import numpy as np
+import pandas as pd
+from src.transform.cleaning_rules import CLEANING_RULES, clean_column
+from src.utils.logging_utils import setup_logger
+from src.utils.metrics import observe
+
+logger = setup_logger("transform", "transform.log")
+
+
+def _share_array(values: np.ndarray) -> tuple[SharedMemory, dict]:
+    """Copy a numeric array into shared memory so workers can map it."""
+    shm = SharedMemory(create=True, size=max(values.nbytes, 1))
+    np.ndarray(values.shape, values.dtype, buffer=shm.buf)[:] = values
+    return shm, {
+        "shm": shm.name,
+        "shape": values.shape,
+        "dtype": values.dtype.str,
+    }
+
+
+def _column_payload(series: pd.Series) -> tuple[SharedMemory | None, dict]:
+    """
+    Numeric columns go through shared memory; object and categorical
+    columns are pickled on their own (never the whole frame).
+    """
+    if series.dtype.kind in "biuf":
+        return _share_array(series.to_numpy())
+    return None, {"series": series.reset_index(drop=True)}
+
+
+def _already_clean(series: pd.Series, rule: dict) -> bool:
+    """Plain text rules are a no-op on all-string, non-null columns."""
+    return (
+        rule.get("dtype") == "str"
+        and not rule.get("lower")
+        and pd.api.types.infer_dtype(series, skipna=False) == "string"
+    )
+
+
+def _clean_column_task(col: str, payload: dict):
+    """
+    Worker: clean one column and hand back its values, null count and
+    seconds taken (metrics are recorded in the main process)
+    """
+    start = time.perf_counter()
+    if "series" in payload:
+        cleaned, nulls = clean_column(payload["series"], CLEANING_RULES[col])
+        return (
+            col,
+            pd.Series(cleaned).array,
+            nulls,
+            time.perf_counter() - start,
+        )
+
+    shm = SharedMemory(name=payload["shm"])
+    try:
+        values = np.ndarray(payload["shape"], payload["dtype"], buffer=shm.buf)
+        cleaned, nulls = clean_column(pd.Series(values), CLEANING_RULES[col])
+        # copy out before the shared buffer is released
+        cleaned = np.array(cleaned, copy=True)
+        return col, cleaned, nulls, time.perf_counter() - start
+    finally:
+        shm.close()
+
+
+def apply_cleaning_rules_parallel(
+    df: pd.DataFrame, workers: int, columns=None
+) -> pd.DataFrame:
+    """
+    Clean ruled columns concurrently over a process pool:
+        - each column is an independent task
+        - results are assigned back column by column
+    """
+    if columns is None:
+        columns = [col for col in CLEANING_RULES if col in df.columns]
+
+    logger.info(f"Cleaning {len(columns)} columns over {workers} processes...")
+
+    shared = []
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = []
+            for col in columns:
+                if _already_clean(df[col], CLEANING_RULES[col]):
+                    # not worth pickling a clean string column to a worker
+                    logger.info(
+                        f"{col} cleaned successfully. {col} nulls found: 0"
+                    )
+                    continue
+
+                shm, payload = _column_payload(df[col])
+                if shm is not None:
+                    shared.append(shm)
+                futures.append(pool.submit(_clean_column_task, col, payload))
+
+            for future in as_completed(futures):
+                col, values, nulls, seconds = future.result()
+                df[col] = values
+                observe(
+                    f"clean_{col}",
+                    seconds,
+                    rows_in=len(df),
+                    rows_out=len(df),
+                    nulls=nulls,
+                )
+                logger.info(
+                    f"{col} cleaned successfully. {col} nulls found: {nulls}"
+                )
+    finally:
+        for shm in shared:
+            shm.close()
+            shm.unlink()
+
+    return df
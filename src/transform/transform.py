@@ -1,58 +1,60 @@
 import pandas as pd
+from typing import Iterable, Iterator
 from src.utils.logging_utils import setup_logger
+from src.utils.metrics import count, timed
 
-from src.transform.transform_duplicates import clean_duplicates
+from src.transform.transform_duplicates import clean_duplicates, new_seen_keys
 
-from src.transform.transform_numeric import (
-    clean_ages,
-    clean_list_price,
-    clean_num_reviews,
-    clean_piece_count,
-    clean_prod_id,
-)
-
-from src.transform.transform_text import (
-    clean_prod_desc,
-    clean_prod_long_desc,
-    clean_review_difficulty,
-    clean_set_name,
-    clean_theme_name,
-    clean_country,
-)
+from src.transform.transform_numeric import clean_ages
 
+from src.transform.cleaning_rules import apply_cleaning_rules
+from src.transform.parallel import apply_cleaning_rules_parallel
 
 logger = setup_logger("transform", "transform.log")
 
 
-def transform_data(df: pd.DataFrame) -> pd.DataFrame:
+@timed()
+def transform_data(
+    df: pd.DataFrame, workers: int | None = None, seen_keys: dict | None = None
+) -> pd.DataFrame:
     """
     Orchestrate transformations
-    - numeric values
-    - text values
+    - ages parsing
+    - numeric and text values, one fused pass per column from CLEANING_RULES
+    - workers > 1 cleans columns in parallel over a process pool
+    - seen_keys carries dedup state across streamed chunks
     """
 
     logger.info("Starting transformation pipeline...")
 
-    # numeric
+    # ages
     df = clean_ages(df)
-    df = clean_list_price(df)
-    df = clean_num_reviews(df)
-    df = clean_piece_count(df)
-    df = clean_prod_id(df)
-
-    # text
-    df = clean_prod_desc(df)
-    df = clean_prod_long_desc(df)
-    df = clean_review_difficulty(df)
-    df = clean_set_name(df)
-    df = clean_theme_name(df)
-    df = clean_country(df)
+
+    # numeric and text
+    if workers and workers > 1:
+        df = apply_cleaning_rules_parallel(df, workers)
+    else:
+        df = apply_cleaning_rules(df)
 
     # duplicates
-    df = clean_duplicates(df)
+    df = clean_duplicates(df, seen_keys)
 
     # drop redundant ages column
     df = df.drop(columns=["ages"], errors="ignore")
 
     logger.info("Transformation complete.")
     return df
+
+
+def transform_chunks(chunks: Iterable[pd.DataFrame]) -> Iterator[pd.DataFrame]:
+    """
+    Stream transformations:
+    - runs transform_data on every chunk
+    - drops (prod_id, country) keys already kept by earlier chunks
+    - yields clean chunks one at a time
+    """
+
+    seen_keys = new_seen_keys()
+    for chunk in chunks:
+        count("chunks_transformed")
+        yield transform_data(chunk, seen_keys=seen_keys)
@@ -1,47 +1,146 @@
+import numpy as np
 import pandas as pd
 from src.utils.logging_utils import setup_logger
+from src.utils.metrics import timed
 
 logger = setup_logger("clean_duplicates", "transform.log")
 
+# packed key layout: prod_id in the high bits, country id in the low 16
+COUNTRY_BITS = 16
+MAX_PROD_ID = 2 ** (63 - COUNTRY_BITS)
 
-def clean_duplicates(df: pd.DataFrame) -> pd.DataFrame:
+
+def new_seen_keys() -> dict:
+    """
+    State for deduplicating across streamed chunks:
+        - keys: packed (prod_id, country) keys already kept - a set, so
+          each chunk costs O(chunk) however many keys came before
+        - countries: country label -> stable small int, append-only
+    """
+    return {"keys": set(), "countries": {}}
+
+
+def composite_keys(
+    df: pd.DataFrame, countries: dict
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Pack (prod_id, country) into one int64 per row.
+    Returns the keys and a mask of rows with a null prod_id or country.
+    """
+    prod_id = df["prod_id"]
+    if not pd.api.types.is_numeric_dtype(prod_id):
+        prod_id = pd.to_numeric(prod_id, errors="coerce")
+    prod_id = prod_id.to_numpy(dtype="float64", na_value=np.nan)
+
+    # countries are few - map each distinct label to its stable id once
+    if isinstance(df["country"].dtype, pd.CategoricalDtype):
+        codes = df["country"].cat.codes.to_numpy()
+        labels = df["country"].cat.categories
+    else:
+        codes, labels = pd.factorize(df["country"])
+
+    label_ids = np.array(
+        [countries.setdefault(label, len(countries)) for label in labels]
+        + [0],
+        dtype="int64",
+    )
+    if len(countries) >= 2**COUNTRY_BITS:
+        raise ValueError(f"More than {2**COUNTRY_BITS} distinct countries.")
+
+    null_mask = np.isnan(prod_id) | (codes == -1)
+
+    prod_id = np.where(null_mask, 0, prod_id).astype("int64")
+    if prod_id.size and prod_id.max() >= MAX_PROD_ID:
+        raise ValueError(f"prod_id too large to pack: {prod_id.max()}")
+
+    # code -1 (null country) picks the trailing 0 slot; masked out anyway
+    keys = (prod_id << COUNTRY_BITS) | label_ids[codes]
+
+    return keys, null_mask
+
+
+def deduplicate(
+    df: pd.DataFrame, seen_keys: dict | None = None
+) -> tuple[pd.DataFrame, dict]:
+    """
+    Build the keep-mask from packed keys in one pass:
+        - rows with null prod_id/country dropped
+        - duplicates within df dropped (first kept)
+        - with seen_keys, keys kept by earlier chunks dropped too
+    Returns the kept rows and row-count stats.
+    """
+    state = seen_keys if seen_keys is not None else new_seen_keys()
+
+    keys, null_mask = composite_keys(df, state["countries"])
+
+    # null rows share a sentinel key and are masked out of the duplicates
+    duplicate_mask = (
+        pd.Series(np.where(null_mask, -1, keys)).duplicated().to_numpy()
+    )
+    duplicate_mask &= ~null_mask
+
+    seen_mask = np.zeros(len(keys), dtype=bool)
+    if state["keys"]:
+        seen_mask = np.fromiter(
+            map(state["keys"].__contains__, keys.tolist()),
+            dtype=bool,
+            count=len(keys),
+        )
+        seen_mask &= ~null_mask & ~duplicate_mask
+
+    keep_mask = ~(null_mask | duplicate_mask | seen_mask)
+
+    if seen_keys is not None:
+        state["keys"].update(keys[keep_mask].tolist())
+
+    stats = {
+        "rows_in": len(df),
+        "null_keys": int(null_mask.sum()),
+        "duplicates": int(duplicate_mask.sum()),
+        "seen_in_earlier_chunks": int(seen_mask.sum()),
+        "rows_out": int(keep_mask.sum()),
+    }
+
+    if keep_mask.all():
+        return df, stats
+    return df[keep_mask], stats
+
+
+@timed()
+def clean_duplicates(
+    df: pd.DataFrame, seen_keys: dict | None = None
+) -> pd.DataFrame:
     """
     Remove duplicated rows:
         - Drop rows with missing prod_id or country.
         - Drop duplicted rows based on composite key
+        - With seen_keys (from new_seen_keys) also drop keys kept by
+          earlier streamed chunks
         - Log row count change
 
     Returns:
         - Cleaned DataFrame
     """
-    initial_rows = df.shape[0]
+    df, stats = deduplicate(df, seen_keys)
 
-    # Remove empty prod_id and country
-    corrupted_rows = df["prod_id"].isna() | df["country"].isna()
-    corrupted_rows_count = corrupted_rows.sum()
-
-    if corrupted_rows_count > 0:
+    if stats["null_keys"] > 0:
         logger.warning(
-            f"Removing {corrupted_rows_count} rows with null prod_id/country."
+            f"Removing {stats['null_keys']} rows with null prod_id/country."
         )
-        df = df[(df["prod_id"].notna()) & (df["country"].notna())]
-
-    # Remove duplicates
-    duplicated_rows_count = df.duplicated(subset=["prod_id", "country"]).sum()
 
-    if duplicated_rows_count > 0:
-        logger.info(f"Removing {duplicated_rows_count} duplicate_rows.")
-        df = df.drop_duplicates(subset=["prod_id", "country"])
+    if stats["duplicates"] > 0:
+        logger.info(f"Removing {stats['duplicates']} duplicate_rows.")
 
-    # Log
-
-    final_rows = df.shape[0]
-    removed_rows = initial_rows - final_rows
+    if stats["seen_in_earlier_chunks"] > 0:
+        logger.info(
+            f"Removing {stats['seen_in_earlier_chunks']} rows already kept "
+            f"by earlier chunks."
+        )
 
     logger.info(
         f"Duplicate cleaning complete. "
-        f"Rows before: {initial_rows}, after: {final_rows} "
-        f"Removed: {removed_rows}"
+        f"Rows before: {stats['rows_in']}, after: {stats['rows_out']} "
+        f"Removed: {stats['rows_in'] - stats['rows_out']}"
     )
 
     return df
@@ -1,13 +1,42 @@
+import re
+import numpy as np
 import pandas as pd
 from src.utils.logging_utils import setup_logger
+from src.utils.metrics import timed
+from src.transform.cleaning_rules import apply_cleaning_rules
 
 logger = setup_logger("transfrom", "transform.log")
 
+# first number, optionally followed by "-<number>" for ranges
+AGE_PATTERN = re.compile(r"(?P<age_min>\d+\.?\d*)(?:-(?P<age_max>\d+\.?\d*))?")
 
+
+def _parse_age(value: str) -> tuple[float, float]:
+    """
+    Parse one ages value into (age_min, age_max):
+        - "6-12" -> (6, 12)
+        - "6+"   -> (6, 99)
+        - "1½-3" -> (1.5, 3)
+    """
+    match = AGE_PATTERN.search(value.replace("½", ".5"))
+    if match is None:
+        return np.nan, np.nan
+
+    age_min = float(match["age_min"])
+    age_max = float(match["age_max"]) if match["age_max"] else np.nan
+
+    if value.endswith("+"):
+        age_max = 99
+
+    return age_min, age_max
+
+
+@timed()
 def clean_ages(df: pd.DataFrame) -> pd.DataFrame:
     """
     Clean ages columns:
         - ages -> age_min, age_max
+        - each distinct ages value is parsed once and broadcast by code
     """
 
     if "age_min" in df.columns and "age_max" in df.columns:
@@ -16,34 +45,18 @@ def clean_ages(df: pd.DataFrame) -> pd.DataFrame:
 
     logger.info("Cleaning ages...")
 
-    # Make it a string to work on
-    ages_clean = df["ages"].astype(str)
+    # nulls get code -1, which indexes the trailing NaN slot below
+    codes, uniques = pd.factorize(df["ages"])
 
-    # replace fractionals with decimals
-    ages_clean = ages_clean.str.replace("½", ".5", regex=False)
+    parsed = [_parse_age(str(value)) for value in uniques]
+    parsed.append((np.nan, np.nan))
+    age_min, age_max = np.array(parsed, dtype="float64").T
 
-    # Extract Ranges "6-12"
-    range_extract = ages_clean.str.extract(
-        r"(?P<age_min>\d+\.?\d*)-(?P<age_max>\d+\.?\d*)"
-    )
-
-    # Extract single "6+"
-    single_extract = ages_clean.str.extract(r"(?P<age_min>\d+\.?\d*)\+?")
-
-    # Build age min
-    df["age_min"] = pd.to_numeric(
-        range_extract["age_min"].fillna(single_extract["age_min"]), errors="coerce"
-    )
-
-    # Build age max
-    df["age_max"] = pd.to_numeric(range_extract["age_max"], errors="coerce")
-
-    # Apply '+' rule -> age_max = 99
-    plus_mask = ages_clean.str.contains(r"\+$", regex=True)
-    df.loc[plus_mask, "age_max"] = 99
+    df["age_min"] = age_min[codes]
+    df["age_max"] = age_max[codes]
 
     logger.info(
-        f"Ages cleaned successfully. "
+        f"Ages cleaned successfully ({len(uniques)} distinct values). "
         f"age_min nulls: {df['age_min'].isna().sum()}, "
         f"age_max nulls: {df['age_max'].isna().sum()}"
     )
@@ -57,18 +70,7 @@ def clean_list_price(df: pd.DataFrame) -> pd.DataFrame:
         - round and ensure numeric
     """
 
-    logger.info("Cleaning list_price...")
-
-    df["list_price"] = pd.to_numeric(df["list_price"], errors="coerce")
-
-    df["list_price"] = df["list_price"].round(2)
-
-    logger.info(
-        f"list_price cleaned successfully. "
-        f"list_price nulls: {df['list_price'].isna().sum()}"
-    )
-
-    return df
+    return apply_cleaning_rules(df, ["list_price"])
 
 
 def clean_num_reviews(df: pd.DataFrame) -> pd.DataFrame:
@@ -77,20 +79,8 @@ def clean_num_reviews(df: pd.DataFrame) -> pd.DataFrame:
         - int
         - Nan -> 0
     """
-    logger.info("Cleaning num_reviews...")
 
-    df["num_reviews"] = pd.to_numeric(df["num_reviews"], errors="coerce")
-
-    df["num_reviews"] = df["num_reviews"].fillna(0)
-
-    df["num_reviews"] = df["num_reviews"].astype(int)
-
-    logger.info(
-        f"num_reviews cleaner successfully. "
-        f"num_reviews nulls: {df['num_reviews'].isna().sum()}"
-    )
-
-    return df
+    return apply_cleaning_rules(df, ["num_reviews"])
 
 
 def clean_piece_count(df: pd.DataFrame) -> pd.DataFrame:
@@ -99,18 +89,7 @@ def clean_piece_count(df: pd.DataFrame) -> pd.DataFrame:
         - convert to int
     """
 
-    logger.info("Cleaning piece_count...")
-
-    df["piece_count"] = pd.to_numeric(df["piece_count"], errors="coerce")
-
-    df["piece_count"] = df["piece_count"].astype(int)
-
-    logger.info(
-        f"piece_count cleaner successfully. "
-        f"piece_count nulls: {df['piece_count'].isna().sum()}"
-    )
-
-    return df
+    return apply_cleaning_rules(df, ["piece_count"])
 
 
 def clean_prod_id(df: pd.DataFrame) -> pd.DataFrame:
@@ -119,14 +98,4 @@ def clean_prod_id(df: pd.DataFrame) -> pd.DataFrame:
         - convert to int
     """
 
-    logger.info("Cleaning prod_id...")
-
-    df["prod_id"] = pd.to_numeric(df["prod_id"], errors="coerce")
-
-    df["prod_id"] = df["prod_id"].astype(int)
-
-    logger.info(
-        f"prod_id cleaner successfully. " f"prod_id nulls: {df['prod_id'].isna().sum()}"
-    )
-
-    return df
+    return apply_cleaning_rules(df, ["prod_id"])
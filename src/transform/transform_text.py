@@ -1,7 +1,7 @@
 import pandas as pd
-from src.utils.logging_utils import setup_logger
+from src.transform.cleaning_rules import apply_cleaning_rules
 
-logger = setup_logger("transform", "transform.log")
+# Rules for these columns live in cleaning_rules.CLEANING_RULES
 
 
 def clean_prod_desc(df: pd.DataFrame) -> pd.DataFrame:
@@ -11,20 +11,7 @@ def clean_prod_desc(df: pd.DataFrame) -> pd.DataFrame:
         - concert to string
     """
 
-    logger.info("Cleaning prod_desc...")
-
-    default_msg = "No description available"
-
-    df["prod_desc"] = df["prod_desc"].fillna(default_msg)
-
-    df["prod_desc"] = df["prod_desc"].astype(str)
-
-    logger.info(
-        f"prod_desc cleaned successfully. "
-        f"prod_desc nulls: {df['prod_desc'].isna().sum()}"
-    )
-
-    return df
+    return apply_cleaning_rules(df, ["prod_desc"])
 
 
 def clean_prod_long_desc(df: pd.DataFrame) -> pd.DataFrame:
@@ -34,20 +21,7 @@ def clean_prod_long_desc(df: pd.DataFrame) -> pd.DataFrame:
         - concert to string
     """
 
-    logger.info("Cleaning prod_long_desc...")
-
-    default_msg = "No long description available"
-
-    df["prod_long_desc"] = df["prod_long_desc"].fillna(default_msg)
-
-    df["prod_long_desc"] = df["prod_long_desc"].astype(str)
-
-    logger.info(
-        f"prod_long_desc cleaned successfully. "
-        f"prod_long_desc nulls: {df['prod_long_desc'].isna().sum()}"
-    )
-
-    return df
+    return apply_cleaning_rules(df, ["prod_long_desc"])
 
 
 def clean_review_difficulty(df: pd.DataFrame) -> pd.DataFrame:
@@ -55,25 +29,10 @@ def clean_review_difficulty(df: pd.DataFrame) -> pd.DataFrame:
     Clean review_difficulty:
         - replace nulls with default message
         - Convert to lower case
-        - concert to string
+        - concert to string categorical, ordered by DIFFICULTY_ORDER
     """
 
-    logger.info("Cleaning review_difficulty...")
-
-    default_msg = "Unrated"
-
-    df["review_difficulty"] = df["review_difficulty"].fillna(default_msg)
-
-    df["review_difficulty"] = df["review_difficulty"].astype(str)
-
-    df["review_difficulty"] = df["review_difficulty"].str.lower()
-
-    logger.info(
-        f"review_difficulty cleaned successfully. "
-        f"review_difficulty nulls: {df['review_difficulty'].isna().sum()}"
-    )
-
-    return df
+    return apply_cleaning_rules(df, ["review_difficulty"])
 
 
 def clean_set_name(df: pd.DataFrame) -> pd.DataFrame:
@@ -83,59 +42,24 @@ def clean_set_name(df: pd.DataFrame) -> pd.DataFrame:
         - convert to string
     """
 
-    logger.info("Cleaning set_name...")
-
-    default_msg = "Unknown Set Name"
-
-    df["set_name"] = df["set_name"].fillna(default_msg)
-    df["set_name"] = df["set_name"].astype(str)
-
-    logger.info(
-        f"set_name cleaned successfully. "
-        f"set_name nulls: {df['set_name'].isna().sum()}"
-    )
-
-    return df
+    return apply_cleaning_rules(df, ["set_name"])
 
 
 def clean_theme_name(df: pd.DataFrame) -> pd.DataFrame:
     """
     Clean theme_name:
         - replace nulls with default message
-        - convert to string
+        - convert to string categorical, categories sorted
     """
 
-    logger.info("Cleaning theme_name...")
-
-    default_msg = "Unknown Theme"
-
-    df["theme_name"] = df["theme_name"].fillna(default_msg)
-    df["theme_name"] = df["theme_name"].astype(str)
-
-    logger.info(
-        f"theme_name cleaned successfully. "
-        f"theme_name nulls: {df['theme_name'].isna().sum()}"
-    )
-
-    return df
+    return apply_cleaning_rules(df, ["theme_name"])
 
 
 def clean_country(df: pd.DataFrame) -> pd.DataFrame:
     """
     Clean country:
         - replace nulls with default message
-        - convert to string
+        - convert to string categorical, categories sorted over COUNTRY_NAMES
     """
 
-    logger.info("Cleaning country...")
-
-    default_msg = "Unknown"
-
-    df["country"] = df["country"].fillna(default_msg)
-    df["country"] = df["country"].astype(str)
-
-    logger.info(
-        f"country cleaned successfully. " f"country nulls: {df['country'].isna().sum()}"
-    )
-
-    return df
+    return apply_cleaning_rules(df, ["country"])
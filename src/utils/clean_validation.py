@@ -1,5 +1,7 @@
 import pandas as pd
+from typing import Iterable, Iterator
 from src.utils.logging_utils import setup_logger
+from src.utils.metrics import timed
 
 logger = setup_logger("validate_clean", "validate.log")
 
@@ -30,6 +32,7 @@ TEXT_COLS = [
 ]
 
 
+@timed()
 def validate_clean_lego_data(df=pd.DataFrame) -> None:
     """
     Validates the clean lego data:
@@ -60,3 +63,16 @@ def validate_clean_lego_data(df=pd.DataFrame) -> None:
             raise TypeError(f"colum {col} must be string. Got: {df[col].dtype}")
 
     logger.info("Clean Lego dataset Validated successfully.")
+
+
+def validate_clean_lego_chunks(
+    chunks: Iterable[pd.DataFrame],
+) -> Iterator[pd.DataFrame]:
+    """
+    Validates a stream of clean lego chunks:
+        - Runs the clean checks on every chunk
+        - Yields chunks through unchanged
+    """
+    for chunk in chunks:
+        validate_clean_lego_data(chunk)
+        yield chunk
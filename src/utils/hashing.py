@@ -0,0 +1,21 @@
+import hashlib
+from pathlib import Path
+
+HASH_BLOCK_SIZE = 1 << 20
+
+
+def file_sha256(path: Path) -> str:
+    """Stream a file through sha256 without loading it into memory."""
+    return file_digest(path).hexdigest()
+
+
+def file_digest(path: Path):
+    """
+    sha256 object over the file so far - can be updated with appended
+    bytes.
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b""):
+            digest.update(block)
+    return digest
@@ -0,0 +1,77 @@
+import hashlib
+import json
+import os
+from pathlib import Path
+import numpy as np
+import pandas as pd
+from src.utils.logging_utils import setup_logger
+
+logger = setup_logger("key_registry", "load.log")
+
+# one small label -> id map per dimension, kept across runs
+REGISTRY_DIR = Path("data/processed/keys")
+
+
+def registry_path(dimension: str) -> Path:
+    return REGISTRY_DIR / f"{dimension}.json"
+
+
+def load_registry(dimension: str) -> dict:
+    path = registry_path(dimension)
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def _save_registry(dimension: str, registry: dict) -> None:
+    # write then rename, so a crash never leaves a half-written map
+    REGISTRY_DIR.mkdir(parents=True, exist_ok=True)
+    path = registry_path(dimension)
+    tmp_path = path.with_suffix(".tmp")
+    tmp_path.write_text(
+        json.dumps(registry, ensure_ascii=False), encoding="utf-8"
+    )
+    os.replace(tmp_path, path)
+
+
+def assign_ids(dimension: str, labels) -> np.ndarray:
+    """
+    Surrogate ids for labels from the dimension's registry:
+        - known labels keep the id they were first given (dict lookup)
+        - new labels get the next free ids, in sorted order, and are saved
+        - ids are never renumbered or reused
+    A new registry numbers labels 1..n in sorted order - the ids
+    write_table's sort used to assign.
+    Null labels get NaN.
+    """
+    registry = load_registry(dimension)
+    labels = list(labels)
+
+    new_labels = sorted(
+        {
+            label
+            for label in labels
+            if not pd.isna(label) and label not in registry
+        }
+    )
+    if new_labels:
+        next_id = max(registry.values(), default=0) + 1
+        for offset, label in enumerate(new_labels):
+            registry[label] = next_id + offset
+        _save_registry(dimension, registry)
+        logger.info(f"Registered {len(new_labels)} new {dimension} ids")
+
+    ids = [np.nan if pd.isna(label) else registry[label] for label in labels]
+    if any(pd.isna(label) for label in labels):
+        return np.array(ids, dtype="float64")
+    return np.array(ids, dtype="int64")
+
+
+def registry_version(*dimensions: str) -> str:
+    """Hash of the registries, for stage keys."""
+    digest = hashlib.sha256()
+    for dimension in dimensions:
+        path = registry_path(dimension)
+        digest.update(path.read_bytes() if path.exists() else b"")
+        digest.update(b"\0")
+    return digest.hexdigest()
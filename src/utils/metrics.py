@@ -0,0 +1,193 @@
+import functools
+import json
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+import pandas as pd
+import psutil
+
+# one JSON report per run, named by its start time
+REPORT_DIR = Path("data/processed/run_reports")
+
+_process = psutil.Process()
+_lock = threading.Lock()
+# stage -> calls / seconds / rows_in / rows_out / bytes; see run_report
+_metrics = {"started": None, "stages": {}, "counters": {}, "gauges": {}}
+
+
+def _rss() -> int:
+    return _process.memory_info().rss
+
+
+def reset_metrics() -> None:
+    """Start a new run: forget every stage, counter and gauge."""
+    with _lock:
+        _metrics["started"] = datetime.now(timezone.utc)
+        _metrics["stages"] = {}
+        _metrics["counters"] = {}
+        _metrics["gauges"] = {"peak_rss_bytes": _rss()}
+
+
+def count(name: str, value: int = 1) -> None:
+    """Add to a counter, e.g. count("rows_extracted", len(df))"""
+    with _lock:
+        _metrics["counters"][name] = _metrics["counters"].get(name, 0) + value
+
+
+def gauge(name: str, value: float) -> None:
+    """Set a gauge to its latest value"""
+    with _lock:
+        _metrics["gauges"][name] = value
+
+
+def observe(stage: str, seconds: float, **totals: int) -> None:
+    """
+    Record one call of a stage measured elsewhere (e.g. in a worker
+    process); totals (rows_in, rows_out, bytes) are summed per stage
+    """
+    rss = _rss()
+    with _lock:
+        metrics = _metrics["stages"].setdefault(
+            stage, {"calls": 0, "seconds": 0.0}
+        )
+        metrics["calls"] += 1
+        metrics["seconds"] += seconds
+        for name, value in totals.items():
+            if value is not None:
+                metrics[name] = metrics.get(name, 0) + value
+        gauges = _metrics["gauges"]
+        gauges["peak_rss_bytes"] = max(gauges.get("peak_rss_bytes", 0), rss)
+
+
+@contextmanager
+def timer(stage: str, **totals: int):
+    """
+    Time a block as one call of stage:
+        with timer("save_clean", rows_in=len(df)) as totals:
+            ...
+            totals["bytes"] = path.stat().st_size
+    Keys set on the yielded dict are recorded with the timing; RSS is
+    sampled at the end for the peak_rss_bytes gauge.
+    """
+    start = time.perf_counter()
+    try:
+        yield totals
+    finally:
+        observe(stage, time.perf_counter() - start, **totals)
+
+
+def _rows(value) -> int | None:
+    return len(value) if isinstance(value, pd.DataFrame) else None
+
+
+def path_bytes(path: Path) -> int:
+    """Size of a written file, or of every file under a dataset directory"""
+    path = Path(path)
+    if path.is_dir():
+        return sum(
+            file.stat().st_size for file in path.rglob("*") if file.is_file()
+        )
+    return path.stat().st_size if path.exists() else 0
+
+
+def timed(stage: str | None = None):
+    """
+    Decorator form of timer (stage defaults to the function name).
+    rows_in / rows_out are taken from the first DataFrame argument and
+    a DataFrame return value; a returned Path counts as bytes written.
+    """
+
+    def decorate(func):
+        name = stage or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            frames = [
+                arg
+                for arg in (*args, *kwargs.values())
+                if _rows(arg) is not None
+            ]
+            with timer(
+                name, rows_in=_rows(frames[0]) if frames else None
+            ) as totals:
+                result = func(*args, **kwargs)
+                totals["rows_out"] = _rows(result)
+                if isinstance(result, Path):
+                    totals["bytes"] = path_bytes(result)
+            return result
+
+        return wrapper
+
+    return decorate
+
+
+def run_report() -> dict:
+    """
+    The current run's metrics: per-stage calls, seconds, rows in / out,
+    bytes and rows per second (of rows in, else rows out), plus counters
+    and gauges
+    """
+    with _lock:
+        stages = {
+            stage: {
+                **metrics,
+                "seconds": round(metrics["seconds"], 6),
+                "rows_per_second": (
+                    round(rows / metrics["seconds"], 1)
+                    if rows and metrics["seconds"] > 0
+                    else None
+                ),
+            }
+            for stage, metrics in _metrics["stages"].items()
+            # rows processed: read in, or produced by e.g. extraction
+            for rows in [metrics.get("rows_in") or metrics.get("rows_out")]
+        }
+        started = _metrics["started"]
+        return {
+            "started": started.isoformat() if started else None,
+            "stages": stages,
+            "counters": dict(_metrics["counters"]),
+            "gauges": dict(_metrics["gauges"]),
+        }
+
+
+def write_run_report(extra: dict | None = None) -> Path:
+    """
+    Write run_report() (plus extra, e.g. run options) as JSON to
+    REPORT_DIR/run_<start time>.json and return the path
+    """
+    report = {**(extra or {}), **run_report()}
+    started = _metrics["started"] or datetime.now(timezone.utc)
+
+    REPORT_DIR.mkdir(parents=True, exist_ok=True)
+    path = REPORT_DIR / f"run_{started:%Y%m%dT%H%M%S_%f}.json"
+    path.write_text(json.dumps(report, indent=2, default=str))
+    return path
+
+
+@contextmanager
+def run_metrics(**options):
+    """
+    Collect metrics for one pipeline run and write its JSON report when
+    it ends - with the run options and status (ok / failed), total
+    seconds and the final peak RSS - even if it fails
+    """
+    reset_metrics()
+    start = time.perf_counter()
+    status = "failed"
+    try:
+        yield
+        status = "ok"
+    finally:
+        gauge(
+            "peak_rss_bytes", max(_metrics["gauges"]["peak_rss_bytes"], _rss())
+        )
+        write_run_report(
+            {
+                "status": status,
+                "seconds": round(time.perf_counter() - start, 6),
+                "options": options,
+            }
+        )
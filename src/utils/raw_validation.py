@@ -1,6 +1,8 @@
 import pandas as pd
 import logging
+from typing import Iterable, Iterator
 from src.utils.logging_utils import setup_logger
+from src.utils.metrics import timed
 
 logger = setup_logger("validate_raw", "validate.log")
 
@@ -21,7 +23,27 @@ EXPECTED_COLUMNS = [
     "country",
 ]
 
+# Pinned read dtypes for the raw schema - numerics as floats (nullable),
+# low-cardinality text as categoricals, free text as object
+RAW_DTYPES = {
+    "ages": "category",
+    "list_price": "float64",
+    "num_reviews": "float64",
+    "piece_count": "float64",
+    "play_star_rating": "float64",
+    "prod_desc": "object",
+    "prod_id": "float64",
+    "prod_long_desc": "object",
+    "review_difficulty": "category",
+    "set_name": "object",
+    "star_rating": "float64",
+    "theme_name": "category",
+    "val_star_rating": "float64",
+    "country": "category",
+}
 
+
+@timed()
 def validate_raw_lego_data(df: pd.DataFrame) -> None:
     """
     Validates the raw LEGO dataset after extraction.
@@ -57,3 +79,16 @@ def validate_raw_lego_data(df: pd.DataFrame) -> None:
     # missing = df.isna().sum()
     # logger.info("Missing values per column:")
     # logger.info(missing)
+
+
+def validate_raw_lego_chunks(
+    chunks: Iterable[pd.DataFrame],
+) -> Iterator[pd.DataFrame]:
+    """
+    Validates a stream of raw LEGO chunks:
+        - Runs the structure checks on every chunk
+        - Yields chunks through unchanged
+    """
+    for chunk in chunks:
+        validate_raw_lego_data(chunk)
+        yield chunk
@@ -0,0 +1,34 @@
+# Reference lookups shared by transform (category order) and load (ids)
+
+DIFFICULTY_ORDER = {
+    "unrated": 1,
+    "very easy": 2,
+    "easy": 3,
+    "average": 4,
+    "challenging": 5,
+    "very challenging": 6,
+}
+
+COUNTRY_NAMES = {
+    "US": "United States",
+    "DE": "Germany",
+    "FR": "France",
+    "GB": "United Kingdom",
+    "NZ": "New Zealand",
+    "IE": "Ireland",
+    "IT": "Italy",
+    "ES": "Spain",
+    "AU": "Australia",
+    "CA": "Canada",
+    "CH": "Switzerland",
+    "CZ": "Czech Republic",
+    "AT": "Austria",
+    "BE": "Belgium",
+    "LU": "Luxembourg",
+    "NL": "Netherlands",
+    "NO": "Norway",
+    "PL": "Poland",
+    "PT": "Portugal",
+    "FI": "Finland",
+    "DN": "Denmark",
+}
@@ -0,0 +1,97 @@
+import hashlib
+import inspect
+import json
+from pathlib import Path
+import pandas as pd
+from src.utils.logging_utils import setup_logger
+
+logger = setup_logger("stage_cache", "etl.log")
+
+STAGE_DIR = Path("data/processed/stages")
+MANIFEST_FILE = "manifest.json"
+
+
+def fingerprint(*parts: str) -> str:
+    """Combine input hashes / code versions into a single stage key."""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part.encode())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def code_version(*objects) -> str:
+    """
+    Hash the source of the functions / modules a stage runs.
+    Non-code objects (column lists, lookup dicts) are hashed by repr.
+    """
+    sources = []
+    for obj in objects:
+        if inspect.ismodule(obj) or inspect.isfunction(obj):
+            sources.append(inspect.getsource(obj))
+        else:
+            sources.append(repr(obj))
+    return fingerprint(*sources)
+
+
+def _read_manifest() -> dict:
+    manifest_path = STAGE_DIR / MANIFEST_FILE
+    if not manifest_path.exists():
+        return {}
+    return json.loads(manifest_path.read_text())
+
+
+def stage_is_current(name: str, key: str, outputs: list) -> bool:
+    """
+    A stage can be skipped when:
+        - its recorded key matches the new key
+        - every output it produced still exists
+    """
+    if _read_manifest().get(name) != key:
+        return False
+    return all(Path(output).exists() for output in outputs)
+
+
+def stage_key(name: str) -> str | None:
+    """The key a stage was last run with, if any."""
+    return _read_manifest().get(name)
+
+
+def record_stage(name: str, key: str) -> None:
+    """Record the key a stage was last run with."""
+    STAGE_DIR.mkdir(parents=True, exist_ok=True)
+    manifest = _read_manifest()
+    manifest[name] = key
+    (STAGE_DIR / MANIFEST_FILE).write_text(json.dumps(manifest, indent=2))
+
+
+def forget_stage(*names: str) -> None:
+    """
+    Drop recorded keys for stages whose outputs were changed outside
+    their own builder, so the next run rebuilds them.
+    """
+    manifest = _read_manifest()
+    if not any(name in manifest for name in names):
+        return
+    for name in names:
+        manifest.pop(name, None)
+    (STAGE_DIR / MANIFEST_FILE).write_text(json.dumps(manifest, indent=2))
+
+
+def stage_frame_path(name: str) -> Path:
+    return STAGE_DIR / f"{name}.parquet"
+
+
+def save_stage_frame(name: str, df: pd.DataFrame) -> Path:
+    """Persist a stage's output frame for reuse by later runs."""
+    STAGE_DIR.mkdir(parents=True, exist_ok=True)
+    path = stage_frame_path(name)
+    df.to_parquet(path)
+    logger.info(f"Saved stage output: {path}")
+    return path
+
+
+def load_stage_frame(name: str) -> pd.DataFrame:
+    path = stage_frame_path(name)
+    logger.info(f"Stage {name} unchanged - loading output from {path}")
+    return pd.read_parquet(path)
@@ -0,0 +1,477 @@
+import json
+import os
+import shutil
+import threading
+from pathlib import Path
+import pandas as pd
+from src.utils.hashing import file_digest, file_sha256
+from src.utils.logging_utils import setup_logger
+
+logger = setup_logger("table_io", "load.log")
+
+# Table names stay "products.csv" etc. - the format only swaps the suffix
+TABLE_SUFFIXES = {"csv": ".csv", "parquet": ".parquet", "feather": ".arrow"}
+DEFAULT_FORMAT = "csv"
+
+# per-directory record of written tables, see read_manifest
+MANIFEST_FILE = "manifest.json"
+# tables can be written from several threads (save_tables)
+_manifest_lock = threading.Lock()
+# path -> (running sha256, (size, mtime_ns)) of CSVs being appended to
+_append_digests = {}
+
+# output settings for the current run, set by run_etl.run
+_output = {"format": DEFAULT_FORMAT, "compression": None, "partitions": {}}
+
+# file name of each partition of a partitioned table
+PARTITION_FILE = "part-0.parquet"
+
+
+def set_output_format(
+    output_format: str = DEFAULT_FORMAT,
+    compression: str | None = None,
+    partition_by: dict | None = None,
+) -> None:
+    """
+    Select the format tables and clean data are written in:
+        - csv
+        - parquet (compression: snappy, zstd, gzip, ...; default snappy)
+        - feather / Arrow IPC (compression: lz4, zstd; default uncompressed
+          so reads can be memory-mapped)
+    partition_by maps table names to a column to partition them by
+    (Parquet only), e.g. {"product_listings": "country_id"}: the table
+    becomes a Hive-style directory, product_listings/country_id=3/...
+    """
+    if output_format not in TABLE_SUFFIXES:
+        raise ValueError(f"Unknown output format: {output_format}")
+    if output_format == "csv" and compression is not None:
+        raise ValueError("CSV output does not support compression")
+    if partition_by and output_format != "parquet":
+        raise ValueError("Partitioned tables need parquet output")
+
+    _output["format"] = output_format
+    _output["compression"] = compression
+    _output["partitions"] = {
+        Path(name).stem: column
+        for name, column in (partition_by or {}).items()
+    }
+
+
+def output_format() -> str:
+    return _output["format"]
+
+
+def output_settings() -> str:
+    """Current settings as a string, for stage keys."""
+    partitions = sorted(_output["partitions"].items())
+    return f"{_output['format']}:{_output['compression']}:{partitions}"
+
+
+def table_path(
+    directory: Path, name: str, table_format: str | None = None
+) -> Path:
+    """
+    Path of a table in the given (default: current) format - the
+    dataset directory for a partitioned table
+    """
+    if table_format is None and Path(name).stem in _output["partitions"]:
+        return Path(directory) / Path(name).stem
+    suffix = TABLE_SUFFIXES[table_format or _output["format"]]
+    return Path(directory) / Path(name).with_suffix(suffix).name
+
+
+def _serialize(df: pd.DataFrame, path: Path) -> None:
+    compression = _output["compression"]
+
+    if _output["format"] == "csv":
+        df.to_csv(path, index=False)
+    elif _output["format"] == "parquet":
+        df.to_parquet(path, index=False, compression=compression or "snappy")
+    else:
+        df.reset_index(drop=True).to_feather(
+            path, compression=compression or "uncompressed"
+        )
+
+
+def partition_column(name: str) -> str | None:
+    """Column the table is partitioned by this run, if any."""
+    return _output["partitions"].get(Path(name).stem)
+
+
+def write_frame(
+    df: pd.DataFrame,
+    directory: Path,
+    name: str,
+    partitions: list | None = None,
+) -> Path:
+    """
+    Write df in the current output format; returns the path written:
+        - serialized to a temp file next to the target, then renamed
+          over it, so readers never see a half-written table
+        - if the new bytes hash the same as the existing file, the
+          existing file is kept untouched (same mtime - caches and file
+          watchers don't fire)
+        - the directory's manifest records the table's hash, row count
+          and schema either way
+        - the table's files in other formats (from runs with another
+          output format) are removed, so find_table can't pick a stale
+          one over a kept, older file
+    Partitioned tables write one file per partition the same way, so
+    only partitions whose rows changed are replaced. With partitions
+    (values of the partition column) df only holds those partitions:
+    the rest of the table is left alone.
+    """
+    column = partition_column(name)
+    if column is not None:
+        path = _write_partitioned(df, directory, name, column, partitions)
+    else:
+        path = table_path(directory, name)
+        _replace_if_changed(df, path, directory)
+
+    _remove_other_formats(directory, name, path)
+    return path
+
+
+def remove_table(directory: Path, name: str) -> None:
+    """
+    Remove a table in every format, and its manifest entries - for
+    tables a run no longer produces, so readers can't pick up stale ones
+    """
+    _remove_other_formats(directory, name, None)
+
+
+def _remove_other_formats(
+    directory: Path, name: str, current: Path | None
+) -> None:
+    # a table lives in one format at a time - drop files a run in
+    # another format left behind (all of them when current is None)
+    others = [
+        table_path(directory, name, table_format)
+        for table_format in TABLE_SUFFIXES
+    ]
+    dataset = Path(directory) / Path(name).stem
+    if any(dataset.glob(f"*/{PARTITION_FILE}")):
+        others.append(dataset)
+    stale = [path for path in others if path != current and path.exists()]
+    if not stale:
+        return
+
+    with _manifest_lock:
+        manifest = read_manifest(directory)
+        for path in stale:
+            key = path.relative_to(directory).as_posix()
+            if path.is_dir():
+                shutil.rmtree(path)
+                manifest = {
+                    entry: value
+                    for entry, value in manifest.items()
+                    if not entry.startswith(f"{key}/")
+                }
+            else:
+                path.unlink()
+                manifest.pop(key, None)
+            _append_digests.pop(path, None)
+            if current is None:
+                logger.info(f"Removed {key}")
+            else:
+                logger.info(f"Removed {key} - {name} is now {current.name}")
+        _write_manifest(directory, manifest)
+
+
+def _replace_if_changed(df: pd.DataFrame, path: Path, directory: Path) -> None:
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    key = path.relative_to(directory).as_posix()
+
+    try:
+        _serialize(df, tmp_path)
+        new_hash = file_sha256(tmp_path)
+    except Exception:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+    with _manifest_lock:
+        manifest = read_manifest(directory)
+        if new_hash == _current_hash(path, manifest.get(key)):
+            tmp_path.unlink()
+            logger.info(f"{key} unchanged - kept existing file")
+        else:
+            os.replace(tmp_path, path)
+            _append_digests.pop(path, None)
+        manifest[key] = _manifest_entry(path, new_hash, len(df), _schema(df))
+        _write_manifest(directory, manifest)
+
+
+def _write_partitioned(
+    df: pd.DataFrame,
+    directory: Path,
+    name: str,
+    column: str,
+    partitions: list | None = None,
+) -> Path:
+    """
+    One Parquet file per value of column under name/column=value/;
+    partitions that no longer have rows (of those df covers) are removed
+    """
+    if df[column].isna().any():
+        raise ValueError(f"Can't partition {name} by {column}: it has nulls")
+
+    root = table_path(directory, name)
+    root.mkdir(parents=True, exist_ok=True)
+
+    written = set()
+    for value, part in df.groupby(column, sort=True):
+        part_dir = root / _partition_name(column, value)
+        part_dir.mkdir(exist_ok=True)
+        # the value lives in the directory name, as Hive layouts do
+        _replace_if_changed(
+            part.drop(columns=column).reset_index(drop=True),
+            part_dir / PARTITION_FILE,
+            directory,
+        )
+        written.add(part_dir.name)
+
+    covered = (
+        [path.name for path in root.iterdir()]
+        if partitions is None
+        else [_partition_name(column, value) for value in partitions]
+    )
+    stale = [
+        root / part
+        for part in covered
+        if part not in written and (root / part).exists()
+    ]
+    with _manifest_lock:
+        manifest = read_manifest(directory)
+        for part_dir in stale:
+            shutil.rmtree(part_dir)
+            manifest.pop(f"{root.name}/{part_dir.name}/{PARTITION_FILE}", None)
+        _write_manifest(directory, manifest)
+
+    logger.info(f"{name}: wrote {len(written)} {column} partitions")
+
+    return root
+
+
+def _partition_name(column: str, value) -> str:
+    # ids that went through a float column still name as ints
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return f"{column}={value}"
+
+
+def append_frame(df: pd.DataFrame, directory: Path, name: str) -> Path:
+    """
+    Append rows to an existing CSV (no header), keeping its manifest
+    entry current. The file's running hash is kept between appends, so
+    streaming chunks doesn't rehash the whole file each time.
+    """
+    path = Path(directory) / name
+    data = df.to_csv(index=False, header=False).encode()
+
+    with _manifest_lock:
+        digest, version = _append_digests.get(path, (None, None))
+        if version != _file_version(path):
+            digest = file_digest(path)
+        with open(path, "ab") as f:
+            f.write(data)
+        digest.update(data)
+        _append_digests[path] = (digest, _file_version(path))
+
+        manifest = read_manifest(directory)
+        entry = manifest.get(path.name)
+        if entry is None:
+            # written outside write_frame - earlier rows weren't counted
+            rows, columns = None, _schema(df)
+        elif not entry["rows"]:
+            # started empty - the schema comes from the first rows
+            rows, columns = len(df), _schema(df)
+        else:
+            rows, columns = entry["rows"] + len(df), entry["columns"]
+        manifest[path.name] = _manifest_entry(
+            path, digest.hexdigest(), rows, columns
+        )
+        _write_manifest(directory, manifest)
+
+    return path
+
+
+def read_manifest(directory: Path) -> dict:
+    """
+    Manifest of the tables written to directory:
+    file path (relative to directory) -> sha256, rows, columns
+    (name -> dtype), size, mtime_ns
+    (rows is None for a file appended to before it was ever recorded).
+    Consumers can compare hashes instead of reading tables.
+    """
+    path = Path(directory) / MANIFEST_FILE
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text())
+
+
+def _write_manifest(directory: Path, manifest: dict) -> None:
+    path = Path(directory) / MANIFEST_FILE
+    tmp_path = path.with_name(f".{MANIFEST_FILE}.tmp")
+    tmp_path.write_text(json.dumps(manifest, indent=2, sort_keys=True))
+    os.replace(tmp_path, path)
+
+
+def _schema(df: pd.DataFrame) -> dict:
+    return {str(col): str(dtype) for col, dtype in df.dtypes.items()}
+
+
+def _manifest_entry(
+    path: Path, sha256: str, rows: int | None, columns: dict
+) -> dict:
+    stat = path.stat()
+    return {
+        "sha256": sha256,
+        "rows": rows,
+        "columns": columns,
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+    }
+
+
+def _file_version(path: Path) -> tuple:
+    stat = path.stat()
+    return stat.st_size, stat.st_mtime_ns
+
+
+def _current_hash(path: Path, entry: dict | None) -> str | None:
+    # trust the manifest while the file is the one it describes
+    if not path.exists():
+        return None
+    if entry and (entry["size"], entry["mtime_ns"]) == _file_version(path):
+        return entry["sha256"]
+    return file_sha256(path)
+
+
+def find_table(directory: Path, name: str) -> Path | None:
+    """
+    Auto-detect a table's format: the most recently written of
+    name.arrow / name.parquet / name.csv / a partitioned name/
+    directory, or None if none exist.
+    """
+    candidates = [
+        path
+        for table_format in TABLE_SUFFIXES
+        if (path := table_path(directory, name, table_format)).exists()
+    ]
+    dataset = Path(directory) / Path(name).stem
+    if dataset.is_dir():
+        candidates.append(dataset)
+    if not candidates:
+        return None
+    return max(candidates, key=_written_at)
+
+
+def _written_at(path: Path) -> int:
+    # a dataset was written when its newest partition was
+    if path.is_dir():
+        return max(
+            (
+                part.stat().st_mtime_ns
+                for part in path.glob(f"*/{PARTITION_FILE}")
+            ),
+            default=0,
+        )
+    return path.stat().st_mtime_ns
+
+
+def table_version(path: Path) -> tuple:
+    """
+    Cheap identity of a table's current content: path plus size and
+    mtime of its file (of every partition file for a dataset). Unchanged
+    tables keep their version across runs, as write_frame doesn't touch
+    them.
+    """
+    path = Path(path)
+    files = (
+        sorted(path.glob(f"*/{PARTITION_FILE}")) if path.is_dir() else [path]
+    )
+    return (str(path), *(_file_version(file) for file in files))
+
+
+def read_frame(
+    path: Path,
+    filters: list | None = None,
+    arrow_backed: bool = False,
+    **csv_kwargs,
+) -> pd.DataFrame:
+    """
+    Read a table by suffix. csv_kwargs only apply to CSV files.
+    filters are pyarrow-style (column, op, value) tuples ANDed together:
+        - a partitioned directory only reads the matching partitions
+        - a Parquet file skips row groups that can't match
+        - an Arrow file is filtered before conversion to pandas
+        - CSV files are filtered after reading
+    arrow_backed: an Arrow file comes back zero-copy (see read_arrow)
+    instead of copied into numpy columns.
+    """
+    path = Path(path)
+
+    if path.is_dir():
+        df = pd.read_parquet(path, filters=filters)
+        # partition values come back as categoricals - restore the ints
+        for col in df.select_dtypes("category"):
+            if df[col].cat.categories.dtype.kind in "iu":
+                df[col] = df[col].astype("int64")
+        return df
+    if path.suffix == ".parquet":
+        return pd.read_parquet(path, filters=filters)
+    if path.suffix == ".arrow":
+        return read_arrow(path, filters, zero_copy=arrow_backed)
+    return filter_frame(pd.read_csv(path, **csv_kwargs), filters)
+
+
+def read_arrow(
+    path: Path, filters: list | None = None, zero_copy: bool = True
+) -> pd.DataFrame:
+    """
+    Read an Arrow IPC file through a memory map.
+    zero_copy: columns are pd.ArrowDtype views of the mapped file - no
+    per-read copy, and the pages are shared page cache, so every reader
+    in the process (and other processes) uses the same memory. Needs an
+    uncompressed file (the feather default here) - compressed buffers
+    are decompressed into memory.
+    Otherwise the columns are copied into regular numpy dtypes.
+    Filtered rows are always new buffers.
+    """
+    from pyarrow import feather
+    from pyarrow.parquet import filters_to_expression
+
+    table = feather.read_table(path, memory_map=True)
+    if filters:
+        _check_filters(filters)
+        table = table.filter(filters_to_expression(filters))
+
+    if zero_copy:
+        return table.to_pandas(types_mapper=pd.ArrowDtype)
+    return table.to_pandas()
+
+
+FILTER_OPS = {
+    "=": lambda col, value: col == value,
+    "==": lambda col, value: col == value,
+    "!=": lambda col, value: col != value,
+    "in": lambda col, value: col.isin(value),
+    "not in": lambda col, value: ~col.isin(value),
+}
+
+
+def filter_frame(df: pd.DataFrame, filters: list | None) -> pd.DataFrame:
+    """Apply read_frame-style filters to a frame already in memory"""
+    if not filters:
+        return df
+    _check_filters(filters)
+    mask = pd.Series(True, index=df.index)
+    for column, op, value in filters:
+        mask &= FILTER_OPS[op](df[column], value)
+    return df[mask].reset_index(drop=True)
+
+
+def _check_filters(filters: list) -> None:
+    for _, op, _ in filters:
+        if op not in FILTER_OPS:
+            raise ValueError(f"Unsupported filter: {op}")
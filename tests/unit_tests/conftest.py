@@ -0,0 +1,72 @@
+import pandas as pd
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def key_registry_dir(tmp_path, monkeypatch):
+    """
+    Keep surrogate-key registries written by tests out of data/processed
+    """
+    monkeypatch.setattr("src.utils.key_registry.REGISTRY_DIR", tmp_path / "keys")
+    return tmp_path / "keys"
+
+
+@pytest.fixture
+def clean_df():
+    """
+    Factory for a small clean LEGO frame (two products, two countries) -
+    call it for a fresh copy
+    """
+
+    def make():
+        return pd.DataFrame(
+            {
+                "prod_id": [1, 2],
+                "set_name": ["set1", "set2"],
+                "theme_name": ["city", "technic"],
+                "piece_count": [100, 200],
+                "age_min": [6.0, 8.0],
+                "age_max": [12.0, 99.0],
+                "prod_desc": ["desc1", "desc2"],
+                "prod_long_desc": ["long1", "long2"],
+                "list_price": [9.99, 19.99],
+                "num_reviews": [1, 2],
+                "star_rating": [4.0, 5.0],
+                "val_star_rating": [4.0, 5.0],
+                "play_star_rating": [4.0, 5.0],
+                "review_difficulty": ["easy", "average"],
+                "country": ["US", "DE"],
+            }
+        )
+
+    return make
+
+
+@pytest.fixture
+def raw_lego_df():
+    """
+    Factory for a small raw LEGO export (three products, product 1 listed
+    in two countries) - pass the four play_star_rating values
+    """
+
+    def make(ratings):
+        return pd.DataFrame(
+            {
+                "ages": "6-12",
+                "list_price": [9.99, 12.99, 19.99, 29.99],
+                "num_reviews": 3.0,
+                "piece_count": [100.0, 100.0, 200.0, 300.0],
+                "play_star_rating": ratings,
+                "prod_desc": ["Fire truck", "Fire truck", "Police car", "Castle"],
+                "prod_id": [1.0, 1.0, 2.0, 3.0],
+                "prod_long_desc": "A set",
+                "review_difficulty": "Easy",
+                "set_name": ["Truck", "Truck DE", "Police", "Castle"],
+                "star_rating": 4.5,
+                "theme_name": ["City", "City", "City", "Castle"],
+                "val_star_rating": 4.0,
+                "country": ["US", "DE", "US", "US"],
+            }
+        )
+
+    return make
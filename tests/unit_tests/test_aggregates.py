@@ -0,0 +1,61 @@
+from unittest.mock import patch
+import pandas as pd
+
+from src.load.aggregates import build_aggregates
+from src.load.load import create_aggregate_tables, create_tables
+from src.load.star_schema import build_star_schema
+from src.load.write_tables import save_table
+
+
+def listed_twice(clean):
+    # product 1 listed in two countries with different ratings
+    df = pd.concat([clean, clean.iloc[[0]]], ignore_index=True)
+    df.loc[2, ["country", "star_rating", "num_reviews"]] = ["DE", 2.0, 3]
+    return df
+
+
+def test_product_stats_aggregate_across_countries(clean_df):
+    aggregates = build_aggregates(build_star_schema(listed_twice(clean_df())))
+    stats = aggregates["product_stats.csv"]
+
+    product = stats.set_index("prod_id").loc[1]
+    assert product["average_stars"] == 3.0
+    assert product["total_reviews"] == 4
+    assert product["set_name"] == "set1"
+    # star std dev 1.41, value / play ratings the same in both countries
+    assert round(product["consistency_score"], 3) == round(2**0.5 / 3, 3)
+
+
+def test_country_and_theme_aggregates(clean_df):
+    aggregates = build_aggregates(build_star_schema(listed_twice(clean_df())))
+
+    countries = aggregates["country_stats.csv"].set_index("country")
+    assert countries.loc["DE", "total_reviews"] == 5
+    assert countries.loc["DE", "products_reviewed"] == 2
+
+    themes = aggregates["theme_stats.csv"].set_index("theme_name")
+    assert themes.loc["city", "avg_star_rating"] == 3.0
+    assert themes.loc["city", "products_in_theme"] == 1
+
+    matrix = aggregates["theme_country_stats.csv"]
+    assert len(matrix) == 3
+    assert aggregates["overview_stats.csv"]["total_reviews"].iloc[0] == 6
+
+
+def test_create_aggregate_tables_skips_unchanged_sources(
+    tmp_path, monkeypatch, clean_df
+):
+    monkeypatch.setattr("src.utils.stage_cache.STAGE_DIR", tmp_path / "stages")
+    monkeypatch.setattr("src.load.write_tables.OUTPUT_DIR", tmp_path)
+    create_tables(listed_twice(clean_df()))
+
+    durations = create_aggregate_tables()
+
+    assert sorted(durations) == sorted(
+        build_aggregates(build_star_schema(listed_twice(clean_df())))
+    )
+    assert (tmp_path / "product_stats.csv").exists()
+
+    with patch("src.load.write_tables.save_table", wraps=save_table) as spy:
+        assert create_aggregate_tables() == {}
+    assert spy.call_count == 0
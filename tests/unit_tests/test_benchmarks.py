@@ -0,0 +1,20 @@
+import importlib
+
+import pytest
+
+
+@pytest.mark.parametrize(
+    "script, argv",
+    [("benchmark_incremental", ["200", "20"])],
+)
+def test_benchmark_script_runs(script, argv, monkeypatch, capsys):
+    """
+    Smoke test: a benchmark runs end to end on a tiny input, so a
+    signature change in the code it drives breaks it here
+    """
+    module = importlib.import_module(f"scripts.{script}")
+    monkeypatch.setattr("sys.argv", [script, *argv])
+
+    module.main()
+
+    assert capsys.readouterr().out
@@ -0,0 +1,82 @@
+import pytest
+import pandas as pd
+
+from src.transform.parallel import apply_cleaning_rules_parallel
+from src.transform.cleaning_rules import (
+    CLEANING_RULES,
+    apply_cleaning_rules,
+    clean_column,
+)
+
+
+def test_clean_column_numeric_fill_and_int():
+    """
+    Numeric rule should coerce, fill and cast in one pass.
+    """
+    cleaned, nulls = clean_column(
+        pd.Series(["3", None, "bad"]), {"numeric": True, "fill": 0, "dtype": "int"}
+    )
+
+    assert cleaned.tolist() == [3, 0, 0]
+    assert cleaned.dtype == "int64"
+    assert nulls == 2
+
+
+def test_clean_column_text_fill_and_lower():
+    """
+    Text rule should fill, stringify and lowercase.
+    """
+    cleaned, nulls = clean_column(
+        pd.Series(["ABC", None, 12]), {"fill": "Missing", "dtype": "str", "lower": True}
+    )
+
+    assert cleaned.tolist() == ["abc", "missing", "12"]
+    assert nulls == 1
+
+
+def test_apply_cleaning_rules_only_touches_ruled_columns():
+    """
+    Columns without a rule must pass through unchanged.
+    """
+    df = pd.DataFrame({"list_price": ["1.234"], "ages": ["6+"]})
+
+    result = apply_cleaning_rules(df)
+
+    assert result["list_price"].tolist() == [1.23]
+    assert result["ages"].tolist() == ["6+"]
+
+
+def test_cleaning_rules_cover_clean_validation_columns():
+    """
+    Every int/text column checked by clean validation has a rule.
+    """
+    from src.utils.clean_validation import NUMERIC_INT_COLS, TEXT_COLS
+
+    assert set(NUMERIC_INT_COLS + TEXT_COLS) <= set(CLEANING_RULES)
+
+
+def test_parallel_rules_match_serial():
+    """
+    Process-pool cleaning must give the same frame as the serial engine.
+    """
+    df = pd.DataFrame(
+        {
+            "list_price": [1.234, None, 3.0],
+            "num_reviews": [1.0, None, 3.0],
+            "prod_desc": ["a", None, 5],
+            "country": ["US", None, "DE"],
+        }
+    )
+
+    serial = apply_cleaning_rules(df.copy())
+    parallel = apply_cleaning_rules_parallel(df.copy(), workers=2)
+
+    pd.testing.assert_frame_equal(serial, parallel)
+
+
+def test_clean_column_int_without_fill_raises_on_nulls():
+    """
+    Int rules without a fill must refuse nulls rather than cast garbage.
+    """
+    with pytest.raises(pd.errors.IntCastingNaNError):
+        clean_column(pd.Series([1.0, None]), {"numeric": True, "dtype": "int"})
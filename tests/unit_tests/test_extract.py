@@ -1,12 +1,21 @@
+import os
+import sys
 import pandas as pd
 from pathlib import Path
 import pytest
 from unittest.mock import patch, MagicMock
 
 
-from src.extract.extract_lego import extract_lego_data
+from src.extract.extract_lego import (
+    default_engine,
+    extract_lego_data,
+    extract_lego_data_chunks,
+    resolve_chunk_rows,
+)
 from src.extract.kaggle_downloader import download_kaggle_csv, DATASET, RAW_DIR
 from src.extract.extract import extract_data, RAW_FILE
+from src.extract.raw_cache import load_raw_cache, save_raw_cache
+from src.utils.raw_validation import RAW_DTYPES
 
 
 # ===============
@@ -16,6 +25,7 @@ from src.extract.extract import extract_data, RAW_FILE
 def test_extract_lego_data_returns_dataframe(mock_read_csv):
     """
     Test: extract_lego_data() loads CSV and returns a DataFrame
+    (C engine - the pyarrow reader doesn't go through pd.read_csv)
     """
     # Arrange
     mock_df = pd.DataFrame({"col1": [1], "col2": [2]})
@@ -23,7 +33,7 @@ def test_extract_lego_data_returns_dataframe(mock_read_csv):
     file_path = Path("data/raw/fake.csv")
 
     # Act
-    df = extract_lego_data(file_path)
+    df = extract_lego_data(file_path, engine="c")
 
     # Assert
     assert isinstance(df, pd.DataFrame)
@@ -125,3 +135,178 @@ def test_extract_data_returns_dataframe(mock_extract_lego_data, mock_raw):
     # Assert
     assert isinstance(result, pd.DataFrame)
     assert result.equals(mock_df)
+
+
+# ===============
+# Streaming extraction
+# ===============
+def test_extract_lego_data_chunks_yields_bounded_chunks(tmp_path):
+    """
+    Test: streaming mode yields chunks no larger than chunksize
+    """
+    # Arrange
+    file_path = tmp_path / "lego.csv"
+    pd.DataFrame({"prod_id": range(10), "country": ["US"] * 10}).to_csv(
+        file_path, index=False
+    )
+
+    # Act
+    chunks = list(extract_lego_data_chunks(file_path, chunksize=4))
+
+    # Assert
+    assert [len(chunk) for chunk in chunks] == [4, 4, 2]
+    assert pd.concat(chunks)["prod_id"].tolist() == list(range(10))
+
+
+def test_resolve_chunk_rows_uses_byte_budget(tmp_path):
+    """
+    Test: a byte budget is converted to a positive row count
+    """
+    file_path = tmp_path / "lego.csv"
+    pd.DataFrame({"col1": range(100)}).to_csv(file_path, index=False)
+
+    small = resolve_chunk_rows(file_path, max_bytes=100)
+    large = resolve_chunk_rows(file_path, max_bytes=100_000)
+
+    assert 1 <= small < large
+
+
+@patch("src.extract.extract.RAW_FILE")
+@patch("src.extract.extract.extract_lego_data_chunks")
+def test_extract_data_streams_when_chunksize_given(mock_chunks, mock_raw):
+    """
+    Test: extract_data returns the chunk iterator in streaming mode
+    """
+    mock_raw.exists.return_value = True
+    mock_chunks.return_value = iter([pd.DataFrame({"col1": [1]})])
+
+    result = extract_data(chunksize=10)
+
+    mock_chunks.assert_called_once_with(mock_raw, 10, None)
+    assert len(list(result)) == 1
+
+
+def test_extract_lego_data_pins_dtypes_and_prunes_extras(tmp_path):
+    """
+    Test: typed reader applies the raw schema dtypes and drops extras
+    """
+    file_path = tmp_path / "lego.csv"
+    pd.DataFrame(
+        {"prod_id": [1, 2], "country": ["US", "DE"], "extra": ["a", "b"]}
+    ).to_csv(file_path, index=False)
+
+    df = extract_lego_data(file_path)
+
+    assert list(df.columns) == ["prod_id", "country"]
+    assert df["prod_id"].dtype == "float64"
+    assert isinstance(df["country"].dtype, pd.CategoricalDtype)
+
+
+def test_default_engine_falls_back_to_c_without_pyarrow(monkeypatch):
+    """
+    Test: pyarrow parses by default, pandas' C engine when it's missing
+    """
+    assert default_engine() == "pyarrow"
+
+    monkeypatch.setitem(sys.modules, "pyarrow", None)
+
+    assert default_engine() == "c"
+
+
+def test_engines_read_the_same_frame(tmp_path):
+    """
+    Test: the default pyarrow reader and the C engine read the same
+    frame, category order included
+    """
+    file_path = tmp_path / "lego.csv"
+    pd.DataFrame(
+        {
+            "prod_id": [1, 2, None],
+            "theme_name": ["technic", None, "city"],
+            "country": ["US", None, "DE"],
+            "extra": 1,
+        }
+    ).to_csv(file_path, index=False)
+
+    arrow = extract_lego_data(file_path)
+    c = extract_lego_data(file_path, engine="c")
+
+    pd.testing.assert_frame_equal(arrow, c)
+
+
+def test_extract_lego_data_falls_back_when_dtypes_rejected(tmp_path):
+    """
+    Test: values that don't fit the pinned schema fall back to inference,
+    still pruning columns outside the schema
+    """
+    file_path = tmp_path / "lego.csv"
+    pd.DataFrame({"prod_id": ["1", "not-a-number"], "extra": [1, 2]}).to_csv(
+        file_path, index=False
+    )
+
+    df = extract_lego_data(file_path)
+
+    assert df.columns.tolist() == ["prod_id"]
+    assert df["prod_id"].tolist() == ["1", "not-a-number"]
+
+
+# ===============
+# Raw_cache.py
+# ===============
+def _write_raw_csv(tmp_path, values):
+    csv_path = tmp_path / "lego_sets_raw.csv"
+    pd.DataFrame({"prod_id": values}).to_csv(csv_path, index=False)
+    return csv_path
+
+
+@pytest.mark.parametrize("cache_format", ["feather", "parquet"])
+def test_raw_cache_round_trip(tmp_path, cache_format):
+    """
+    Test: a saved cache is loaded back while the CSV is unchanged
+    """
+    csv_path = _write_raw_csv(tmp_path, [1, 2, 3])
+    df = pd.DataFrame({"prod_id": [1.0, 2.0, 3.0]})
+
+    save_raw_cache(df, csv_path, cache_format)
+    cached = load_raw_cache(csv_path, cache_format)
+
+    assert cached.equals(df)
+
+
+def test_raw_cache_ignored_when_csv_changes(tmp_path):
+    """
+    Test: the cache misses once the CSV content changes
+    """
+    csv_path = _write_raw_csv(tmp_path, [1, 2, 3])
+    save_raw_cache(pd.DataFrame({"prod_id": [1, 2, 3]}), csv_path)
+
+    _write_raw_csv(tmp_path, [4, 5, 6])
+
+    assert load_raw_cache(csv_path) is None
+
+
+def test_raw_cache_survives_touch_without_content_change(tmp_path):
+    """
+    Test: a new mtime with identical content still hits the cache
+    """
+    csv_path = _write_raw_csv(tmp_path, [1, 2, 3])
+    df = pd.DataFrame({"prod_id": [1, 2, 3]})
+    save_raw_cache(df, csv_path)
+
+    stat = csv_path.stat()
+    os.utime(csv_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    assert load_raw_cache(csv_path).equals(df)
+
+
+def test_raw_cache_ignored_when_schema_or_engine_changes(tmp_path, monkeypatch):
+    """
+    Test: a cache parsed with another raw schema or engine misses
+    """
+    csv_path = _write_raw_csv(tmp_path, [1, 2, 3])
+    save_raw_cache(pd.DataFrame({"prod_id": [1.0, 2.0, 3.0]}), csv_path)
+
+    assert load_raw_cache(csv_path, engine="pyarrow") is None
+
+    monkeypatch.setitem(RAW_DTYPES, "prod_id", "object")
+    assert load_raw_cache(csv_path) is None
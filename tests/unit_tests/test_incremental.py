@@ -0,0 +1,169 @@
+import pandas as pd
+import pytest
+
+from src import run_etl
+from src.load.load import create_tables, merge_tables
+from src.transform.incremental import row_state, changed_keys, merge_clean
+
+
+def raw_df(prices):
+    return pd.DataFrame(
+        {
+            "prod_id": [1.0, 1.0, 2.0],
+            "country": ["US", "DE", "US"],
+            "list_price": prices,
+        }
+    )
+
+
+def read_sorted(path):
+    df = pd.read_csv(path)
+    return df.sort_values(list(df.columns)).reset_index(drop=True)
+
+
+def test_changed_keys_finds_inserted_changed_and_deleted_rows():
+    """
+    Test: only keys whose row content changed, appeared or vanished
+    are returned, flagged by whether the previous run saw them
+    """
+    previous = row_state(raw_df([10.0, 20.0, 30.0]))
+    current = row_state(
+        pd.concat(
+            [
+                raw_df([10.0, 25.0, 30.0]).iloc[[0, 1]],
+                pd.DataFrame(
+                    {"prod_id": [3.0], "country": ["US"], "list_price": [5.0]}
+                ),
+            ]
+        )
+    )
+
+    keys = changed_keys(current, previous)
+
+    assert sorted(zip(keys["prod_id"], keys["country"])) == [
+        (1, "DE"),
+        (2, "US"),
+        (3, "US"),
+    ]
+    assert keys.set_index("prod_id")["new_key"].to_dict() == {
+        1: False,
+        2: False,
+        3: True,
+    }
+
+
+def test_changed_keys_finds_reordered_rows_of_a_key():
+    """
+    Test: swapping two rows that share a key changes which one dedup
+    keeps, so the key is rebuilt
+    """
+    raw = raw_df([10.0, 20.0, 30.0]).assign(country="US")
+
+    keys = changed_keys(row_state(raw.iloc[[1, 0, 2]]), row_state(raw))
+
+    assert list(zip(keys["prod_id"], keys["country"])) == [(1, "US")]
+
+
+def test_changed_keys_empty_when_raw_unchanged():
+    """
+    Test: an identical raw frame needs no rebuild
+    """
+    state = row_state(raw_df([10.0, 20.0, 30.0]))
+
+    assert changed_keys(state, state.copy()).empty
+
+
+def test_merge_clean_swaps_rebuilt_keys(clean_df):
+    """
+    Test: previous rows for rebuilt keys are replaced, the rest kept
+    """
+    previous = clean_df()
+    delta = clean_df().iloc[[1]].assign(list_price=29.99)
+    keys = pd.DataFrame({"prod_id": [2], "country": ["DE"]})
+
+    merged = merge_clean(previous, delta, keys, row_state(previous))
+
+    assert merged["prod_id"].tolist() == [1, 2]
+    assert merged["list_price"].tolist() == [9.99, 29.99]
+
+
+def test_merge_clean_keeps_raw_row_order(clean_df):
+    """
+    Test: a rebuilt key keeps its raw position instead of moving last
+    """
+    previous = clean_df()
+    delta = clean_df().iloc[[0]].assign(list_price=19.99)
+    keys = pd.DataFrame({"prod_id": [1], "country": ["US"]})
+
+    merged = merge_clean(previous, delta, keys, row_state(previous))
+
+    assert merged["prod_id"].tolist() == [1, 2]
+    assert merged["list_price"].tolist() == [19.99, 19.99]
+
+
+def test_merge_tables_matches_full_rebuild(tmp_path, monkeypatch, clean_df):
+    """
+    Test: merging changed and inserted keys gives the same table rows
+    as rebuilding from the merged clean frame
+    """
+    monkeypatch.setattr("src.utils.stage_cache.STAGE_DIR", tmp_path / "stages")
+    monkeypatch.setattr("src.load.write_tables.OUTPUT_DIR", tmp_path / "merged")
+    monkeypatch.setattr("src.load.load.OUTPUT_DIR", tmp_path / "merged")
+    create_tables(clean_df())
+
+    new_row = clean_df().iloc[[0]].assign(prod_id=3, set_name="set3")
+    merged_df = pd.concat(
+        [clean_df().assign(list_price=[9.99, 29.99]), new_row], ignore_index=True
+    )
+    keys = pd.DataFrame(
+        {
+            "prod_id": [2, 3],
+            "country": ["DE", "US"],
+            "new_key": [False, True],
+            "new_product": [False, True],
+        }
+    )
+    merge_tables(merged_df, keys)
+
+    monkeypatch.setattr("src.load.write_tables.OUTPUT_DIR", tmp_path / "full")
+    create_tables(merged_df)
+
+    for name in ["products.csv", "product_listings.csv", "product_descriptions.csv"]:
+        pd.testing.assert_frame_equal(
+            read_sorted(tmp_path / "merged" / name),
+            read_sorted(tmp_path / "full" / name),
+        )
+
+
+@pytest.mark.parametrize(
+    "edit",
+    [
+        # a product's first listing changes
+        lambda raw: raw.assign(play_star_rating=[3.5, 3.0, 4.0, 5.0]),
+        # a product's listings swap places - the first row now differs
+        lambda raw: raw.iloc[[1, 0, 2, 3]],
+    ],
+    ids=["changed", "reordered"],
+)
+def test_incremental_run_matches_full_run(tmp_path, monkeypatch, raw_lego_df, edit):
+    """
+    Test: an incremental run writes the same clean data and tables as a
+    full run, byte for byte - including first-row-per-product picks
+    """
+    monkeypatch.chdir(tmp_path)
+    raw_file = tmp_path / "data" / "raw" / "lego_sets_raw.csv"
+    raw_file.parent.mkdir(parents=True)
+
+    raw = raw_lego_df([4.0, 3.0, 4.0, 5.0])
+    raw.to_csv(raw_file, index=False)
+    run_etl.run(incremental_mode=True)
+    edit(raw).to_csv(raw_file, index=False)
+    run_etl.run(incremental_mode=True)
+
+    outputs = [tmp_path / "data" / "processed" / "lego_clean.csv"]
+    outputs += sorted((tmp_path / "data" / "output").glob("*.csv"))
+    incremental = [path.read_bytes() for path in outputs]
+
+    run_etl.run(force=True)
+
+    assert [path.read_bytes() for path in outputs] == incremental
@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+
+from src.load.star_schema import dimension_labels, themes_table
+from src.utils.key_registry import assign_ids, load_registry, registry_version
+
+
+def themes_df(themes):
+    return pd.DataFrame({"theme_name": themes, "country": "US"})
+
+
+def test_new_registry_numbers_labels_in_sorted_order():
+    """
+    Test: first run ids match the old sort-and-number ids
+    """
+    ids = assign_ids("themes", ["technic", "city", "duplo"])
+
+    assert ids.tolist() == [3, 1, 2]
+
+
+def test_registry_ids_are_stable_and_append_only():
+    """
+    Test: known labels keep their ids, new labels get the next ids
+    even when they sort first
+    """
+    assign_ids("themes", ["city", "technic"])
+
+    ids = assign_ids("themes", ["technic", "architecture", "city"])
+
+    assert ids.tolist() == [2, 3, 1]
+    assert load_registry("themes") == {"city": 1, "technic": 2, "architecture": 3}
+
+
+def test_registry_null_labels_get_nan():
+    ids = assign_ids("countries", ["US", None])
+
+    assert ids[0] == 1
+    assert np.isnan(ids[1])
+
+
+def test_registry_version_changes_with_registry():
+    before = registry_version("themes")
+    assign_ids("themes", ["city"])
+
+    assert registry_version("themes") != before
+
+
+def test_themes_table_keeps_ids_when_theme_added():
+    """
+    Test: a new theme doesn't shift the ids of existing themes
+    """
+    themes_table(dimension_labels(themes_df(["city", "technic"])))
+
+    themes = themes_table(
+        dimension_labels(themes_df(["city", "architecture", "technic"]))
+    )
+
+    assert dict(zip(themes["theme_name"], themes["theme_id"])) == {
+        "city": 1,
+        "technic": 2,
+        "architecture": 3,
+    }
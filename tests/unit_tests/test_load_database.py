@@ -0,0 +1,228 @@
+import sqlite3
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.load import load_database as load_database_module
+from src.load.load_database import load_database, merge_database, schema_sql
+from src.load.star_schema import build_star_schema
+
+
+def query(database, sql):
+    with sqlite3.connect(database) as connection:
+        return connection.execute(sql).fetchall()
+
+
+def test_load_database_creates_keyed_star_schema(tmp_path, clean_df):
+    """
+    Test: all six tables load with primary keys, foreign keys and indexes
+    """
+    database = tmp_path / "lego.db"
+
+    counts = load_database(build_star_schema(clean_df()), database)
+
+    assert counts == {
+        "themes": 2,
+        "countries": 2,
+        "reviews": 6,
+        "products": 2,
+        "product_listings": 2,
+        "product_descriptions": 2,
+    }
+    primary_key = [
+        row[1]
+        for row in query(database, "PRAGMA table_info(product_listings)")
+        if row[5]
+    ]
+    assert primary_key == ["prod_id", "country_id"]
+    assert {row[2] for row in query(database, "PRAGMA foreign_key_list(products)")} == {
+        "themes"
+    }
+    assert "idx_product_listings_country_id" in {
+        row[1] for row in query(database, "PRAGMA index_list(product_listings)")
+    }
+    assert query(database, "PRAGMA foreign_key_check") == []
+
+
+def test_load_database_round_trips_values_and_nulls(tmp_path, clean_df):
+    """
+    Test: missing ratings load as NULL, ids load as integers
+    """
+    database = tmp_path / "lego.db"
+    df = clean_df()
+    df["star_rating"] = [np.nan, 5.0]
+
+    load_database(build_star_schema(df), database)
+
+    assert query(
+        database,
+        "SELECT prod_id, star_rating, country_id FROM product_listings "
+        "ORDER BY prod_id",
+    ) == [(1, None, 2), (2, 5.0, 1)]
+
+
+def test_load_database_replaces_previous_load(tmp_path, clean_df):
+    database = tmp_path / "lego.db"
+    load_database(build_star_schema(clean_df()), database)
+
+    load_database(build_star_schema(clean_df().head(1)), database)
+
+    assert query(database, "SELECT COUNT(*) FROM products") == [(1,)]
+
+
+def test_failed_load_keeps_previous_contents(tmp_path, clean_df):
+    """
+    Test: a load that breaks a key constraint rolls back in full
+    """
+    database = tmp_path / "lego.db"
+    load_database(build_star_schema(clean_df()), database)
+
+    tables = build_star_schema(clean_df())
+    tables["product_listings.csv"]["prod_id"] = 99
+
+    with pytest.raises(sqlite3.IntegrityError):
+        load_database(tables, database)
+
+    assert query(database, "SELECT COUNT(*) FROM product_listings") == [(2,)]
+
+
+def test_postgres_ddl_uses_postgres_types():
+    ddl = "\n".join(schema_sql("postgres"))
+
+    assert "prod_id BIGINT" in ddl
+    assert "list_price DOUBLE PRECISION" in ddl
+    assert "FOREIGN KEY (theme_id) REFERENCES themes (theme_id)" in ddl
+
+
+def test_merge_database_counts_and_matches_full_load(tmp_path, clean_df):
+    """
+    Test: merge reports inserted / updated / unchanged / deleted rows and
+    leaves the same contents as a fresh load
+    """
+    database = tmp_path / "lego.db"
+    load_database(build_star_schema(clean_df()), database)
+
+    df = clean_df()
+    df.loc[0, "list_price"] = 12.99
+    df.loc[1, ["prod_id", "set_name"]] = [3, "set3"]
+    counts = merge_database(build_star_schema(df), database)
+
+    assert counts["product_listings"] == {
+        "inserted": 1,
+        "updated": 1,
+        "unchanged": 0,
+        "deleted": 1,
+    }
+    assert counts["themes"] == {
+        "inserted": 0,
+        "updated": 0,
+        "unchanged": 2,
+        "deleted": 0,
+    }
+
+    fresh = tmp_path / "fresh.db"
+    load_database(build_star_schema(df), fresh)
+    for table in ["products", "product_listings", "product_descriptions"]:
+        sql = f"SELECT * FROM {table} ORDER BY prod_id"
+        assert query(database, sql) == query(fresh, sql)
+
+
+def test_merge_database_deletes_a_vanished_theme(tmp_path, clean_df, monkeypatch):
+    """
+    Test: a product moving to a new theme deletes its old, now unused
+    theme - with foreign keys enforced per statement, as on Postgres
+    """
+    monkeypatch.setattr(
+        "src.load.load_database.SQLITE_PRAGMAS", ["PRAGMA foreign_keys = ON"]
+    )
+    database = tmp_path / "lego.db"
+    load_database(build_star_schema(clean_df()), database)
+
+    df = clean_df()
+    df.loc[1, "theme_name"] = "space"
+    counts = merge_database(build_star_schema(df), database)
+
+    assert counts["themes"] == {
+        "inserted": 1,
+        "updated": 0,
+        "unchanged": 1,
+        "deleted": 1,
+    }
+    assert query(database, "SELECT theme_name FROM themes ORDER BY theme_id") == [
+        ("city",),
+        ("space",),
+    ]
+    assert query(database, "SELECT theme_id FROM products WHERE prod_id = 2") == [(3,)]
+
+
+def test_only_full_loads_trade_durability(tmp_path, clean_df, monkeypatch):
+    """
+    Test: load_database connects with the no-journal / no-sync bulk
+    pragmas, merge_database (which updates in place) with the defaults
+    """
+    database = tmp_path / "lego.db"
+    settings = []
+    connect = load_database_module.connect
+
+    def spy(database, bulk_load=False):
+        connection = connect(database, bulk_load)
+        settings.append(
+            (
+                connection.execute("PRAGMA journal_mode").fetchone()[0],
+                connection.execute("PRAGMA synchronous").fetchone()[0],
+            )
+        )
+        return connection
+
+    monkeypatch.setattr(load_database_module, "connect", spy)
+
+    load_database(build_star_schema(clean_df()), database)
+    assert settings == [("memory", 0)]
+
+    settings.clear()
+    merge_database(build_star_schema(clean_df()), database)
+    # schema check, then the merge itself - delete journal, FULL sync
+    assert settings == [("delete", 2), ("delete", 2)]
+
+
+def test_merge_database_without_schema_loads_in_full(tmp_path, clean_df):
+    database = tmp_path / "lego.db"
+
+    counts = merge_database(build_star_schema(clean_df()), database)
+
+    assert counts["products"]["inserted"] == 2
+    assert query(database, "SELECT COUNT(*) FROM products") == [(2,)]
+
+
+def test_scoped_merge_only_touches_scope_keys(tmp_path, clean_df):
+    """
+    Test: with a scope, keys outside it are neither updated nor deleted,
+    scope keys without a row are deleted
+    """
+    database = tmp_path / "lego.db"
+    load_database(build_star_schema(clean_df()), database)
+
+    df = clean_df()
+    df["list_price"] = [12.99, 29.99]
+    tables = build_star_schema(df)
+    scope = {"product_listings": pd.DataFrame({"prod_id": [1, 7], "country_id": 2})}
+
+    counts = merge_database(tables, database, scope)
+
+    assert counts["product_listings"] == {
+        "inserted": 0,
+        "updated": 1,
+        "unchanged": 1,
+        "deleted": 0,
+    }
+    assert query(
+        database, "SELECT prod_id, list_price FROM product_listings ORDER BY prod_id"
+    ) == [(1, 12.99), (2, 19.99)]
+
+    scope = {"product_listings": pd.DataFrame({"prod_id": [2], "country_id": [1]})}
+    tables["product_listings.csv"] = tables["product_listings.csv"].head(1)
+
+    counts = merge_database(tables, database, scope)
+
+    assert counts["product_listings"]["deleted"] == 1
+    assert query(database, "SELECT prod_id FROM product_listings") == [(1,)]
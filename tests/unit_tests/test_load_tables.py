@@ -1,9 +1,22 @@
 import pandas as pd
+import pytest
 
-from src.load.write_tables import write_table
+from src.load.write_tables import write_table, start_table, append_table
+from src.load.load_clean import save_clean_chunks
+from src.load.load import create_tables, create_tables_from_file
+from src.load.star_schema import build_star_schema, dimension_ids
+from src.utils.table_io import read_manifest
 
 
-def test_write_table_selects_columns():
+@pytest.fixture
+def output_dir(tmp_path, monkeypatch):
+    # write_table also writes the directory's manifest - keep both out of
+    # data/output
+    monkeypatch.setattr("src.load.write_tables.OUTPUT_DIR", tmp_path)
+    return tmp_path
+
+
+def test_write_table_selects_columns(output_dir):
     df = pd.DataFrame({"a": [1], "b": [2], "c": [3]})
 
     result = write_table(
@@ -17,7 +30,7 @@ def test_write_table_selects_columns():
     assert list(result.columns) == ["a", "c"]
 
 
-def test_write_table_duplicates():
+def test_write_table_duplicates(output_dir):
 
     df = pd.DataFrame({"a": [1, 1, 2], "b": ["x", "x", "y"]})
 
@@ -32,7 +45,7 @@ def test_write_table_duplicates():
     assert len(result) == 2
 
 
-def test_write_table_add_surrogate():
+def test_write_table_add_surrogate(output_dir):
     df = pd.DataFrame({"a": ["a", "b", "c"]})
 
     result = write_table(
@@ -44,3 +57,127 @@ def test_write_table_add_surrogate():
     )
 
     assert list(result["id"]) == [1, 2, 3]
+
+
+def test_append_table_skips_keys_seen_in_earlier_chunks(tmp_path, monkeypatch):
+    monkeypatch.setattr("src.load.write_tables.OUTPUT_DIR", tmp_path)
+    seen_keys = set()
+
+    start_table(["a", "b"], "test.csv")
+    append_table(
+        pd.DataFrame({"a": [1, 2], "b": ["x", "y"]}),
+        ["a", "b"],
+        "test.csv",
+        "a",
+        seen_keys,
+    )
+    second = append_table(
+        pd.DataFrame({"a": [2, 3], "b": ["y", "z"]}),
+        ["a", "b"],
+        "test.csv",
+        "a",
+        seen_keys,
+    )
+
+    written = pd.read_csv(tmp_path / "test.csv")
+
+    assert second["a"].tolist() == [3]
+    assert written["a"].tolist() == [1, 2, 3]
+
+
+def test_dimension_ids_from_category_codes():
+    df = pd.DataFrame({"country": pd.Categorical(["US", "DE", "US", "FR"])})
+    countries_df = pd.DataFrame(
+        {"country": ["DE", "FR", "US"], "country_id": [1, 2, 3]}
+    )
+
+    ids = dimension_ids(df, countries_df, "country", "country_id")
+
+    assert ids.tolist() == [3, 1, 3, 2]
+
+
+def test_dimension_ids_missing_values_are_nan():
+    df = pd.DataFrame({"review_difficulty": ["easy", "unknown"]})
+    reviews_df = pd.DataFrame(
+        {"review_difficulty": ["easy"], "review_difficulty_id": [3]}
+    )
+
+    ids = dimension_ids(df, reviews_df, "review_difficulty", "review_difficulty_id")
+
+    assert ids[0] == 3
+    assert pd.isna(ids[1])
+
+
+def test_streamed_tables_match_create_tables(tmp_path, monkeypatch, clean_df):
+    """
+    Test: building from a clean csv in chunks (streaming mode) writes
+    the same tables as create_tables, including first-row-per-product
+    picks across chunks and registry ids for labels first seen late
+    """
+    df = pd.concat(
+        [
+            clean_df(),
+            clean_df().iloc[[0]].assign(country="AT", set_name="other"),
+            clean_df().iloc[[1]].assign(prod_id=3, theme_name="architecture"),
+        ],
+        ignore_index=True,
+    )
+    clean_path = tmp_path / "clean.csv"
+    df.to_csv(clean_path, index=False)
+
+    for mode in ["full", "streamed"]:
+        # fresh registry each time, as for a first run
+        monkeypatch.setattr(
+            "src.utils.key_registry.REGISTRY_DIR", tmp_path / mode / "keys"
+        )
+        monkeypatch.setattr("src.load.write_tables.OUTPUT_DIR", tmp_path / mode)
+        if mode == "full":
+            create_tables(pd.read_csv(clean_path))
+        else:
+            create_tables_from_file(clean_path, chunksize=2)
+
+    for path in (tmp_path / "full").glob("*.csv"):
+        assert path.read_bytes() == (tmp_path / "streamed" / path.name).read_bytes()
+
+
+def test_create_tables_with_workers_matches_serial(tmp_path, monkeypatch, clean_df):
+    """
+    Test: writing tables on a thread pool gives the same files and
+    reports a duration for every table
+    """
+    for workers in [None, 3]:
+        output_dir = tmp_path / str(workers)
+        monkeypatch.setattr("src.load.write_tables.OUTPUT_DIR", output_dir)
+        durations = create_tables(clean_df(), workers=workers)
+
+        assert sorted(durations) == sorted(build_star_schema(clean_df()))
+        assert all(seconds >= 0 for seconds in durations.values())
+
+    for path in (tmp_path / "None").glob("*.csv"):
+        assert path.read_bytes() == (tmp_path / "3" / path.name).read_bytes()
+
+
+def test_save_clean_chunks_writes_header_once_and_records_rows(tmp_path, monkeypatch):
+    """
+    Test: streamed clean chunks make one csv with a single header, and
+    the manifest counts every chunk's rows
+    """
+    monkeypatch.setattr("src.load.load_clean.PROCESSED_DIR", tmp_path)
+    chunks = [pd.DataFrame({"a": [1, 2]}), pd.DataFrame({"a": [3]})]
+
+    path = save_clean_chunks(iter(chunks), "clean.csv")
+
+    assert path.read_text() == "a\n1\n2\n3\n"
+    assert read_manifest(tmp_path)["clean.csv"]["rows"] == 3
+
+
+def test_save_clean_chunks_raises_without_chunks(tmp_path, monkeypatch):
+    """
+    Test: no chunks means no clean columns - nothing is written
+    """
+    monkeypatch.setattr("src.load.load_clean.PROCESSED_DIR", tmp_path)
+
+    with pytest.raises(ValueError):
+        save_clean_chunks(iter([]), "clean.csv")
+
+    assert not (tmp_path / "clean.csv").exists()
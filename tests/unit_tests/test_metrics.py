@@ -0,0 +1,80 @@
+import json
+import pandas as pd
+import pytest
+
+from src.utils import metrics
+from src.transform.cleaning_rules import apply_cleaning_rules
+
+
+@pytest.fixture(autouse=True)
+def report_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(metrics, "REPORT_DIR", tmp_path)
+    metrics.reset_metrics()
+    yield tmp_path
+
+
+def test_timer_sums_calls_and_totals():
+    for rows in [3, 4]:
+        with metrics.timer("stage", rows_in=rows) as totals:
+            totals["bytes"] = 10
+
+    stage = metrics.run_report()["stages"]["stage"]
+    assert (stage["calls"], stage["rows_in"], stage["bytes"]) == (2, 7, 20)
+    assert stage["seconds"] >= 0
+
+
+def test_timer_records_failed_calls():
+    with pytest.raises(ValueError):
+        with metrics.timer("stage"):
+            raise ValueError("boom")
+
+    assert metrics.run_report()["stages"]["stage"]["calls"] == 1
+
+
+def test_timed_counts_rows_in_and_out():
+    @metrics.timed()
+    def drop_first(df):
+        return df.iloc[1:]
+
+    drop_first(pd.DataFrame({"a": [1, 2, 3]}))
+
+    stage = metrics.run_report()["stages"]["drop_first"]
+    assert (stage["rows_in"], stage["rows_out"]) == (3, 2)
+
+
+def test_cleaning_reports_a_stage_per_column():
+    df = pd.DataFrame({"list_price": ["1.5", None], "num_reviews": [None, 2]})
+
+    apply_cleaning_rules(df)
+
+    stages = metrics.run_report()["stages"]
+    assert stages["clean_list_price"]["rows_in"] == 2
+    assert stages["clean_num_reviews"]["nulls"] == 1
+
+
+def test_counters_and_gauges():
+    metrics.count("chunks")
+    metrics.count("chunks", 2)
+    metrics.gauge("workers", 4)
+
+    report = metrics.run_report()
+    assert report["counters"] == {"chunks": 3}
+    assert report["gauges"]["workers"] == 4
+    assert report["gauges"]["peak_rss_bytes"] > 0
+
+
+def test_run_metrics_writes_json_report(report_dir):
+    """
+    Test: a run writes its report even when it fails, with its status
+    """
+    with pytest.raises(RuntimeError):
+        with metrics.run_metrics(workers=2):
+            with metrics.timer("extract_data", rows_out=5):
+                pass
+            raise RuntimeError("boom")
+
+    (path,) = report_dir.glob("run_*.json")
+    report = json.loads(path.read_text())
+    assert report["status"] == "failed"
+    assert report["options"] == {"workers": 2}
+    assert report["stages"]["extract_data"]["rows_out"] == 5
@@ -0,0 +1,73 @@
+import pandas as pd
+import pytest
+
+from src.data_access.query_engine import clear_query_cache, query, run_query
+from src.load.star_schema import build_star_schema
+from src.utils.table_io import set_output_format, write_frame
+
+
+@pytest.fixture
+def output_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr("src.data_access.app_data_loader.OUTPUT_DIR", tmp_path)
+    clear_query_cache()
+    yield tmp_path
+    clear_query_cache()
+    set_output_format("csv")
+
+
+def write_tables(output_dir, df):
+    for name, table in build_star_schema(df).items():
+        write_frame(table, output_dir, name)
+
+
+@pytest.mark.parametrize(
+    "output_format, partition_by",
+    [
+        ("csv", None),
+        ("parquet", {"product_listings": "country_id"}),
+        ("feather", None),
+    ],
+)
+def test_run_query_reads_every_output_format(
+    output_dir, output_format, partition_by, clean_df
+):
+    set_output_format(output_format, partition_by=partition_by)
+    write_tables(output_dir, clean_df())
+
+    top = run_query("top_products")
+
+    assert top["theme_name"].tolist() == ["technic", "city"]
+    assert top["total_reviews"].tolist() == [2, 1]
+    listings = query(
+        "SELECT c.country, l.list_price FROM product_listings l "
+        "JOIN countries c USING (country_id) WHERE l.prod_id = $prod_id",
+        {"prod_id": 2},
+    )
+    assert listings.values.tolist() == [["DE", 19.99]]
+
+
+def test_top_products_binds_parameters(output_dir, clean_df):
+    set_output_format("csv")
+    write_tables(output_dir, clean_df())
+
+    assert run_query("top_products")["prod_id"].tolist() == [2, 1]
+    assert run_query("top_products", limit=1)["prod_id"].tolist() == [2]
+    assert run_query("top_products", theme_name="city")["prod_id"].tolist() == [1]
+    with pytest.raises(ValueError):
+        run_query("top_products", order_by="1; DROP TABLE products")
+
+
+def test_query_results_cached_until_tables_rewritten(output_dir, clean_df):
+    set_output_format("csv")
+    write_tables(output_dir, clean_df())
+    sql = "SELECT SUM(num_reviews) AS total FROM product_listings"
+
+    first = query(sql)
+    assert query(sql) is first
+
+    df = clean_df()
+    df["num_reviews"] = [10, 20]
+    write_tables(output_dir, df)
+
+    assert query(sql)["total"].iloc[0] == 30
+    pd.testing.assert_frame_equal(query(sql), query(sql))
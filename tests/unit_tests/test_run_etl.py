@@ -0,0 +1,52 @@
+from src import run_etl
+from src.load.aggregates import AGGREGATE_TABLES
+from src.load.load import TEXT_INDEX_TABLES
+from src.utils.table_io import read_manifest
+from src.utils.stage_cache import record_stage, stage_is_current
+
+
+def test_transform_key_tracks_cleaning_rules(tmp_path, monkeypatch):
+    """
+    Test: changing a cleaning rule invalidates the cached transform stage
+    """
+    monkeypatch.setattr("src.utils.stage_cache.STAGE_DIR", tmp_path / "stages")
+    raw_file = tmp_path / "raw.csv"
+    raw_file.write_text("prod_id\n1\n")
+    monkeypatch.setattr(run_etl, "locate_raw_file", lambda: raw_file)
+
+    output = tmp_path / "transform.pkl"
+    output.write_text("cached")
+    key, _ = run_etl._transform_keys()
+    record_stage("transform", key)
+    assert stage_is_current("transform", run_etl._transform_keys()[0], [output])
+
+    monkeypatch.setitem(
+        run_etl.cleaning_rules.CLEANING_RULES,
+        "list_price",
+        {"numeric": True, "dtype": "float", "round": 1},
+    )
+
+    assert not stage_is_current("transform", run_etl._transform_keys()[0], [output])
+
+
+def test_streaming_run_removes_derived_tables(tmp_path, monkeypatch, raw_lego_df):
+    """
+    Test: streaming doesn't build the aggregate / text index tables (they
+    need whole tables in memory) and removes a full run's, which would
+    otherwise describe old data
+    """
+    monkeypatch.chdir(tmp_path)
+    raw_file = tmp_path / "data" / "raw" / "lego_sets_raw.csv"
+    raw_file.parent.mkdir(parents=True)
+    raw_lego_df([4.0, 3.0, 4.0, 5.0]).to_csv(raw_file, index=False)
+    output = tmp_path / "data" / "output"
+    derived = [*AGGREGATE_TABLES, *TEXT_INDEX_TABLES]
+
+    run_etl.run()
+    assert all((output / name).exists() for name in derived)
+
+    run_etl.run(chunksize=2)
+
+    assert not any((output / name).exists() for name in derived)
+    assert not set(derived) & set(read_manifest(output))
+    assert (output / "product_listings.csv").exists()
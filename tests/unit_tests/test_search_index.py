@@ -0,0 +1,76 @@
+import pandas as pd
+
+from src.data_access import table_cache
+from src.data_access.search_index import (
+    build_search_index,
+    get_search_index,
+    product_card,
+    search_products,
+)
+from src.load.star_schema import build_star_schema
+from src.utils.table_io import set_output_format, write_frame
+
+
+def searchable_df(clean):
+    df = pd.concat([clean] * 2, ignore_index=True)
+    df["prod_id"] = [1, 2, 3, 4]
+    df["set_name"] = ["Fire Station", "Police Car", "Firefighter", "Space Ship"]
+    df["prod_desc"] = ["red truck", "blue car", "fire hose", "rocket with fire"]
+    return df
+
+
+def test_search_products_ranks_prefixes_first(clean_df):
+    """
+    Test: set_name prefix matches come first, then names / descriptions
+    containing the query, case-insensitive
+    """
+    index = build_search_index(build_star_schema(searchable_df(clean_df())))
+
+    assert search_products(index, "FIRE") == [1, 3, 4]
+    assert search_products(index, "fire", limit=2) == [1, 3]
+    assert search_products(index, "ruck") == [1]
+    assert search_products(index, "po") == [2]
+    assert search_products(index, "zebra") == []
+    assert search_products(index, "") == []
+
+
+def test_search_index_matches_substring_scan(clean_df):
+    df = searchable_df(clean_df())
+    index = build_search_index(build_star_schema(df))
+    text = (df["set_name"] + " " + df["prod_desc"]).str.lower()
+
+    for query in ["ire", "car", "ship", "ed tr", "with fire"]:
+        expected = set(df.loc[text.str.contains(query, regex=False), "prod_id"])
+        assert set(search_products(index, query)) == expected
+
+
+def test_product_card_looks_up_by_position(clean_df):
+    df = searchable_df(clean_df())
+    df.loc[4] = df.loc[0].copy()
+    df.loc[4, "country"] = "DE"
+    index = build_search_index(build_star_schema(df))
+
+    card = product_card(index, 1)
+
+    assert card["set_name"] == "Fire Station"
+    assert card["theme_name"] == "city"
+    assert card["prod_long_desc"] == "long1"
+    assert sorted(card["listings"]["country_id"]) == [1, 2]
+
+
+def test_get_search_index_rebuilds_on_new_data(tmp_path, monkeypatch, clean_df):
+    monkeypatch.setattr("src.data_access.app_data_loader.OUTPUT_DIR", tmp_path)
+    set_output_format("csv")
+    table_cache.clear_cache()
+    for name, table in build_star_schema(searchable_df(clean_df())).items():
+        write_frame(table, tmp_path, name)
+
+    index = get_search_index()
+    assert get_search_index() is index
+
+    df = searchable_df(clean_df())
+    df.loc[0, "set_name"] = "Fire Station Deluxe Edition"
+    write_frame(build_star_schema(df)["products.csv"], tmp_path, "products.csv")
+
+    assert search_products(get_search_index(), "deluxe") == [1]
+    table_cache.clear_cache()
@@ -0,0 +1,78 @@
+import inspect
+from unittest.mock import patch
+
+from src.load import star_schema
+from src.load.load import create_tables
+from src.load.write_tables import save_table
+from src.utils.stage_cache import (
+    code_version,
+    fingerprint,
+    record_stage,
+    stage_is_current,
+)
+
+
+def test_fingerprint_changes_with_inputs():
+    """
+    Different inputs must give different stage keys.
+    """
+    assert fingerprint("a", "b") == fingerprint("a", "b")
+    assert fingerprint("a", "b") != fingerprint("ab")
+
+
+def test_code_version_tracks_source():
+    """
+    Editing a stage function must change its code version.
+    """
+
+    def stage_v1(df):
+        return df
+
+    def stage_v2(df):
+        return df.copy()
+
+    assert code_version(stage_v1) != code_version(stage_v2)
+
+
+def test_stage_is_current_requires_key_and_outputs(tmp_path, monkeypatch):
+    """
+    A stage is current only with a matching key and existing outputs.
+    """
+    monkeypatch.setattr("src.utils.stage_cache.STAGE_DIR", tmp_path)
+    output = tmp_path / "out.csv"
+
+    record_stage("stage", "key1")
+    assert not stage_is_current("stage", "key1", [output])
+
+    output.write_text("a\n1\n")
+    assert stage_is_current("stage", "key1", [output])
+    assert not stage_is_current("stage", "key2", [output])
+
+
+def test_create_tables_only_rebuilds_changed_tables(tmp_path, monkeypatch, clean_df):
+    """
+    Editing one table builder must only rebuild that table.
+    Fact tables take ids from the shared factorization, so a dimension
+    change doesn't cascade into product_listings.
+    """
+    monkeypatch.setattr("src.utils.stage_cache.STAGE_DIR", tmp_path / "stages")
+    monkeypatch.setattr("src.load.load.OUTPUT_DIR", tmp_path)
+    monkeypatch.setattr("src.load.write_tables.OUTPUT_DIR", tmp_path)
+
+    create_tables(clean_df(), source_key="source")
+
+    # pretend country_table was edited - its module's source changes too
+    getsource = inspect.getsource
+
+    def edited_source(obj):
+        source = getsource(obj)
+        if obj in (star_schema.country_table, star_schema):
+            source += "\n# edited"
+        return source
+
+    monkeypatch.setattr(inspect, "getsource", edited_source)
+    with patch("src.load.write_tables.save_table", wraps=save_table) as spy:
+        create_tables(clean_df(), source_key="source")
+
+    rebuilt = [call.args[1] for call in spy.call_args_list]
+    assert rebuilt == ["countries.csv"]
@@ -0,0 +1,143 @@
+import os
+import threading
+import pandas as pd
+import pytest
+
+from src.data_access import table_cache
+from src.data_access.app_cache_all_tables import get_tables
+from src.load.aggregates import build_aggregates
+from src.load.star_schema import build_star_schema
+from src.utils.table_io import set_output_format, write_frame
+
+
+@pytest.fixture(autouse=True)
+def output_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr("src.data_access.app_data_loader.OUTPUT_DIR", tmp_path)
+    set_output_format("csv")
+    table_cache.clear_cache()
+    yield tmp_path
+    table_cache.clear_cache()
+
+
+def test_get_table_loads_once_then_hits(output_dir):
+    write_frame(pd.DataFrame({"theme_id": [1, 2]}), output_dir, "themes.csv")
+
+    first = table_cache.get_table("themes.csv")
+    second = table_cache.get_table("themes.csv")
+
+    assert second is first
+    stats = table_cache.cache_stats()
+    assert (stats["hits"], stats["misses"], stats["cached"]) == (1, 1, 1)
+
+
+def test_get_table_reloads_rewritten_table(output_dir):
+    """
+    Test: a table rewritten by a new run evicts the cached frame
+    """
+    write_frame(pd.DataFrame({"theme_id": [1, 2]}), output_dir, "themes.csv")
+    table_cache.get_table("themes.csv")
+
+    write_frame(pd.DataFrame({"theme_id": [1, 2, 3]}), output_dir, "themes.csv")
+    # same size writes within the clock tick still differ by mtime
+    path = output_dir / "themes.csv"
+    os.utime(path, ns=(0, path.stat().st_mtime_ns + 1))
+
+    assert len(table_cache.get_table("themes.csv")) == 3
+    assert table_cache.cache_stats()["tables"]["themes.csv"]["evictions"] == 1
+
+
+def test_get_table_caches_filtered_loads_separately(output_dir):
+    df = pd.DataFrame({"prod_id": [1, 2, 3], "country_id": [1, 2, 1]})
+    write_frame(df, output_dir, "product_listings.csv")
+
+    filtered = table_cache.get_table(
+        "product_listings.csv", [("country_id", "in", [1])]
+    )
+
+    assert filtered["prod_id"].tolist() == [1, 3]
+    assert len(table_cache.get_table("product_listings.csv")) == 3
+    assert table_cache.cache_stats()["misses"] == 2
+
+
+def test_filtered_loads_are_capped(output_dir, monkeypatch):
+    """
+    Test: one entry per distinct filter, least recently used evicted
+    first; stats stay one row per table
+    """
+    monkeypatch.setattr(table_cache, "MAX_CACHED_TABLES", 2)
+    df = pd.DataFrame({"prod_id": [1, 2, 3], "country_id": [1, 2, 3]})
+    write_frame(df, output_dir, "product_listings.csv")
+
+    for country_id in [1, 2, 1, 3]:
+        table_cache.get_table(
+            "product_listings.csv", [("country_id", "in", [country_id])]
+        )
+
+    stats = table_cache.cache_stats()
+    assert (stats["cached"], stats["hits"], stats["evictions"]) == (2, 1, 1)
+    assert list(stats["tables"]) == ["product_listings.csv"]
+    # country 2 was least recently used
+    table_cache.get_table("product_listings.csv", [("country_id", "in", [1])])
+    assert table_cache.cache_stats()["hits"] == 2
+
+
+def test_slow_load_does_not_block_other_tables(output_dir, monkeypatch):
+    """
+    Test: while one table loads, cache hits on other tables still return
+    """
+    write_frame(pd.DataFrame({"theme_id": [1]}), output_dir, "themes.csv")
+    write_frame(pd.DataFrame({"prod_id": [1]}), output_dir, "products.csv")
+    table_cache.get_table("themes.csv")
+
+    loading, release = threading.Event(), threading.Event()
+    load_table = table_cache.app_data_loader.load_table
+
+    def slow_load(table_name, filters=None):
+        if table_name == "products.csv":
+            loading.set()
+            release.wait(5)
+        return load_table(table_name, filters)
+
+    monkeypatch.setattr(table_cache.app_data_loader, "load_table", slow_load)
+    loader = threading.Thread(target=table_cache.get_table, args=["products.csv"])
+    loader.start()
+    loading.wait(5)
+
+    try:
+        hit = threading.Thread(target=table_cache.get_table, args=["themes.csv"])
+        hit.start()
+        hit.join(1)
+        assert not hit.is_alive()
+    finally:
+        release.set()
+        loader.join(5)
+    assert table_cache.cache_stats()["tables"]["products.csv"]["misses"] == 1
+
+
+def test_get_tables_only_loads_accessed_tables(output_dir):
+    write_frame(pd.DataFrame({"theme_id": [1]}), output_dir, "themes.csv")
+
+    tables = get_tables()
+
+    assert tables["themes"]["theme_id"].tolist() == [1]
+    assert list(table_cache.cache_stats()["tables"]) == ["themes.csv"]
+    assert "products" in tables
+
+
+def test_missing_aggregates_are_computed_from_star_tables(output_dir, clean_df):
+    """
+    Test: outputs written before aggregates were materialized still
+    serve the insights tables, refreshed when a source table changes
+    """
+    star = build_star_schema(clean_df())
+    for name, df in star.items():
+        write_frame(df, output_dir, name)
+
+    expected = build_aggregates(star)["theme_stats.csv"]
+    pd.testing.assert_frame_equal(get_tables()["theme_stats"], expected)
+
+    listings = star["product_listings.csv"].iloc[[0]]
+    write_frame(listings, output_dir, "product_listings.csv")
+
+    assert get_tables()["theme_stats"]["theme_name"].tolist() == ["city"]
+    assert table_cache.cache_stats()["tables"]["theme_stats.csv"]["evictions"] == 1
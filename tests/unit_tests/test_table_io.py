@@ -0,0 +1,242 @@
+import os
+import pandas as pd
+import pytest
+
+from src.data_access import app_data_loader
+from src.load.write_tables import append_table, write_table, start_table
+from src.utils.hashing import file_sha256
+from src.utils.table_io import (
+    find_table,
+    read_frame,
+    read_manifest,
+    set_output_format,
+    write_frame,
+)
+
+
+@pytest.fixture
+def output_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr("src.load.write_tables.OUTPUT_DIR", tmp_path)
+    monkeypatch.setattr(app_data_loader, "OUTPUT_DIR", tmp_path)
+    yield tmp_path
+    set_output_format()
+
+
+@pytest.mark.parametrize(
+    "output_format, compression, suffix",
+    [
+        ("csv", None, ".csv"),
+        ("parquet", "zstd", ".parquet"),
+        ("feather", None, ".arrow"),
+        ("feather", "lz4", ".arrow"),
+    ],
+)
+def test_write_table_round_trips_through_loader(
+    output_dir, output_format, compression, suffix
+):
+    """
+    Test: tables written in each format load back unchanged
+    """
+    set_output_format(output_format, compression)
+    df = pd.DataFrame({"a": ["x", "y"], "b": [1.5, 2.5]})
+
+    write_table(df, ["a", "b"], "test.csv", "a", add_surrogate_id="id")
+    loaded = app_data_loader.load_table("test.csv")
+
+    assert (output_dir / f"test{suffix}").exists()
+    assert loaded.to_dict("list") == {"a": ["x", "y"], "b": [1.5, 2.5], "id": [1, 2]}
+
+
+def test_find_table_prefers_newest_format(output_dir):
+    """
+    Test: with several formats on disk the latest write wins
+    """
+    pd.DataFrame({"a": [1]}).to_csv(output_dir / "test.csv", index=False)
+    pd.DataFrame({"a": [2]}).to_parquet(output_dir / "test.parquet")
+    os.utime(output_dir / "test.csv", ns=(0, 0))
+
+    assert find_table(output_dir, "test.csv") == output_dir / "test.parquet"
+    assert app_data_loader.load_table("test.csv")["a"].tolist() == [2]
+
+
+def test_writing_a_table_removes_its_other_formats(output_dir):
+    """
+    Test: csv -> parquet -> csv runs with unchanged csv content serve
+    the csv, not the parquet left by the middle run
+    """
+    df = pd.DataFrame({"a": [1, 2]})
+    write_frame(df, output_dir, "test.csv")
+    set_output_format("parquet")
+    write_frame(df.assign(a=[3, 4]), output_dir, "test.csv")
+    set_output_format("parquet", partition_by={"test": "a"})
+    write_frame(df.assign(a=[3, 4]), output_dir, "test.csv")
+    set_output_format("csv")
+    write_frame(df, output_dir, "test.csv")
+
+    assert sorted(path.name for path in output_dir.glob("test*")) == ["test.csv"]
+    assert find_table(output_dir, "test.csv") == output_dir / "test.csv"
+    assert app_data_loader.load_table("test.csv")["a"].tolist() == [1, 2]
+    assert [key for key in read_manifest(output_dir) if key.startswith("test")] == [
+        "test.csv"
+    ]
+
+
+def test_streamed_tables_require_csv(output_dir):
+    """
+    Test: appending chunks is refused for columnar formats
+    """
+    set_output_format("parquet")
+
+    with pytest.raises(ValueError):
+        start_table(["a"], "test.csv")
+
+
+def test_unknown_output_format_rejected():
+    with pytest.raises(ValueError):
+        set_output_format("xlsx")
+
+
+def test_unchanged_table_is_not_rewritten(output_dir):
+    """
+    Test: writing identical content keeps the existing file (and its
+    mtime); changed content replaces it; no temp files are left
+    """
+    df = pd.DataFrame({"a": ["x", "y"], "b": [1, 2]})
+    path = write_frame(df, output_dir, "test.csv")
+    os.utime(path, ns=(0, 0))
+
+    write_frame(df.copy(), output_dir, "test.csv")
+    assert path.stat().st_mtime_ns == 0
+
+    write_frame(df.assign(b=[1, 3]), output_dir, "test.csv")
+    assert path.stat().st_mtime_ns != 0
+    assert pd.read_csv(path)["b"].tolist() == [1, 3]
+    assert [p.name for p in output_dir.iterdir() if p.name.endswith(".tmp")] == []
+
+
+def test_manifest_records_hash_rows_and_schema(output_dir):
+    df = pd.DataFrame({"a": ["x", "y"], "b": [1, 2]})
+    path = write_frame(df, output_dir, "test.csv")
+
+    entry = read_manifest(output_dir)["test.csv"]
+
+    assert entry["sha256"] == file_sha256(path)
+    assert entry["rows"] == 2
+    assert entry["columns"] == {"a": "object", "b": "int64"}
+
+
+def test_streamed_table_manifest_tracks_appends(output_dir):
+    """
+    Test: appended chunks keep the manifest hash and row count current
+    """
+    start_table(["a", "b"], "test.csv")
+    seen = set()
+    for chunk in [
+        pd.DataFrame({"a": ["x"], "b": [1]}),
+        pd.DataFrame({"a": ["y"], "b": [2]}),
+    ]:
+        append_table(chunk, ["a", "b"], "test.csv", "a", seen)
+
+    entry = read_manifest(output_dir)["test.csv"]
+
+    assert entry["rows"] == 2
+    assert entry["sha256"] == file_sha256(output_dir / "test.csv")
+    assert entry["columns"] == {"a": "object", "b": "int64"}
+
+
+def listings_df():
+    return pd.DataFrame(
+        {
+            "prod_id": [1, 2, 1, 3],
+            "price": [1.0, 2.0, 3.0, 4.0],
+            "country_id": [1, 1, 2, 3],
+        }
+    )
+
+
+def test_partitioned_table_round_trips_and_prunes(output_dir):
+    """
+    Test: a partitioned table is written as country_id=<id>/ directories,
+    loads back whole, and filters only read matching partitions
+    """
+    set_output_format("parquet", partition_by={"listings": "country_id"})
+
+    write_table(
+        listings_df(),
+        ["prod_id", "price", "country_id"],
+        "listings.csv",
+        ["prod_id", "country_id"],
+    )
+
+    assert sorted(p.name for p in (output_dir / "listings").iterdir()) == [
+        "country_id=1",
+        "country_id=2",
+        "country_id=3",
+    ]
+    loaded = app_data_loader.load_table("listings.csv")
+    assert loaded.sort_values(["country_id", "prod_id"]).to_dict(
+        "list"
+    ) == listings_df().to_dict("list")
+
+    # a broken partition proves it is never opened
+    (output_dir / "listings" / "country_id=3" / "part-0.parquet").write_bytes(b"")
+    pruned = app_data_loader.load_table(
+        "listings.csv", filters=[("country_id", "in", [2])]
+    )
+    assert pruned.to_dict("list") == {"prod_id": [1], "price": [3.0], "country_id": [2]}
+
+
+def test_partial_partitioned_write_leaves_other_partitions(output_dir):
+    """
+    Test: writing some partitions only replaces / removes those
+    """
+    set_output_format("parquet", partition_by={"listings": "country_id"})
+    write_frame(listings_df(), output_dir, "listings.csv")
+    untouched = output_dir / "listings" / "country_id=3" / "part-0.parquet"
+    os.utime(untouched, ns=(0, 0))
+
+    changed = listings_df()[listings_df()["country_id"] == 1].assign(price=9.0)
+    write_frame(changed, output_dir, "listings.csv", partitions=[1, 2])
+
+    loaded = app_data_loader.load_table("listings.csv")
+    assert sorted(loaded["country_id"].unique()) == [1, 3]
+    assert loaded.loc[loaded["country_id"] == 1, "price"].tolist() == [9.0, 9.0]
+    assert untouched.stat().st_mtime_ns == 0
+    assert "listings/country_id=2/part-0.parquet" not in read_manifest(output_dir)
+
+
+def test_partitioning_requires_parquet():
+    with pytest.raises(ValueError):
+        set_output_format("csv", partition_by={"listings": "country_id"})
+
+
+def test_filters_apply_to_csv_tables(output_dir):
+    listings_df().to_csv(output_dir / "listings.csv", index=False)
+
+    loaded = app_data_loader.load_table(
+        "listings.csv", filters=[("country_id", "=", 1)]
+    )
+
+    assert loaded["prod_id"].tolist() == [1, 2]
+
+
+def test_arrow_tables_load_zero_copy_and_filtered(output_dir):
+    """
+    Test: the app loader maps Arrow files into pd.ArrowDtype columns
+    (no copy), filters before converting; the ETL still gets numpy
+    """
+    set_output_format("feather")
+    write_frame(listings_df(), output_dir, "listings.csv")
+
+    loaded = app_data_loader.load_table("listings.csv")
+    filtered = app_data_loader.load_table(
+        "listings.csv", filters=[("country_id", "in", [2])]
+    )
+
+    assert all(isinstance(dtype, pd.ArrowDtype) for dtype in loaded.dtypes)
+    assert loaded["prod_id"].tolist() == listings_df()["prod_id"].tolist()
+    assert (
+        filtered["country_id"].tolist()
+        == [2] * (listings_df()["country_id"] == 2).sum()
+    )
+    assert read_frame(output_dir / "listings.arrow")["prod_id"].dtype == "int64"
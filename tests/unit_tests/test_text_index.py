@@ -0,0 +1,59 @@
+import pandas as pd
+
+from src.data_access.text_search import get_text_index, search_descriptions
+from src.load.text_index import build_text_index, tokenize
+from src.utils.table_io import set_output_format, write_frame
+
+
+def descriptions_df():
+    return pd.DataFrame(
+        {
+            "prod_id": [10, 20, 30],
+            "prod_desc": ["Fire truck", None, "NA"],
+            "prod_long_desc": [
+                "A red fire truck with a 000 ladder.",
+                "Space rocket, space station and astronaut.",
+                "Fire fighter boat - on the water.",
+            ],
+        }
+    )
+
+
+def test_tokenize_lowercases_and_splits_on_punctuation():
+    tokens = tokenize(pd.Series(["Fire-Truck, 2x!", None]))
+
+    assert tokens.tolist() == ["fire", "truck", "2x"]
+
+
+def test_build_text_index_counts_term_frequencies():
+    tables = build_text_index(descriptions_df())
+
+    terms = tables["text_terms.csv"].set_index("term")["doc_freq"]
+    assert terms["fire"] == 2
+    assert terms["space"] == 1
+    assert tables["text_documents.csv"]["length"].tolist() == [10, 6, 7]
+
+    # fire's postings follow every earlier term's
+    start = terms[terms.index < "fire"].sum()
+    postings = tables["text_postings.csv"].iloc[start:][: terms["fire"]]
+    assert postings.values.tolist() == [[0, 2], [2, 1]]
+
+
+def test_search_descriptions_ranks_from_written_index(tmp_path, monkeypatch):
+    """
+    Test: the index round-trips through CSV output (terms like "000" and
+    "na" stay strings) and queries rank by BM25
+    """
+    monkeypatch.setattr("src.data_access.app_data_loader.OUTPUT_DIR", tmp_path)
+    set_output_format("csv")
+    for name, table in build_text_index(descriptions_df()).items():
+        write_frame(table, tmp_path, name)
+
+    assert search_descriptions("FIRE truck")["prod_id"].tolist() == [10, 30]
+    assert search_descriptions("space")["prod_id"].tolist() == [20]
+    assert search_descriptions("000")["prod_id"].tolist() == [10]
+    assert search_descriptions("na")["prod_id"].tolist() == [30]
+    assert search_descriptions("fire", limit=1)["prod_id"].tolist() == [10]
+    assert search_descriptions("zebra").empty
+
+    assert get_text_index() is get_text_index()
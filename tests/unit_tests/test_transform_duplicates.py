@@ -1,5 +1,11 @@
+import timeit
+import numpy as np
 import pandas as pd
-from src.transform.transform_duplicates import clean_duplicates
+from src.transform.transform_duplicates import (
+    clean_duplicates,
+    deduplicate,
+    new_seen_keys,
+)
 
 
 def test_clean_duplicates_removes_null_primary_keys():
@@ -31,3 +37,64 @@ def test_clean_duplicates_keeps_valid_multi_country_rows():
 
     # Assert
     assert len(result) == 2
+
+
+def test_deduplicate_matches_pandas_drop_duplicates():
+    """
+    Packed-key dedup must keep the same rows as drop_duplicates.
+    """
+    df = pd.DataFrame(
+        {
+            "prod_id": [1, 2, 1, 3, 2, 1],
+            "country": ["US", "US", "US", "DE", "DE", "DE"],
+        }
+    )
+
+    result, stats = deduplicate(df)
+    expected = df.drop_duplicates(subset=["prod_id", "country"])
+
+    assert result.index.tolist() == expected.index.tolist()
+    assert stats["duplicates"] == 1
+    assert stats["rows_out"] == 5
+
+
+def test_clean_duplicates_across_chunks_with_seen_keys():
+    """
+    Keys kept by an earlier chunk must be dropped from later chunks.
+    """
+    seen_keys = new_seen_keys()
+    first = pd.DataFrame({"prod_id": [1, 2], "country": ["US", "US"]})
+    second = pd.DataFrame({"prod_id": [2, 1, 3], "country": ["US", "DE", "US"]})
+
+    clean_duplicates(first, seen_keys)
+    result = clean_duplicates(second, seen_keys)
+
+    assert result["prod_id"].tolist() == [1, 3]
+    assert result["country"].tolist() == ["DE", "US"]
+
+
+def test_deduplicate_across_chunks_stays_linear():
+    """
+    Smaller chunks mustn't cost more per row - each chunk is checked
+    against the seen keys in O(chunk), not O(keys seen so far)
+    """
+    rng = np.random.default_rng(0)
+    rows = 200_000
+    df = pd.DataFrame(
+        {
+            "prod_id": rng.integers(0, rows, rows),
+            "country": pd.Categorical(rng.choice(["US", "DE", "GB"], rows)),
+        }
+    )
+
+    def stream(size):
+        seen_keys = new_seen_keys()
+        for start in range(0, rows, size):
+            deduplicate(df.iloc[start:][:size], seen_keys)
+
+    def seconds(size):
+        return min(timeit.repeat(lambda: stream(size), number=1, repeat=3))
+
+    # 100x the chunks - rebuilding a sorted seen-keys array per chunk was
+    # over 100x slower here
+    assert seconds(2_000) < 10 * seconds(200_000)
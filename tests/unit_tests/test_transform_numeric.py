@@ -59,13 +59,29 @@ def test_clean_age_fractional():
     assert result.loc[0, "age_max"] == 3
 
 
-# def test_clean_age_invalid():
-#     df = pd.DataFrame({"ages": ["unknown", None, "invalid"]})
+def test_clean_age_invalid():
+    """
+    Test unparseable and null values become NaN
+    """
+    df = pd.DataFrame({"ages": ["unknown", None, "invalid"]})
+
+    result = clean_ages(df)
+
+    assert result["age_min"].isna().all()
+    assert result["age_max"].isna().all()
 
-#     result = clean_ages(df)
 
-#     assert result["age_min"].isna().all()
-#     assert result["age_max"].isna().all()
+def test_clean_age_repeated_values_parsed_consistently():
+    """
+    Test repeated values (parsed once) are broadcast to every row
+    """
+    df = pd.DataFrame({"ages": ["6+", "6-12", "6+", None, "6-12"]})
+
+    result = clean_ages(df)
+
+    assert result["age_min"].tolist()[:3] == [6, 6, 6]
+    assert result["age_max"].tolist()[:3] == [99, 12, 99]
+    assert result["age_max"].tolist()[4] == 12
 
 
 # ==============
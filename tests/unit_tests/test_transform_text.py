@@ -1,4 +1,5 @@
 import pandas as pd
+from src.utils.reference_data import DIFFICULTY_ORDER
 from src.transform.transform_text import (
     clean_prod_desc,
     clean_prod_long_desc,
@@ -174,3 +175,39 @@ def test_clean_country_ensures_string_type():
 
     assert isinstance(result.loc[0, "country"], str)
     assert result.loc[0, "country"] == "123"
+
+
+def test_clean_country_fills_nulls_in_categorical():
+    """
+    clean_country should fill nulls in categorical input from the typed reader.
+    """
+    df = pd.DataFrame({"country": pd.Series(["US", None], dtype="category")})
+
+    result = clean_country(df)
+
+    assert result["country"].tolist() == ["US", "Unknown"]
+
+
+def test_clean_review_difficulty_categories_follow_difficulty_order():
+    """
+    clean_review_difficulty should emit an ordered categorical in DIFFICULTY_ORDER.
+    """
+    df = pd.DataFrame({"review_difficulty": ["Average", None, "Very Easy"]})
+
+    result = clean_review_difficulty(df)
+
+    categories = list(result["review_difficulty"].cat.categories)
+    assert categories[:6] == list(DIFFICULTY_ORDER)
+    assert result["review_difficulty"].tolist() == ["average", "unrated", "very easy"]
+
+
+def test_clean_country_categories_stable_across_inputs():
+    """
+    clean_country categories should not depend on which countries a frame holds.
+    """
+    first = clean_country(pd.DataFrame({"country": ["US"]}))
+    second = clean_country(pd.DataFrame({"country": ["DE", "GB"]}))
+
+    assert list(first["country"].cat.categories) == list(
+        second["country"].cat.categories
+    )